@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Run the documentation automation in one process.
+
+Steps run in the order of the docs workflow: module doc stubs
+(scan_subrepos), the README file tree, docs/index.md, and link linting. They
+share one repository walker, one in-memory README and one digest cache. Each
+step records a fingerprint of its inputs in .cache/build_docs.json and is
+skipped when the fingerprint is unchanged. Files are only written when their
+content differs.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import gen_filetree
+import lint_links
+import render_index_from_readme
+import scan_subrepos
+import update_readme_filetree
+from repo_walk import DEFAULT_LISTING_CACHE, RepoWalker
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+STATE_PATH = REPO_ROOT / ".cache" / "build_docs.json"
+STEPS = ["subrepos", "filetree", "index", "links"]
+
+
+class DocsBuild:
+    """Shared inputs and fingerprint bookkeeping for one pipeline run."""
+
+    def __init__(self, state_path: Path = STATE_PATH, force: bool = False):
+        self.state_path = state_path
+        self.force = force
+        self.walker = RepoWalker(REPO_ROOT, cache_path=DEFAULT_LISTING_CACHE)
+        self.state: Dict[str, str] = {}
+        self.results: List[Dict[str, object]] = []
+        self.written: List[str] = []
+        self.link_issues: List[lint_links.LinkIssue] = []
+        self._digests: Dict[str, str] = {}
+        self._texts: Dict[str, Optional[str]] = {}
+        if not force:
+            try:
+                with open(state_path, encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError):
+                self.state = {}
+
+    def read(self, path: Path) -> Optional[str]:
+        """File text, read at most once per run; None when missing."""
+        key = str(path)
+        if key not in self._texts:
+            try:
+                self._texts[key] = path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                self._texts[key] = None
+        return self._texts[key]
+
+    def digest(self, path: Path) -> str:
+        key = str(path)
+        if key not in self._digests:
+            text = self.read(path)
+            self._digests[key] = "missing" if text is None else hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return self._digests[key]
+
+    def write(self, path: Path, content: str) -> bool:
+        """Write only if the content differs; keeps the shared view current."""
+        if self.read(path) == content:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        self._texts[str(path)] = content
+        self._digests.pop(str(path), None)
+        self.written.append(str(path.relative_to(REPO_ROOT)))
+        return True
+
+    def forget(self, path: Path) -> None:
+        """Drop the shared view of a file another module rewrote."""
+        self._texts.pop(str(path), None)
+        self._digests.pop(str(path), None)
+
+    @staticmethod
+    def fingerprint(*parts: str) -> str:
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def run_step(self, name: str, inputs: Callable[[], str], run: Callable[[], str]) -> None:
+        """Run `run` unless `inputs()` matches the last recorded fingerprint."""
+        started = time.perf_counter()
+        fingerprint = inputs()
+        if fingerprint == self.state.get(name):
+            status = "up to date"
+        else:
+            status = run()
+            # Steps may rewrite their own inputs (README, ARCHITECTURE.md): record the result
+            self.state[name] = inputs()
+        self.results.append({"step": name, "status": status,
+                             "ms": round((time.perf_counter() - started) * 1000, 2)})
+
+    def save(self) -> None:
+        self.walker.save()
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+
+def source_digest(module) -> str:
+    with open(module.__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def subrepos_step(build: DocsBuild) -> None:
+    def inputs() -> str:
+        # Stubs are only written for missing docs, so existence is all that matters
+        parts = [source_digest(scan_subrepos), build.digest(scan_subrepos.ARCHITECTURE_DOC)]
+        for module in scan_subrepos.MODULE_SPECS:
+            subrepo = scan_subrepos.discover_subrepo_path(module)
+            parts.append(f"{module.key}:{subrepo}")
+            parts.extend(f"{filename}:{(module.doc_directory / filename).exists()}"
+                         for filename in module.doc_filenames.values())
+        return build.fingerprint(*parts)
+
+    def run() -> str:
+        created = [path for module in scan_subrepos.MODULE_SPECS
+                   for path in scan_subrepos.ensure_module_docs(module)]
+        build.written.extend(created)
+        build.forget(scan_subrepos.ARCHITECTURE_DOC)
+        if scan_subrepos.update_architecture_index():
+            build.written.append(str(scan_subrepos.ARCHITECTURE_DOC.relative_to(REPO_ROOT)))
+        return f"created {len(created)} stubs"
+
+    build.run_step("subrepos", inputs, run)
+
+
+def filetree_step(build: DocsBuild) -> None:
+    tree: Dict[str, str] = {}
+
+    def inputs() -> str:
+        if "text" not in tree:
+            tree["text"] = gen_filetree.generate_tree(build.walker).strip()
+        return build.fingerprint(source_digest(gen_filetree), source_digest(update_readme_filetree),
+                                 tree["text"], build.digest(update_readme_filetree.README_PATH))
+
+    def run() -> str:
+        readme = build.read(update_readme_filetree.README_PATH) or ""
+        changed = build.write(update_readme_filetree.README_PATH,
+                              update_readme_filetree.insert_tree(readme, tree["text"]))
+        return "README updated" if changed else "README unchanged"
+
+    build.run_step("filetree", inputs, run)
+
+
+def index_step(build: DocsBuild) -> None:
+    readme_path = render_index_from_readme.README_PATH
+    index_path = render_index_from_readme.DOCS_INDEX
+
+    def inputs() -> str:
+        return build.fingerprint(source_digest(render_index_from_readme),
+                                 build.digest(readme_path), build.digest(index_path))
+
+    def run() -> str:
+        readme = build.read(readme_path)
+        if readme is None:
+            return "README.md not found"
+        changed = build.write(index_path, render_index_from_readme.render_index(readme))
+        return "index updated" if changed else "index unchanged"
+
+    build.run_step("index", inputs, run)
+
+
+def links_step(build: DocsBuild) -> None:
+    # The incremental link cache tracks its own per-file and per-target dependencies
+    started = time.perf_counter()
+    files = lint_links.find_markdown_files([REPO_ROOT], build.walker)
+    cache = lint_links.LinkCache(lint_links.DEFAULT_CACHE)
+    cache.load()
+    build.link_issues = cache.lint(files, jobs=1)
+    cache.save()
+    build.results.append({"step": "links", "status": f"rescanned {cache.rescanned} of {len(files)} files",
+                          "ms": round((time.perf_counter() - started) * 1000, 2)})
+
+
+STEP_FUNCTIONS = {"subrepos": subrepos_step, "filetree": filetree_step, "index": index_step, "links": links_step}
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build documentation inputs in one pass")
+    parser.add_argument("--steps", nargs="+", choices=STEPS, default=STEPS,
+                        help="Steps to run, in pipeline order (default: all)")
+    parser.add_argument("--force", action="store_true", help="Ignore recorded fingerprints and run every step")
+    parser.add_argument("--json", action="store_true", help="Emit JSON summary")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    started = time.perf_counter()
+    build = DocsBuild(force=args.force)
+    for step in STEPS:
+        if step in args.steps:
+            STEP_FUNCTIONS[step](build)
+    build.save()
+    total_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    if args.json:
+        print(json.dumps({"steps": build.results, "written": build.written, "total_ms": total_ms,
+                          "link_issues": len(build.link_issues)}, indent=2))
+        return 0
+
+    for result in build.results:
+        print(f"  {result['step']:<9} {result['ms']:>9.2f} ms  {result['status']}")
+    if build.written:
+        print("Written:")
+        for path in build.written:
+            print(f"  - {path}")
+    if build.link_issues:
+        print("Link warnings:")
+        for issue in build.link_issues:
+            print(f"  {lint_links.display_path(issue.file)}:{issue.line_number} -> {issue.target} ({issue.reason})")
+    print(f"Docs build finished in {total_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,37 +2,53 @@
 """Generate a concise repository file tree.
 
 The output is designed to live inside README.md within a fenced code block.
+Listings come from the shared repo_walk walker, so excluded and git-ignored
+paths never appear.
 """
 from __future__ import annotations
 
 import argparse
+import os
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from repo_walk import RepoWalker
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
-EXCLUDE = {".git", "__pycache__", "node_modules", "site", ".venv"}
 
 
-def should_skip(path: Path) -> bool:
-    parts = set(path.parts)
-    return bool(parts & EXCLUDE)
+def _entries(walker: RepoWalker, directory: str) -> Iterator[Tuple[str, bool, bool]]:
+    """Yield (name, is_dir, is_last) for one directory, dirs and files interleaved by name."""
+    dirs, files = walker.listdir(directory)
+    subdirs = set(dirs)
+    names = sorted(dirs + files, key=lambda name: name.lower())
+    for index, name in enumerate(names):
+        yield name, name in subdirs, index == len(names) - 1
 
 
-def build_tree(root: Path, prefix: str = "") -> List[str]:
-    entries = [p for p in sorted(root.iterdir(), key=lambda p: p.name.lower()) if not should_skip(p.relative_to(REPO_ROOT))]
+def build_tree(root: Path, walker: Optional[RepoWalker] = None) -> List[str]:
+    walker = walker or RepoWalker(REPO_ROOT)
     lines: List[str] = []
-    for index, entry in enumerate(entries):
-        connector = "└──" if index == len(entries) - 1 else "├──"
-        lines.append(f"{prefix}{connector} {entry.name}")
-        if entry.is_dir():
-            extension = "    " if connector == "└──" else "│   "
-            lines.extend(build_tree(entry, prefix + extension))
+    stack = [(str(root), "", _entries(walker, str(root)))]
+    while stack:
+        directory, prefix, entries = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+        name, is_dir, is_last = entry
+        connector = "└──" if is_last else "├──"
+        lines.append(f"{prefix}{connector} {name}")
+        if is_dir:
+            extension = "    " if is_last else "│   "
+            child = os.path.join(directory, name)
+            stack.append((child, prefix + extension, _entries(walker, child)))
     return lines
 
 
-def generate_tree() -> str:
+def generate_tree(walker: Optional[RepoWalker] = None) -> str:
     lines = [REPO_ROOT.name + "/"]
-    lines.extend(build_tree(REPO_ROOT))
+    lines.extend(build_tree(REPO_ROOT, walker))
     return "\n".join(lines)
 
 
@@ -3,18 +3,58 @@
 
 Warnings are printed but the script never exits with a non-zero status to keep
 it safe for early adoption in CI.
+
+Link targets are resolved and stat'ed at most once per run, since many docs
+share a template and link the same files. Large trees can be scanned across
+worker processes with --jobs.
+
+`#anchor` fragments are checked against the headings of the target file,
+slugified the way both GitHub and MkDocs do it. Each file's anchors are
+extracted once, on first use.
+
+--incremental keeps per-file results keyed by content hash in
+.cache/lint_links.json, together with the link targets each file depends on.
+Only changed files, and files whose targets appeared, disappeared or changed
+their anchors, are rescanned.
+
+--external also checks http(s) links. URLs are deduplicated across the tree
+and sent as HEAD requests from asyncio, with a per-host concurrency limit and
+kept-alive connections. URLs that passed within the TTL are read from
+.cache/lint_links_external.json and not requested again.
 """
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
+import os
 import re
+import time
+import unicodedata
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from repo_walk import EXCLUDE_DIRS, RepoWalker
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 LINK_PATTERN = re.compile(r"\[[^\]]+\]\(([^)]+)\)")
-EXCLUDE_DIRS = {".git", "__pycache__", "node_modules", "site", ".venv"}
+PARALLEL_MIN_FILES = 256
+CACHE_FORMAT = 1
+DEFAULT_CACHE = REPO_ROOT / ".cache" / "lint_links.json"
+EXTERNAL_CACHE = REPO_ROOT / ".cache" / "lint_links_external.json"
+EXTERNAL_TTL = 24 * 3600
+EXTERNAL_TIMEOUT = 10.0
+HOST_CONCURRENCY = 4
+MAX_REDIRECTS = 5
+ATX_HEADING = re.compile(r"^ {0,3}#{1,6}(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+SETEXT_UNDERLINE = re.compile(r"^ {0,3}(?:=+|-+)[ \t]*$")
+FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+ATTR_ID = re.compile(r"[ \t]*\{[^}]*#([\w-]+)[^}]*\}[ \t]*$")
+HTML_ID = re.compile(r"<[^>]+\b(?:id|name)=[\"']([^\"']+)[\"']")
+INLINE_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+MKDOCS_ID_COUNT = re.compile(r"^(.*)_([0-9]+)$")
 
 
 @dataclass
@@ -25,65 +65,795 @@ class LinkIssue:
     reason: str
 
 
-def find_markdown_files(paths: Iterable[Path]) -> List[Path]:
-    files: List[Path] = []
+def iter_markdown_files(paths: Iterable[Path], walker: Optional[RepoWalker] = None) -> Iterator[Path]:
+    """Yield Markdown files under `paths`, skipping excluded and git-ignored directories."""
     for path in paths:
-        if path.is_file() and path.suffix.lower() == ".md":
-            files.append(path)
-        elif path.is_dir():
-            if path.name in EXCLUDE_DIRS:
+        if path.is_file():
+            if path.suffix.lower() == ".md":
+                yield path
+            continue
+        if not path.is_dir() or path.name in EXCLUDE_DIRS:
+            continue
+        root = os.path.abspath(path)
+        inside_repo = root == str(REPO_ROOT) or root.startswith(str(REPO_ROOT) + os.sep)
+        tree = walker or (RepoWalker(REPO_ROOT) if inside_repo else RepoWalker(root))
+        for directory, _, files in tree.walk(root):
+            for name in files:
+                if name.lower().endswith(".md"):
+                    yield Path(directory, name)
+
+
+def find_markdown_files(paths: Iterable[Path], walker: Optional[RepoWalker] = None) -> List[Path]:
+    return list(iter_markdown_files(paths, walker))
+
+
+def github_slug(text: str) -> str:
+    """Anchor GitHub generates for a heading."""
+    text = re.sub(r"[^\w\- ]", "", text.strip().lower())
+    return text.replace(" ", "-")
+
+
+def mkdocs_slug(text: str) -> str:
+    """Anchor the MkDocs `toc` extension generates for a heading."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"[^\w\s-]", "", text).strip().lower()
+    return re.sub(r"[-\s]+", "-", text)
+
+
+def extract_headings(text: str) -> Tuple[List[Tuple[str, Optional[str]]], List[str]]:
+    """Return (headings, HTML ids) outside fenced code blocks.
+
+    Each heading is (text, attr_list id or None). The text keeps any `{#id}`
+    block, since GitHub renders it literally.
+    """
+    headings: List[Tuple[str, Optional[str]]] = []
+    explicit: List[str] = []
+    fence = None
+    previous = ""
+    for line in text.splitlines():
+        first = line.lstrip()[:1]
+        opening = FENCE.match(line) if first in ("`", "~") else None
+        if fence is not None:
+            if opening and opening.group(1)[0] == fence[0] and len(opening.group(1)) >= len(fence):
+                fence = None
+            previous = ""
+            continue
+        if opening:
+            fence = opening.group(1)
+            previous = ""
+            continue
+
+        heading = None
+        atx = ATX_HEADING.match(line) if first == "#" else None
+        if atx:
+            heading = atx.group(1) or ""
+        elif (first in ("=", "-") and previous.strip() and SETEXT_UNDERLINE.match(line)
+              and not previous.lstrip().startswith(("-", "|", ">"))):
+            heading = previous.strip()
+        if heading is not None:
+            attr = ATTR_ID.search(heading)
+            heading = INLINE_LINK.sub(r"\1", heading).replace("`", "")
+            headings.append((heading, attr.group(1) if attr else None))
+        if "<" in line:
+            explicit.extend(HTML_ID.findall(line))
+        previous = "" if heading is not None else line
+    return headings, explicit
+
+
+def build_anchor_index(text: str) -> FrozenSet[str]:
+    """All anchors a Markdown document exposes on GitHub or in MkDocs."""
+    headings, explicit = extract_headings(text)
+    anchors = set(explicit)
+
+    # GitHub: a repeated slug gets -1, -2, ..., skipping any slug already taken
+    occurrences: Dict[str, int] = {}
+    for heading, _ in headings:
+        slug = original = github_slug(heading)
+        while slug in occurrences:
+            occurrences[original] += 1
+            slug = f"{original}-{occurrences[original]}"
+        occurrences[slug] = 0
+        anchors.add(slug)
+
+    # MkDocs: an attr_list id replaces the slug and is reserved; other slugs get _1, _2, ... until unique
+    used = {attr for _, attr in headings if attr}
+    for heading, attr in headings:
+        if attr:
+            anchors.add(attr)
+            continue
+        slug = mkdocs_slug(heading)
+        while slug in used or not slug:
+            count = MKDOCS_ID_COUNT.match(slug)
+            slug = f"{count.group(1)}_{int(count.group(2)) + 1}" if count else f"{slug}_1"
+        used.add(slug)
+        anchors.add(slug)
+    return frozenset(anchors)
+
+
+def anchor_digest(anchors: FrozenSet[str]) -> str:
+    return hashlib.sha256("\n".join(sorted(anchors)).encode("utf-8")).hexdigest()[:16]
+
+
+class LinkChecker:
+    """Validates link targets, memoizing resolution and existence for one run.
+
+    Paths are normalized lexically instead of with Path.resolve(), so a target
+    linked from many files costs one stat in total. memoize=False keeps the
+    original resolve-and-stat-every-link behaviour for benchmarking.
+    """
+
+    def __init__(self, memoize: bool = True):
+        self.memoize = memoize
+        self._resolved: Dict[Tuple[str, str], str] = {}
+        self._exists: Dict[str, bool] = {}
+        self._anchors: Dict[str, FrozenSet[str]] = {}
+        # Targets consulted while scanning one file, when dependency tracking is on
+        self._deps: Optional[Set[str]] = None
+        self._anchor_deps: Optional[Set[str]] = None
+
+    def resolve(self, directory: str, target: str) -> str:
+        key = (directory, target)
+        if not self.memoize:
+            return str(Path(directory, target).resolve())
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = self._resolved[key] = os.path.normpath(os.path.join(directory, target))
+        return resolved
+
+    def exists(self, path: str) -> bool:
+        exists = self._exists.get(path)
+        if exists is None:
+            exists = os.path.exists(path)
+            if self.memoize:
+                self._exists[path] = exists
+        return exists
+
+    def anchors(self, path: str, text: Optional[str] = None) -> FrozenSet[str]:
+        """Anchor index of a Markdown file, built on first use."""
+        anchors = self._anchors.get(path)
+        if anchors is None:
+            if text is None:
+                try:
+                    with open(path, encoding="utf-8", errors="ignore") as f:
+                        text = f.read()
+                except OSError:
+                    text = ""
+            anchors = self._anchors[path] = build_anchor_index(text)
+        return anchors
+
+    def has_anchor(self, path: str, anchor: str) -> bool:
+        anchors = self.anchors(path)
+        if anchor in anchors or anchor.lower() in anchors:
+            return True
+        anchor = unquote(anchor)
+        return anchor in anchors or anchor.lower() in anchors
+
+    def validate_link(self, markdown_file: Path, target: str) -> Tuple[bool, str]:
+        return self._validate(os.path.abspath(markdown_file), target)
+
+    def _validate(self, source: str, target: str) -> Tuple[bool, str]:
+        if target.startswith("http://") or target.startswith("https://"):
+            return True, "external"
+        if target.startswith("mailto:"):
+            return True, "external"
+        if target.startswith("#"):
+            if len(target) > 1:
+                if self._anchor_deps is not None:
+                    self._anchor_deps.add(source)
+                if not self.has_anchor(source, target[1:]):
+                    return False, "missing anchor"
+            return True, "anchor"
+        anchor = None
+        if "#" in target:
+            target, anchor = target.split("#", 1)
+        resolved = self.resolve(os.path.dirname(source), target)
+        if self._deps is not None:
+            self._deps.add(resolved)
+        if not self.exists(resolved):
+            return False, "missing file"
+        if anchor and resolved.lower().endswith(".md"):
+            if self._anchor_deps is not None:
+                self._anchor_deps.add(resolved)
+            if not self.has_anchor(resolved, anchor):
+                return False, "missing anchor"
+        return True, ""
+
+    def scan_file(self, path: Path) -> List[LinkIssue]:
+        issues: List[LinkIssue] = []
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        source = os.path.abspath(path)
+        if "](#" in text:
+            # Same-file anchors: index the text already in hand
+            self.anchors(source, text)
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if "](" not in line:
                 continue
-            for child in path.iterdir():
-                files.extend(find_markdown_files([child]))
-    return files
+            for match in LINK_PATTERN.finditer(line):
+                target = match.group(1)
+                valid, reason = self._validate(source, target)
+                if not valid:
+                    issues.append(LinkIssue(file=path, target=target, line_number=line_number, reason=reason))
+        return issues
+
+    def scan_file_with_dependencies(self, path: Path) -> Tuple[List[LinkIssue], List[str], List[str]]:
+        """Scan a file and report the targets whose existence or anchors it relied on."""
+        self._deps, self._anchor_deps = set(), set()
+        try:
+            issues = self.scan_file(path)
+            return issues, sorted(self._deps), sorted(self._anchor_deps)
+        finally:
+            self._deps = self._anchor_deps = None
+
+
+_checker: Optional[LinkChecker] = None
+
+
+def default_checker() -> LinkChecker:
+    """The per-process checker used by the module-level helpers and pool workers."""
+    global _checker
+    if _checker is None:
+        _checker = LinkChecker()
+    return _checker
 
 
 def validate_link(markdown_file: Path, target: str) -> Tuple[bool, str]:
-    if target.startswith("http://") or target.startswith("https://"):
-        return True, "external"
-    if target.startswith("mailto:"):
-        return True, "external"
-    if target.startswith("#"):
-        return True, "anchor"
-    anchor = None
-    if "#" in target:
-        target, anchor = target.split("#", 1)
-    resolved = (markdown_file.parent / target).resolve()
-    if not resolved.exists():
-        return False, "missing file"
-    if anchor:
-        if not anchor:
-            return True, ""
-    return True, ""
+    return default_checker().validate_link(markdown_file, target)
 
 
 def scan_file(path: Path) -> List[LinkIssue]:
+    return default_checker().scan_file(path)
+
+
+def scan_file_with_dependencies(path: Path) -> Tuple[List[LinkIssue], List[str], List[str]]:
+    return default_checker().scan_file_with_dependencies(path)
+
+
+def _map_files(func, files: List[Path], jobs: int) -> Iterator[Any]:
+    """Apply a module-level scan function in file order, in a pool for large batches."""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(files) < PARALLEL_MIN_FILES:
+        yield from map(func, files)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    chunksize = max(1, len(files) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(func, files, chunksize=chunksize)
+
+
+def scan_files(files: List[Path], jobs: int = 0, checker: Optional[LinkChecker] = None) -> List[LinkIssue]:
+    """Scan files in order, fanning out to worker processes for large trees."""
     issues: List[LinkIssue] = []
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    for line_number, line in enumerate(text.splitlines(), start=1):
-        for match in LINK_PATTERN.finditer(line):
-            target = match.group(1)
-            valid, reason = validate_link(path, target)
-            if not valid:
-                issues.append(LinkIssue(file=path, target=target, line_number=line_number, reason=reason))
+    scan = checker.scan_file if checker is not None else scan_file
+    for file_issues in _map_files(scan, files, 1 if checker is not None else jobs):
+        issues.extend(file_issues)
+    return issues
+
+
+class LinkCache:
+    """Per-file link results keyed by content hash, with a reverse dependency map.
+
+    Each file entry records its issues and the targets it depends on: paths
+    whose existence it checked and Markdown files whose anchors it used.
+    `referrers` maps every target back to those files, so a target that
+    appears, disappears or changes its anchors dirties exactly its referrers.
+    """
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = cache_path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.targets: Dict[str, Dict[str, Any]] = {}
+        self.rescanned = 0
+        self.reused = 0
+
+    @staticmethod
+    def fingerprint() -> str:
+        """Any edit to the linter invalidates every cached result."""
+        with open(__file__, "rb") as f:
+            return f"{CACHE_FORMAT}+{hashlib.sha256(f.read()).hexdigest()[:16]}"
+
+    def load(self) -> None:
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("fingerprint") == self.fingerprint():
+            self.files = data.get("files", {})
+            self.targets = data.get("targets", {})
+
+    def save(self) -> None:
+        referrers: Dict[str, List[str]] = {}
+        for path, entry in self.files.items():
+            for target in set(entry["deps"]) | set(entry["anchor_deps"]):
+                referrers.setdefault(target, []).append(path)
+        data = {"fingerprint": self.fingerprint(), "files": self.files,
+                "targets": self.targets, "referrers": referrers}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.cache_path)
+
+    @staticmethod
+    def _unchanged(path: str, entry: Optional[Dict[str, Any]]) -> bool:
+        """A new size is an edit; an equal size is confirmed by content hash.
+
+        mtime alone is not trusted: an edit within the filesystem's timestamp
+        granularity, or a restored mtime, keeps both size and mtime.
+        """
+        if entry is None or os.stat(path).st_size != entry["size"]:
+            return False
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest() == entry["sha256"]
+
+    def _target_state(self, checker: LinkChecker, target: str, anchors: bool,
+                      edited: Set[str]) -> Dict[str, Any]:
+        """Existence (and anchor digest) of a target; unedited scanned files reuse their last state."""
+        previous = self.targets.get(target)
+        if previous is not None and target in self.files and target not in edited \
+                and (not anchors or "anchors" in previous):
+            return previous
+        state: Dict[str, Any] = {"exists": checker.exists(target)}
+        if anchors and state["exists"]:
+            state["anchors"] = anchor_digest(checker.anchors(target))
+        return state
+
+    def lint(self, files: List[Path], jobs: int = 0, checker: Optional[LinkChecker] = None) -> List[LinkIssue]:
+        """Issues for `files`, identical to scan_files, rescanning only what changed."""
+        checker = checker or default_checker()
+        paths = [os.path.abspath(file) for file in files]
+        edited = {path for path in paths if not self._unchanged(path, self.files.get(path))}
+        current = set(paths)
+        self.files = {path: entry for path, entry in self.files.items() if path in current and path not in edited}
+
+        # Rescan the referrers of every target that appeared, disappeared or changed its anchors
+        dirty = set(edited)
+        referrers: Dict[str, Set[str]] = {}
+        anchor_targets: Set[str] = set()
+        for path, entry in self.files.items():
+            for target in entry["deps"]:
+                referrers.setdefault(target, set()).add(path)
+            for target in entry["anchor_deps"]:
+                referrers.setdefault(target, set()).add(path)
+                anchor_targets.add(target)
+        for target, dependents in referrers.items():
+            anchors = target in anchor_targets
+            state = self._target_state(checker, target, anchors, edited)
+            previous = self.targets.get(target) or {}
+            if previous.get("exists") != state["exists"] or \
+                    (anchors and previous.get("anchors") != state.get("anchors")):
+                dirty.update(dependents)
+
+        dirty_files = [file for file, path in zip(files, paths) if path in dirty]
+        scan = scan_file_with_dependencies if jobs != 1 else checker.scan_file_with_dependencies
+        for file, (issues, deps, anchor_deps) in zip(dirty_files, _map_files(scan, dirty_files, jobs)):
+            path = os.path.abspath(file)
+            with open(path, "rb") as f:
+                content = f.read()
+            self.files[path] = {
+                "sha256": hashlib.sha256(content).hexdigest(), "size": len(content),
+                "issues": [[issue.line_number, issue.target, issue.reason] for issue in issues],
+                "deps": deps, "anchor_deps": anchor_deps,
+            }
+        self.rescanned, self.reused = len(dirty_files), len(paths) - len(dirty_files)
+
+        wanted: Dict[str, bool] = {}
+        for entry in self.files.values():
+            for target in entry["deps"]:
+                wanted.setdefault(target, False)
+            for target in entry["anchor_deps"]:
+                wanted[target] = True
+        self.targets = {target: self._target_state(checker, target, anchors, edited)
+                        for target, anchors in wanted.items()}
+
+        return [LinkIssue(file=file, target=target, line_number=line_number, reason=reason)
+                for file, path in zip(files, paths)
+                for line_number, target, reason in self.files[path]["issues"]]
+
+
+def collect_external_links(files: Iterable[Path]) -> Dict[str, List[Tuple[Path, int]]]:
+    """Map each http(s) URL to every (file, line) that links it."""
+    urls: Dict[str, List[Tuple[Path, int]]] = {}
+    for path in files:
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        if "](http" not in text:
+            continue
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if "](http" not in line:
+                continue
+            for match in LINK_PATTERN.finditer(line):
+                target = match.group(1).split()[0] if match.group(1).strip() else ""
+                if target.startswith(("http://", "https://")):
+                    urls.setdefault(target.split("#", 1)[0], []).append((path, line_number))
+    return urls
+
+
+class ExternalLinkChecker:
+    """Checks URLs concurrently over pooled HTTP/1.1 keep-alive connections.
+
+    Each (scheme, host, port) gets a semaphore of `per_host` slots and a pool of
+    idle connections, so a tree linking one host thousands of times opens at
+    most `per_host` sockets to it. Redirects are followed; a final status below
+    400 passes, and 429 is treated as unverified rather than broken.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = EXTERNAL_CACHE, ttl: float = EXTERNAL_TTL,
+                 per_host: int = HOST_CONCURRENCY, timeout: float = EXTERNAL_TIMEOUT):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.per_host = per_host
+        self.timeout = timeout
+        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"urls": 0, "cached": 0, "checked": 0, "connections": 0, "seconds": 0.0}
+        self._limits: Dict[Tuple[str, str, int], Any] = {}
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[Any, Any]]] = {}
+
+    def load(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            self.cache = {}
+
+    def save(self) -> None:
+        if self.cache_path is None:
+            return
+        now = time.time()
+        fresh = {url: entry for url, entry in self.cache.items() if now - entry["checked_at"] < self.ttl}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(fresh, f, indent=0, sort_keys=True)
+        os.replace(tmp_path, self.cache_path)
+
+    async def _open(self, key: Tuple[str, str, int], reuse: bool = True) -> Tuple[Any, Any, bool]:
+        """A (reader, writer, reused) connection, from the idle pool when `reuse` allows."""
+        import asyncio
+        idle = self._idle.get(key) if reuse else None
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        scheme, host, port = key
+        ssl_context = None
+        if scheme == "https":
+            import ssl
+            ssl_context = ssl.create_default_context()
+        self.stats["connections"] += 1
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        return reader, writer, False
+
+    async def _request(self, method: str, url: str) -> Tuple[int, Dict[str, str]]:
+        """One request on a pooled connection; returns (status, lower-cased headers).
+
+        The timeout starts once a per-host slot is free, so time spent queued
+        behind other requests to the same host never counts against it.
+        """
+        import asyncio
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        key = (scheme, parts.hostname or "", parts.port or (443 if scheme == "https" else 80))
+        if key not in self._limits:
+            self._limits[key] = asyncio.Semaphore(self.per_host)
+
+        async with self._limits[key]:
+            return await asyncio.wait_for(self._exchange(method, key, parts), self.timeout)
+
+    async def _exchange(self, method: str, key: Tuple[str, str, int], parts: Any,
+                        reuse: bool = True) -> Tuple[int, Dict[str, str]]:
+        import asyncio
+
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        reader, writer, reused = await self._open(key, reuse)
+        reusable = False
+        try:
+            request = (f"{method} {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+                       f"User-Agent: blux-lint-links/1.0\r\nAccept: */*\r\n"
+                       f"Connection: {'keep-alive' if method == 'HEAD' else 'close'}\r\n\r\n")
+            writer.write(request.encode("latin-1"))
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            status = int(lines[0].split()[1])
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            # HEAD responses carry no body, so the connection can be reused as-is
+            reusable = method == "HEAD" and headers.get("connection", "").lower() != "close"
+            return status, headers
+        except (ConnectionError, asyncio.IncompleteReadError):
+            if not reused:
+                raise
+        finally:
+            if reusable:
+                self._idle.setdefault(key, []).append((reader, writer))
+            else:
+                writer.close()
+        # Servers close idle keep-alive connections at will: retry once on a fresh one
+        return await self._exchange(method, key, parts, reuse=False)
+
+    async def _check(self, url: str) -> Dict[str, Any]:
+        import asyncio
+        from urllib.parse import urljoin
+
+        current = url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                status, headers = await self._request("HEAD", current)
+                if status in (405, 501):
+                    status, headers = await self._request("GET", current)
+                if status in (301, 302, 303, 307, 308) and "location" in headers:
+                    current = urljoin(current, headers["location"])
+                    continue
+                break
+            else:
+                return {"ok": False, "reason": "too many redirects"}
+        except asyncio.TimeoutError:
+            return {"ok": False, "reason": f"timed out after {self.timeout:g}s"}
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+            return {"ok": False, "reason": f"unreachable: {e.__class__.__name__}"}
+        if status == 429:
+            return {"ok": True, "reason": "rate limited (unverified)", "status": status}
+        if status >= 400:
+            return {"ok": False, "reason": f"HTTP {status}", "status": status}
+        return {"ok": True, "reason": "", "status": status, "checked_at": time.time()}
+
+    def check(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Results for each URL, from the TTL cache or a fresh concurrent check."""
+        import asyncio
+
+        started = time.perf_counter()
+        now = time.time()
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        for url in dict.fromkeys(urls):
+            entry = self.cache.get(url)
+            if entry is not None and now - entry["checked_at"] < self.ttl:
+                results[url] = entry
+            else:
+                pending.append(url)
+
+        async def check_all():
+            try:
+                return await asyncio.gather(*(self._check(url) for url in pending))
+            finally:
+                for connections in self._idle.values():
+                    for _, writer in connections:
+                        writer.close()
+                self._idle.clear()
+                self._limits.clear()
+
+        for url, result in zip(pending, asyncio.run(check_all()) if pending else []):
+            results[url] = result
+            if "checked_at" in result:
+                # Only verified URLs are cached; failures are retried next run
+                self.cache[url] = result
+        elapsed = time.perf_counter() - started
+        self.stats.update(urls=len(results), cached=len(results) - len(pending), checked=len(pending),
+                          seconds=round(elapsed, 3),
+                          urls_per_second=round(len(pending) / elapsed, 1) if pending and elapsed else 0.0)
+        return results
+
+
+def check_external_links(files: List[Path], checker: ExternalLinkChecker) -> List[LinkIssue]:
+    """Issues for broken http(s) links, in file and line order."""
+    urls = collect_external_links(files)
+    results = checker.check(urls)
+    issues = [LinkIssue(file=file, target=url, line_number=line_number, reason=results[url]["reason"])
+              for url, locations in urls.items() if not results[url]["ok"]
+              for file, line_number in locations]
+    order = {file: index for index, file in enumerate(files)}
+    issues.sort(key=lambda issue: (order[issue.file], issue.line_number))
     return issues
 
 
+def serve_stand_in_hosts(count: int):
+    """Start local HTTP/1.1 servers that answer like real link targets.
+
+    /ok/* returns 200, /moved/* redirects to /ok/*, /gone/* returns 404 and
+    HEAD to /get-only/* returns 405. Returns (base URLs, shutdown callable).
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, head_only: bool):
+            if self.path.startswith("/moved/"):
+                self.send_response(301)
+                self.send_header("Location", "/ok/" + self.path[len("/moved/"):])
+            elif self.path.startswith("/gone/"):
+                self.send_response(404)
+            elif self.path.startswith("/get-only/") and head_only:
+                self.send_response(405)
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_HEAD(self):
+            self._respond(head_only=True)
+
+        def do_GET(self):
+            self._respond(head_only=False)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 128
+
+    servers = [Server(("127.0.0.1", 0), Handler) for _ in range(count)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def shutdown():
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+    return [f"http://127.0.0.1:{server.server_address[1]}" for server in servers], shutdown
+
+
+def run_external_benchmark(count: int, per_host: int) -> Dict[str, object]:
+    """Check `count` distinct URLs spread over local stand-in hosts, cold then cached."""
+    import tempfile
+
+    hosts, shutdown = serve_stand_in_hosts(4)
+    try:
+        kinds = ["ok"] * 7 + ["moved", "gone", "get-only"]
+        urls = [f"{hosts[i % len(hosts)]}/{kinds[i % len(kinds)]}/{i}" for i in range(count)]
+        with tempfile.TemporaryDirectory(prefix="blux-external-") as scratch:
+            cache_path = Path(scratch) / "external.json"
+            cold = ExternalLinkChecker(cache_path, per_host=per_host)
+            results = cold.check(urls)
+            cold.save()
+            warm = ExternalLinkChecker(cache_path, per_host=per_host)
+            warm.load()
+            warm.check(urls)
+    finally:
+        shutdown()
+    return {"hosts": len(hosts), "per_host": per_host, "cold": cold.stats, "warm": warm.stats,
+            "broken": sum(1 for result in results.values() if not result["ok"])}
+
+
+def generate_docs_tree(root: Path, count: int) -> None:
+    """Write `count` Markdown files laid out like docs/modules, sharing one template."""
+    shared = ["ARCHITECTURE.md", "SECURITY.md", "ROADMAP.md", "INSTALL.md"]
+    for name in shared:
+        (root / name).write_text(f"# {name[:-3].title()}\n", encoding="utf-8")
+    per_module = 100
+    for index in range(count):
+        module_dir = root / "modules" / f"module-{index // per_module:04d}"
+        if index % per_module == 0:
+            module_dir.mkdir(parents=True, exist_ok=True)
+        lines = [f"# Document {index}", ""]
+        lines.extend(f"- [{name}](../../{name})" for name in shared)
+        lines.append(f"- [Previous](doc-{max(index - 1, 0) % per_module:03d}.md)")
+        lines.append("- [Upstream](https://github.com/Outer-Void/blux-ecosystem)")
+        lines.append(f"- [Overview](#document-{index})")
+        lines.append("- [Threat model](../../SECURITY.md#security)")
+        if index % 50 == 0:
+            lines.append("- [Broken](../../MISSING.md)")
+            lines.append("- [Stale section](../../ROADMAP.md#q3-milestones)")
+        lines.extend(f"Paragraph {n} of the shared module template." for n in range(20))
+        (module_dir / f"doc-{index % per_module:03d}.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def run_benchmark(count: int, jobs: int) -> Dict[str, object]:
+    """Time walking and scanning a generated tree of `count` Markdown files."""
+    import tempfile
+
+    def timed(label: str, func) -> object:
+        started = time.perf_counter()
+        value = func()
+        elapsed = time.perf_counter() - started
+        report[label] = {'seconds': round(elapsed, 3), 'files_per_second': round(count / elapsed, 1)}
+        return value
+
+    report: Dict[str, object] = {'files': count, 'jobs': jobs or os.cpu_count() or 1}
+    with tempfile.TemporaryDirectory(prefix="blux-links-") as scratch:
+        root = Path(scratch)
+        generate_docs_tree(root, count)
+        files = timed('walk', lambda: find_markdown_files([root]))
+        uncached = timed('serial_uncached', lambda: scan_files(files, 1, LinkChecker(memoize=False)))
+        timed('serial_cached', lambda: scan_files(files, 1, LinkChecker()))
+        timed('parallel', lambda: scan_files(files, report['jobs']))
+        report['issues'] = len(uncached)
+
+        cache = LinkCache(root / ".cache" / "lint_links.json")
+        timed('incremental_cold', lambda: cache.lint(files, 1, LinkChecker()))
+        edited = files[len(files) // 2]
+        edited.write_text(edited.read_text(encoding="utf-8") + "- [Roadmap](../../ROADMAP.md)\n", encoding="utf-8")
+        timed('incremental_warm', lambda: cache.lint(files, 1, LinkChecker()))
+        report['incremental_rescanned'] = cache.rescanned
+    return report
+
+
+def display_path(path: Path) -> Path:
+    try:
+        return path.resolve().relative_to(REPO_ROOT)
+    except ValueError:
+        return path
+
+
 def main(argv: Iterable[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Lint Markdown links")
     parser.add_argument("paths", nargs="*", type=Path, default=[REPO_ROOT])
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="Worker processes for large trees (default: CPU count, 1 disables the pool)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Rescan only files affected by changes since the last incremental run")
+    parser.add_argument("--cache-file", type=Path, default=DEFAULT_CACHE,
+                        help="Result cache for --incremental (default: .cache/lint_links.json)")
+    parser.add_argument("--external", action="store_true",
+                        help="Also check http(s) links (results cached in .cache/lint_links_external.json)")
+    parser.add_argument("--external-ttl", type=float, default=EXTERNAL_TTL,
+                        help=f"Seconds a verified URL stays cached (default: {EXTERNAL_TTL})")
+    parser.add_argument("--external-per-host", type=int, default=HOST_CONCURRENCY,
+                        help=f"Concurrent requests per host (default: {HOST_CONCURRENCY})")
+    parser.add_argument("--external-timeout", type=float, default=EXTERNAL_TIMEOUT,
+                        help=f"Seconds per request (default: {EXTERNAL_TIMEOUT:g})")
+    parser.add_argument("--benchmark-external", type=int, metavar="N",
+                        help="Benchmark checking N URLs against local stand-in HTTP servers")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="Benchmark walking and scanning a generated tree of N Markdown files")
     args = parser.parse_args(list(argv) if argv is not None else None)
 
+    if args.benchmark:
+        report = run_benchmark(args.benchmark, args.jobs)
+        print(f"Scanned {report['files']:,} generated files ({report['issues']:,} issues)")
+        for label in ('walk', 'serial_uncached', 'serial_cached', 'parallel', 'incremental_cold', 'incremental_warm'):
+            jobs = report['jobs'] if label == 'parallel' else 1
+            print(f"  {label:<16} ({jobs} jobs): {report[label]['seconds']:.3f}s, "
+                  f"{report[label]['files_per_second']:,.1f} files/s")
+        print(f"  One edited file: incremental run rescanned {report['incremental_rescanned']:,} files")
+        return 0
+
+    if args.benchmark_external:
+        report = run_external_benchmark(args.benchmark_external, args.external_per_host)
+        print(f"Checked {report['cold']['urls']:,} URLs on {report['hosts']} stand-in hosts "
+              f"({report['per_host']} per host, {report['broken']:,} broken)")
+        for label in ('cold', 'warm'):
+            stats = report[label]
+            print(f"  {label:<5} {stats['seconds']:.3f}s, {stats['checked']:,} requested, {stats['cached']:,} cached, "
+                  f"{stats['connections']:,} connections, {stats['urls_per_second']:,.1f} URLs/s")
+        return 0
+
     files = find_markdown_files(args.paths)
-    issues: List[LinkIssue] = []
-    for file in files:
-        issues.extend(scan_file(file))
+    if args.incremental:
+        cache = LinkCache(args.cache_file)
+        cache.load()
+        issues = cache.lint(files, args.jobs)
+        cache.save()
+        print(f"Incremental: rescanned {cache.rescanned:,} of {len(files):,} files")
+    else:
+        issues = scan_files(files, args.jobs)
+
+    if args.external:
+        external = ExternalLinkChecker(EXTERNAL_CACHE, args.external_ttl, args.external_per_host,
+                                       args.external_timeout)
+        external.load()
+        issues.extend(check_external_links(files, external))
+        external.save()
+        stats = external.stats
+        print(f"External: {stats['urls']:,} unique URLs, {stats['cached']:,} cached, "
+              f"{stats['checked']:,} checked in {stats['seconds']:.2f}s "
+              f"({stats.get('urls_per_second', 0.0):,.1f} URLs/s)")
 
     if issues:
         print("Link warnings:")
         for issue in issues:
-            rel = issue.file.relative_to(REPO_ROOT)
-            print(f"  {rel}:{issue.line_number} -> {issue.target} ({issue.reason})")
+            print(f"  {display_path(issue.file)}:{issue.line_number} -> {issue.target} ({issue.reason})")
     else:
         print("No link issues detected.")
     return 0
@@ -11,18 +11,23 @@ DOCS_INDEX = REPO_ROOT / "docs" / "index.md"
 HEADER = "<!-- DO NOT EDIT: generated from README.md via render_index_from_readme.py -->\n"
 
 
-def main() -> int:
-    if not README_PATH.exists():
-        raise SystemExit("README.md not found")
-
-    readme_content = README_PATH.read_text(encoding="utf-8")
+def render_index(readme_content: str) -> str:
+    """Rewrite README links so they resolve from docs/index.md."""
     transformed = readme_content
     transformed = transformed.replace("](docs/)", "](./)")
     transformed = re.sub(r"\((?:\./)?docs/", "(", transformed)
     transformed = re.sub(r"\((?:\./)?\.github/", "(../.github/", transformed)
-    output = HEADER + transformed
+    return HEADER + transformed
+
+
+def main() -> int:
+    if not README_PATH.exists():
+        raise SystemExit("README.md not found")
+
+    output = render_index(README_PATH.read_text(encoding="utf-8"))
     DOCS_INDEX.parent.mkdir(parents=True, exist_ok=True)
-    DOCS_INDEX.write_text(output, encoding="utf-8")
+    if not DOCS_INDEX.exists() or DOCS_INDEX.read_text(encoding="utf-8") != output:
+        DOCS_INDEX.write_text(output, encoding="utf-8")
     return 0
 
 
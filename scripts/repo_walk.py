@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""Walk the repository quickly for the documentation scripts.
+
+Directories are listed with os.scandir and walked with an explicit stack.
+Excluded and git-ignored directories are pruned before they are entered, and
+.gitignore files are honored at every level. Listings can be cached on disk,
+keyed by directory mtime, so repeat walks of a large checkout only rescan the
+directories that gained, lost or renamed entries.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+EXCLUDE_DIRS = {".git", "__pycache__", "node_modules", "site", ".venv"}
+DEFAULT_LISTING_CACHE = REPO_ROOT / ".cache" / "repo_walk.json"
+
+# (regex, negated, directory only, anchored to the .gitignore's directory)
+IgnoreRule = Tuple["re.Pattern[str]", bool, bool, bool]
+
+
+def _glob_to_regex(pattern: str) -> str:
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                regex.append("[" + pattern[i + 1:end].replace("!", "^", 1) + "]")
+                i = end
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return "".join(regex)
+
+
+def parse_gitignore(text: str) -> List[IgnoreRule]:
+    """Compile .gitignore lines into ordered rules (last match wins)."""
+    rules: List[IgnoreRule] = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if line:
+            rules.append((re.compile(_glob_to_regex(line) + r"\Z"), negated, dir_only, anchored))
+    return rules
+
+
+class RepoWalker:
+    """Shared scandir walker with exclusion, .gitignore and listing-cache support."""
+
+    def __init__(self, root: Path = REPO_ROOT, exclude: Iterable[str] = EXCLUDE_DIRS,
+                 gitignore: bool = True, cache_path: Optional[Path] = None):
+        self.root = os.path.abspath(root)
+        self.exclude = set(exclude)
+        self.gitignore = gitignore
+        self.cache_path = cache_path
+        self._listings: Dict[str, list] = {}
+        self._rules: Dict[str, List[Tuple[str, IgnoreRule]]] = {}
+        self.scanned = 0
+        self.cached = 0
+        if cache_path is not None:
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    self._listings = json.load(f)
+            except (OSError, ValueError):
+                self._listings = {}
+
+    def save(self) -> None:
+        """Persist the listing cache, if one was requested."""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._listings, f, separators=(",", ":"))
+        os.replace(tmp_path, self.cache_path)
+
+    def _scan(self, directory: str) -> Tuple[List[str], List[str]]:
+        """Raw (dirs, files) of a directory, from the cache when its mtime is unchanged."""
+        if self.cache_path is not None:
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                return [], []
+            entry = self._listings.get(directory)
+            if entry is not None and entry[0] == mtime_ns:
+                self.cached += 1
+                return entry[1], entry[2]
+        dirs: List[str] = []
+        files: List[str] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    (dirs if entry.is_dir(follow_symlinks=False) else files).append(entry.name)
+        except OSError:
+            return [], []
+        self.scanned += 1
+        dirs.sort(key=lambda name: (name.lower(), name))
+        files.sort(key=lambda name: (name.lower(), name))
+        if self.cache_path is not None:
+            self._listings[directory] = [mtime_ns, dirs, files]
+        return dirs, files
+
+    def _rules_for(self, directory: str, files: Optional[List[str]] = None) -> List[Tuple[str, IgnoreRule]]:
+        """Ignore rules in effect inside `directory`, each with the directory it came from."""
+        rules = self._rules.get(directory)
+        if rules is not None:
+            return rules
+        parent = os.path.dirname(directory)
+        inherited = self._rules_for(parent) if directory != self.root and parent != directory \
+            and directory.startswith(self.root + os.sep) else []
+        rules = inherited
+        if files is None:
+            files = self._scan(directory)[1]
+        if ".gitignore" in files:
+            try:
+                with open(os.path.join(directory, ".gitignore"), encoding="utf-8", errors="ignore") as f:
+                    own = parse_gitignore(f.read())
+            except OSError:
+                own = []
+            rules = inherited + [(directory, rule) for rule in own]
+        self._rules[directory] = rules
+        return rules
+
+    @staticmethod
+    def _ignored(rules: List[Tuple[str, IgnoreRule]], directory: str, name: str, is_dir: bool) -> bool:
+        for base, (pattern, negated, dir_only, anchored) in reversed(rules):
+            if dir_only and not is_dir:
+                continue
+            if anchored:
+                relative = directory[len(base) + 1:].replace(os.sep, "/") if directory != base else ""
+                subject = f"{relative}/{name}" if relative else name
+            else:
+                subject = name
+            if pattern.match(subject):
+                return not negated
+        return False
+
+    def listdir(self, directory: str) -> Tuple[List[str], List[str]]:
+        """Visible (dirs, files) of a directory, sorted case-insensitively."""
+        directory = os.path.abspath(directory)
+        dirs, files = self._scan(directory)
+        dirs = [name for name in dirs if name not in self.exclude]
+        if not self.gitignore:
+            return dirs, list(files)
+        rules = self._rules_for(directory, files)
+        if not rules:
+            return dirs, list(files)
+        dirs = [name for name in dirs if not self._ignored(rules, directory, name, True)]
+        files = [name for name in files if not self._ignored(rules, directory, name, False)]
+        return dirs, files
+
+    def walk(self, top: Optional[Path] = None) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Pre-order (dirpath, dirnames, filenames) like os.walk; prune dirnames in place."""
+        stack = [os.path.abspath(top if top is not None else self.root)]
+        while stack:
+            directory = stack.pop()
+            dirs, files = self.listdir(directory)
+            yield directory, dirs, files
+            stack.extend(os.path.join(directory, name) for name in reversed(dirs))
+
+
+def generate_monorepo(root: Path, files: int, per_dir: int = 50) -> None:
+    """Write an empty-file tree shaped like a monorepo checkout, with ignored build output."""
+    (root / ".gitignore").write_text("build/\n*.log\n", encoding="utf-8")
+    for index in range(files):
+        package = root / "packages" / f"pkg-{index // (per_dir * 10):03d}" / f"src-{index // per_dir % 10}"
+        if index % per_dir == 0:
+            package.mkdir(parents=True, exist_ok=True)
+            (package.parent / "build").mkdir(exist_ok=True)
+            (package.parent / "node_modules").mkdir(exist_ok=True)
+        (package / (f"module_{index}.py" if index % 7 else f"notes_{index}.md")).touch()
+        if index % 10 == 0:
+            (package.parent / "build" / f"out_{index}.o").touch()
+            (package / f"run_{index}.log").touch()
+
+
+def legacy_walk(root: Path) -> int:
+    """The previous recursive iterdir walk with a should_skip per entry, for comparison."""
+    def should_skip(path: Path) -> bool:
+        return bool(set(path.parts) & EXCLUDE_DIRS)
+
+    def count(directory: Path) -> int:
+        total = 0
+        for entry in sorted(directory.iterdir(), key=lambda p: p.name.lower()):
+            if should_skip(entry.relative_to(root)):
+                continue
+            total += 1
+            if entry.is_dir():
+                total += count(entry)
+        return total
+
+    return count(root)
+
+
+def run_benchmark(root: Optional[Path], files: int) -> Dict[str, object]:
+    """Time the legacy walk, os.walk and RepoWalker (cold and cached) over a tree."""
+    import tempfile
+
+    def timed(label: str, func) -> None:
+        started = time.perf_counter()
+        entries = func()
+        report[label] = {"seconds": round(time.perf_counter() - started, 3), "entries": entries}
+
+    def repo_walk(walker: RepoWalker) -> int:
+        return sum(len(dirs) + len(names) for _, dirs, names in walker.walk())
+
+    def os_walk(path: Path) -> int:
+        total = 0
+        for _, dirs, names in os.walk(path):
+            dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+            total += len(dirs) + len(names)
+        return total
+
+    report: Dict[str, object] = {}
+    with tempfile.TemporaryDirectory(prefix="blux-walk-") as scratch:
+        if root is None:
+            root = Path(scratch) / "monorepo"
+            root.mkdir()
+            generate_monorepo(root, files)
+        cache_path = Path(scratch) / "listings.json"
+        report["root"] = str(root)
+        timed("legacy_iterdir", lambda: legacy_walk(root))
+        timed("os_walk", lambda: os_walk(root))
+        timed("repo_walk", lambda: repo_walk(RepoWalker(root)))
+        cold = RepoWalker(root, cache_path=cache_path)
+        timed("repo_walk_cold_cache", lambda: repo_walk(cold))
+        cold.save()
+        warm = RepoWalker(root, cache_path=cache_path)
+        timed("repo_walk_warm_cache", lambda: repo_walk(warm))
+        report["directories"] = warm.cached + warm.scanned
+    return report
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Walk the repository or benchmark the walker")
+    parser.add_argument("root", nargs="?", type=Path, default=REPO_ROOT)
+    parser.add_argument("--no-gitignore", action="store_true", help="Do not apply .gitignore rules")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Benchmark walking ROOT (or a generated monorepo with --generate)")
+    parser.add_argument("--generate", type=int, metavar="FILES",
+                        help="Benchmark on a generated monorepo with FILES files instead of ROOT")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    if args.benchmark or args.generate:
+        report = run_benchmark(None if args.generate else args.root, args.generate or 0)
+        print(f"Walked {report['root']} ({report['directories']:,} directories)")
+        for label in ("legacy_iterdir", "os_walk", "repo_walk", "repo_walk_cold_cache", "repo_walk_warm_cache"):
+            print(f"  {label:<21} {report[label]['seconds']:.3f}s, {report[label]['entries']:,} entries")
+        return 0
+
+    walker = RepoWalker(args.root, gitignore=not args.no_gitignore)
+    for directory, _, files in walker.walk():
+        for name in files:
+            print(os.path.relpath(os.path.join(directory, name), args.root))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,20 +5,32 @@ The script is intentionally idempotent: it creates missing files but never
 overwrites hand-crafted documentation. When a module repository is available
 as a sibling checkout or git submodule, the script links to the upstream
 sources so writers know where the canonical material lives.
+
+With --mirror, the canonical upstream docs are copied into docs/modules/
+instead. Modules sync concurrently, each subrepo is discovered once, and the
+git-ignored .cache/scan_subrepos_mirror.json records the hash and stat of every
+doc synced, so an unchanged upstream doc is never re-read in full, re-copied or
+rewritten. Mirroring replaces generated stubs and earlier mirrored copies. It
+does not replace docs edited locally unless --force is given.
 """
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DOCS_ROOT = REPO_ROOT / "docs"
 MODULE_DOCS_ROOT = DOCS_ROOT / "modules"
 ARCHITECTURE_DOC = DOCS_ROOT / "ARCHITECTURE.md"
+MIRROR_MANIFEST = REPO_ROOT / ".cache" / "scan_subrepos_mirror.json"
+MIRROR_NOTE = "<!-- mirrored from {source} by scan_subrepos.py --mirror; edit upstream -->\n"
 
 @dataclass
 class ModuleSpec:
@@ -155,9 +167,9 @@ def discover_subrepo_path(module: ModuleSpec) -> Optional[Path]:
     return None
 
 
-def discover_source(module: ModuleSpec, doc_name: str) -> Optional[Path]:
+def discover_source(module: ModuleSpec, doc_name: str, subrepo: Optional[Path] = None) -> Optional[Path]:
     """Attempt to locate a matching file in the sub-repository."""
-    subrepo = discover_subrepo_path(module)
+    subrepo = subrepo or discover_subrepo_path(module)
     if subrepo is None:
         return None
     candidates = [
@@ -176,22 +188,135 @@ def ensure_module_docs(module: ModuleSpec) -> List[str]:
     """Create placeholder documentation files when missing."""
     created: List[str] = []
     module.doc_directory.mkdir(parents=True, exist_ok=True)
+    subrepo = discover_subrepo_path(module)
     for doc_name, filename in module.doc_filenames.items():
         destination = module.doc_directory / filename
         if destination.exists():
             continue
-        source_path = discover_source(module, doc_name)
-        if source_path:
-            relative = Path("..") / Path("..") / source_path.relative_to(REPO_ROOT)
-            source_link = relative.as_posix()
-        else:
-            source_link = module.repo_urls[0]
-        template = build_template(module, doc_name, source_link)
+        source_path = discover_source(module, doc_name, subrepo) if subrepo else None
+        template = build_template(module, doc_name, source_link_for(module, source_path))
         destination.write_text(template, encoding="utf-8")
         created.append(str(destination.relative_to(REPO_ROOT)))
     return created
 
 
+def source_link_for(module: ModuleSpec, source_path: Optional[Path]) -> str:
+    if source_path:
+        return (Path("..") / Path("..") / source_path.relative_to(REPO_ROOT)).as_posix()
+    return module.repo_urls[0]
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(MIRROR_MANIFEST, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: Dict[str, Dict[str, Any]]) -> bool:
+    """Write the manifest only when it changed."""
+    if not manifest and not MIRROR_MANIFEST.exists():
+        return False
+    content = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    if MIRROR_MANIFEST.exists() and MIRROR_MANIFEST.read_text(encoding="utf-8") == content:
+        return False
+    MIRROR_MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = MIRROR_MANIFEST.with_name(MIRROR_MANIFEST.name + ".tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, MIRROR_MANIFEST)
+    return True
+
+
+def mirror_module_docs(module: ModuleSpec, manifest: Dict[str, Dict[str, Any]],
+                       force: bool = False) -> Dict[str, Any]:
+    """Copy a module's upstream docs into docs/modules/<key>/.
+
+    Returns a per-module report and the manifest entries for this module. A
+    source whose size and mtime match the manifest is taken as unchanged
+    without being read. A changed mtime with the same hash refreshes the
+    entry but copies nothing. The manifest is machine-local, so on a fresh
+    checkout a destination already identical to the mirrored content is
+    recognised as ours rather than as a local edit.
+    """
+    started = time.perf_counter()
+    report: Dict[str, Any] = {"module": module.key, "subrepo": None, "synced": [], "unchanged": [],
+                              "local_edits": [], "no_upstream": [], "entries": {}}
+    subrepo = discover_subrepo_path(module)
+    if subrepo is None:
+        # Keep earlier mirror records; the checkout may just be absent on this machine
+        report["no_upstream"] = list(module.doc_filenames.values())
+        prefix = str(module.doc_directory.relative_to(REPO_ROOT)) + os.sep
+        report["entries"] = {key: entry for key, entry in manifest.items() if key.startswith(prefix)}
+        report["ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return report
+    report["subrepo"] = str(subrepo.relative_to(REPO_ROOT))
+    module.doc_directory.mkdir(parents=True, exist_ok=True)
+
+    for doc_name, filename in module.doc_filenames.items():
+        destination = module.doc_directory / filename
+        key = str(destination.relative_to(REPO_ROOT))
+        source = discover_source(module, doc_name, subrepo)
+        if source is None:
+            report["no_upstream"].append(filename)
+            if key in manifest:
+                report["entries"][key] = manifest[key]
+            continue
+        source_rel = source.relative_to(REPO_ROOT).as_posix()
+        stat = source.stat()
+        entry = manifest.get(key)
+        if entry and entry["source"] == source_rel \
+                and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns) \
+                and destination.exists() and destination.stat().st_mtime_ns == entry["dest_mtime_ns"]:
+            report["unchanged"].append(filename)
+            report["entries"][key] = entry
+            continue
+
+        upstream = source.read_bytes()
+        content = MIRROR_NOTE.format(source=source_link_for(module, source)).encode("utf-8") + upstream
+        source_hash = _sha256(upstream)
+        current = destination.read_bytes() if destination.exists() else None
+        stub = build_template(module, doc_name, source_link_for(module, source)).encode("utf-8")
+        stub_upstream = build_template(module, doc_name, module.repo_urls[0]).encode("utf-8")
+        ours = current is None or current in (content, stub, stub_upstream) or \
+            (entry is not None and _sha256(current) == entry["dest_sha256"])
+        if not ours and not force:
+            report["local_edits"].append(filename)
+            if entry:
+                report["entries"][key] = entry
+            continue
+        if current != content:
+            destination.write_bytes(content)
+            report["synced"].append(filename)
+        else:
+            report["unchanged"].append(filename)
+        report["entries"][key] = {
+            "source": source_rel, "sha256": source_hash, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+            "dest_sha256": _sha256(content), "dest_mtime_ns": destination.stat().st_mtime_ns,
+        }
+    report["ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return report
+
+
+def mirror_all(force: bool = False, jobs: int = 0) -> Dict[str, Any]:
+    """Mirror every module concurrently and update the manifest."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    started = time.perf_counter()
+    manifest = load_manifest()
+    with ThreadPoolExecutor(max_workers=jobs or len(MODULE_SPECS)) as pool:
+        reports = list(pool.map(lambda module: mirror_module_docs(module, manifest, force), MODULE_SPECS))
+    new_manifest: Dict[str, Dict[str, Any]] = {}
+    for report in reports:
+        new_manifest.update(report.pop("entries"))
+    return {"modules": reports, "manifest_updated": save_manifest(new_manifest),
+            "ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
 def build_template(module: ModuleSpec, doc_name: str, source_link: str) -> str:
     """Generate a minimal documentation template."""
     title_fragment = doc_name.replace("_", " ").title()
@@ -256,8 +381,30 @@ def update_architecture_index() -> bool:
 def main(argv: Optional[Iterable[str]] = None) -> int:
     parser = argparse.ArgumentParser(description="Ensure module documentation exists")
     parser.add_argument("--json", action="store_true", help="Emit JSON summary")
+    parser.add_argument("--mirror", action="store_true",
+                        help="Copy canonical docs from discovered sub-repositories into docs/modules/")
+    parser.add_argument("--force", action="store_true",
+                        help="With --mirror, also replace module docs that were edited locally")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="Modules to mirror concurrently (default: all)")
     args = parser.parse_args(list(argv) if argv is not None else None)
 
+    if args.mirror:
+        result = mirror_all(args.force, args.jobs)
+        if args.json:
+            print(json.dumps(result, indent=2))
+            return 0
+        for report in result["modules"]:
+            if report["subrepo"] is None:
+                print(f"  {report['module']:<15} {report['ms']:>8.2f} ms  no sub-repository found")
+                continue
+            print(f"  {report['module']:<15} {report['ms']:>8.2f} ms  {len(report['synced'])} synced, "
+                  f"{len(report['unchanged'])} unchanged ({report['subrepo']})")
+            for filename in report["local_edits"]:
+                print(f"      kept local edits in {filename} (use --force to replace)")
+        print(f"Mirrored {len(result['modules'])} modules in {result['ms']:.1f} ms")
+        return 0
+
     summary: Dict[str, List[str]] = {"created": []}
     for module in MODULE_SPECS:
         created = ensure_module_docs(module)
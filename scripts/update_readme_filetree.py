@@ -2,8 +2,11 @@
 """Insert the generated file tree into README.md."""
 from __future__ import annotations
 
-import subprocess
 from pathlib import Path
+from typing import Optional
+
+from gen_filetree import generate_tree
+from repo_walk import RepoWalker
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 README_PATH = REPO_ROOT / "README.md"
@@ -12,14 +15,8 @@ MARKER_END = "<!-- FILETREE:END -->"
 GENERATED_NOTE = "<!-- generated; do not edit manually -->"
 
 
-def generate_tree_text() -> str:
-    result = subprocess.run(
-        ["python", str(REPO_ROOT / "scripts" / "gen_filetree.py")],
-        check=True,
-        capture_output=True,
-        text=True,
-    )
-    return result.stdout.strip()
+def generate_tree_text(walker: Optional[RepoWalker] = None) -> str:
+    return generate_tree(walker).strip()
 
 
 def build_block(tree_text: str) -> str:
@@ -35,22 +32,25 @@ def build_block(tree_text: str) -> str:
     )
 
 
+def insert_tree(content: str, tree_text: str) -> str:
+    """Return README content with the managed file-tree block replaced or appended."""
+    block = build_block(tree_text)
+    if MARKER_BEGIN in content and MARKER_END in content:
+        before, _sep, rest = content.partition(MARKER_BEGIN)
+        _, _sep2, after = rest.partition(MARKER_END)
+        return before + block + after
+    return content.rstrip() + "\n\n" + block + "\n"
+
+
 def main() -> int:
     tree_text = generate_tree_text()
-    block = build_block(tree_text)
 
     if README_PATH.exists():
         content = README_PATH.read_text(encoding="utf-8")
     else:
         content = ""
 
-    if MARKER_BEGIN in content and MARKER_END in content:
-        before, _sep, rest = content.partition(MARKER_BEGIN)
-        _, _sep2, after = rest.partition(MARKER_END)
-        new_content = before + block + after
-    else:
-        new_content = content.rstrip() + "\n\n" + block + "\n"
-
+    new_content = insert_tree(content, tree_text)
     if new_content != content:
         README_PATH.write_text(new_content, encoding="utf-8")
     return 0
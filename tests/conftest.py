@@ -0,0 +1,29 @@
+"""Shared fixtures for the tools/ and scripts/ tests."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+for directory in (ROOT / 'tools', ROOT / 'scripts'):
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+
+
+def load_tool(name: str):
+    """Import a hyphenated tools/ CLI (e.g. config-validator) as a module."""
+    module_name = name.replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, ROOT / 'tools' / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def repo_root() -> Path:
+    return ROOT
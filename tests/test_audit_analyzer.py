@@ -0,0 +1,78 @@
+"""Tests for tools/audit-analyzer.py."""
+
+import json
+import sys
+import time
+
+import pytest
+
+from conftest import load_tool
+from blux_common import format_timestamp
+
+analyzer_module = load_tool('audit-analyzer')
+
+
+def test_compare_skips_non_numeric_durations(tmp_path):
+    split = time.time() - 60
+    before, after = format_timestamp(split - 30), format_timestamp(split + 30)
+    good = [{'timestamp': stamp, 'service': 'blux-reg', 'operation': 'verify', 'duration_ms': duration}
+            for stamp, duration in ((before, 12), (after, 14.5))]
+    bad_durations = ['true', '"12"', 'null', 'NaN', 'Infinity', '-Infinity', '1e999', '[3]']
+    lines = [json.dumps(record) for record in good]
+    lines += [f'{{"timestamp": "{after}", "service": "blux-reg", "operation": "verify", "duration_ms": {raw}}}'
+              for raw in bad_durations]
+    lines.append(f'{{"timestamp": "{after}", "service": "blux-reg", "operation": "verify"}}')
+    (tmp_path / 'audit.jsonl').write_text('\n'.join(lines) + '\n')
+
+    analyzer = analyzer_module.AuditAnalyzer(str(tmp_path))
+    report = analyzer.compare_latency(split, 3600, min_samples=1)
+    metadata = report['metadata']
+    assert metadata['records_scanned'] == len(lines)
+    assert metadata['records_in_windows'] == 2
+    assert metadata['records_skipped'] == len(bad_durations) + 1
+    assert metadata['groups'] == 1
+
+
+def write_segment(directory, count):
+    lines = [json.dumps({'timestamp': format_timestamp(1_700_000_000 + i), 'service': 'blux-reg',
+                         'operation': 'verify', 'duration_ms': i}) for i in range(count)]
+    # A torn last line makes pyarrow give up and hand the segment to the Python reader
+    (directory / 'audit.jsonl').write_text('\n'.join(lines) + '\n{"timestamp": "2023-')
+
+
+def test_export_fallback_all_null_string_column(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    write_segment(tmp_path, 5)
+    output = tmp_path / 'out.arrow'
+    code = analyzer_module.export_main(['--audit-path', str(tmp_path), '--engine', 'pyarrow', '--format', 'arrow',
+                                        '--columns', 'service,status', '-o', str(output)])
+    assert code == 0
+    table = pa.ipc.open_file(str(output)).read_all()
+    assert table.column('service').to_pylist() == ['blux-reg'] * 5
+    assert table.column('status').to_pylist() == [None] * 5
+
+
+def test_export_pyarrow_engine_without_pyarrow(tmp_path, monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    write_segment(tmp_path, 1)
+    output = tmp_path / 'out.csv'
+    code = analyzer_module.export_main(['--audit-path', str(tmp_path), '--engine', 'pyarrow', '-o', str(output)])
+    assert code == 1
+    assert 'pyarrow' in capsys.readouterr().err
+    assert not output.exists()
+
+
+def test_compare_zero_baseline_is_valid_json(tmp_path, capsys):
+    split = time.time() - 600
+    lines = [json.dumps({'timestamp': format_timestamp(split + offset), 'service': 'blux-reg',
+                         'operation': 'verify', 'duration_ms': duration})
+             for i in range(30) for offset, duration in ((-300 + i, 0), (i + 1, 12))]
+    (tmp_path / 'audit.jsonl').write_text('\n'.join(lines) + '\n')
+
+    analyzer = analyzer_module.AuditAnalyzer(str(tmp_path))
+    report = analyzer.compare_latency(split, 3600, min_samples=10)
+    regression, = report['regressions']
+    assert regression['p50_ratio'] is None and regression['p95_ratio'] is None
+    assert json.loads(json.dumps(report, allow_nan=False))['regressions'][0]['p50_ratio'] is None
+    analyzer.print_comparison(report)
+    assert '(new)' in capsys.readouterr().out
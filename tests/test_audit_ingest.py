@@ -0,0 +1,156 @@
+"""Tests for tools/audit-ingest.py."""
+
+import asyncio
+import json
+import os
+import stat
+import time
+
+import pytest
+
+from conftest import load_tool
+
+ingest = load_tool('audit-ingest')
+
+
+def segments(path):
+    return sorted(path.glob('*.jsonl'))
+
+
+def read_records(path):
+    return [json.loads(line) for segment in segments(path) for line in segment.read_text().splitlines()]
+
+
+async def post(port, body, headers=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    head = "POST /v1/audit HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+    for name, value in (headers or {'Content-Length': str(len(body))}).items():
+        head += f"{name}: {value}\r\n"
+    writer.write(head.encode('latin-1') + b"\r\n" + body)
+    await writer.drain()
+    status, payload = await ingest._read_response(reader)
+    writer.close()
+    return status, json.loads(payload)
+
+
+async def with_server(audit_path, scenario, max_bytes=1 << 30, max_age=3600.0, **options):
+    server = ingest.AuditIngestServer(ingest.AuditSegmentWriter(audit_path, max_bytes, max_age), **options)
+    _, port = await server.start('127.0.0.1', 0)
+    try:
+        return await scenario(server, port)
+    finally:
+        await server.close()
+
+
+def test_group_commit_batches_concurrent_requests(tmp_path):
+    async def scenario(server, port):
+        bodies = [json.dumps({'service': 'blux-reg', 'sequence': i}).encode() for i in range(20)]
+        return await asyncio.gather(*(post(port, body) for body in bodies))
+
+    results = asyncio.run(with_server(tmp_path, scenario, max_batch_delay=0.05))
+    assert [status for status, _ in results] == [200] * 20
+    records = read_records(tmp_path)
+    assert sorted(record['sequence'] for record in records) == list(range(20))
+    assert all(record['audit_id'].startswith('aud_') for record in records)
+
+
+def test_group_commit_stats(tmp_path):
+    async def scenario(server, port):
+        await asyncio.gather(*(server.submit([{'sequence': i}]) for i in range(50)))
+        return dict(server.stats)
+
+    stats = asyncio.run(with_server(tmp_path, scenario, max_batch_delay=0.05))
+    assert stats['records'] == 50
+    assert stats['batches'] < 5
+
+
+@pytest.mark.parametrize('headers, body', [
+    ({'Content-Length': 'abc'}, b'{}'),
+    ({'Content-Length': '-5'}, b'{}'),
+    ({'Content-Length': '2'}, b'[{'),
+    ({'Content-Length': '3'}, b'[1]'),
+])
+def test_malformed_requests_get_400(tmp_path, headers, body):
+    async def scenario(server, port):
+        return await post(port, body, headers)
+
+    status, payload = asyncio.run(with_server(tmp_path, scenario))
+    assert status == 400
+    assert 'error' in payload
+
+
+def test_rotation_by_size_seals_closed_segments(tmp_path):
+    writer = ingest.AuditSegmentWriter(tmp_path, max_bytes=120, max_age=3600)
+    line = b'{"record":"' + b'x' * 40 + b'"}\n'
+    for _ in range(4):
+        writer.write_batch(line, 1, time.time(), time.time())
+    live = writer.segment_path
+    writer.close()
+    assert len(segments(tmp_path)) == 2
+    assert all(path.stat().st_size <= 120 for path in segments(tmp_path))
+    for path in segments(tmp_path):
+        assert stat.S_IMODE(path.stat().st_mode) == 0o400
+    assert live in segments(tmp_path)
+
+
+def test_rotation_by_age_on_next_batch(tmp_path):
+    writer = ingest.AuditSegmentWriter(tmp_path, max_bytes=1 << 30, max_age=0.05)
+    writer.write_batch(b'{"n":1}\n', 1, time.time(), time.time())
+    time.sleep(0.1)
+    writer.write_batch(b'{"n":2}\n', 1, time.time(), time.time())
+    writer.close()
+    assert len(segments(tmp_path)) == 2
+
+
+def test_idle_server_closes_expired_segment(tmp_path):
+    async def scenario(server, port):
+        await server.submit([{'n': 1}])
+        segment = server.segment_writer.segment_path
+        await asyncio.sleep(0.3)
+        return segment, server.segment_writer.expires_in()
+
+    segment, expires_in = asyncio.run(with_server(tmp_path, scenario, max_age=0.1))
+    assert expires_in is None
+    assert stat.S_IMODE(segment.stat().st_mode) == 0o400
+
+
+def test_failed_commit_does_not_stop_the_committer(tmp_path, monkeypatch):
+    async def scenario(server, port):
+        real_write_batch = server.segment_writer.write_batch
+        calls = []
+
+        def flaky_write_batch(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("disk on fire")
+            return real_write_batch(*args)
+
+        monkeypatch.setattr(server.segment_writer, 'write_batch', flaky_write_batch)
+        first = await post(port, b'{"n":1}')
+        second = await asyncio.wait_for(post(port, b'{"n":2}'), 5)
+        return first, second
+
+    (first_status, first), (second_status, _) = asyncio.run(with_server(tmp_path, scenario))
+    assert first_status == 500
+    assert 'disk on fire' in first['error']
+    assert second_status == 200
+    assert [record['n'] for record in read_records(tmp_path)] == [2]
+
+
+def test_torn_write_is_cut_back(tmp_path, monkeypatch):
+    writer = ingest.AuditSegmentWriter(tmp_path, max_bytes=1 << 30, max_age=3600)
+    writer.write_batch(b'{"n":1}\n', 1, time.time(), time.time())
+    real_write = os.write
+
+    def short_write_then_fail(fd, data):
+        if fd == writer._fd and len(data) > 4:
+            return real_write(fd, data[:4])
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, 'write', short_write_then_fail)
+    with pytest.raises(OSError):
+        writer.write_batch(b'{"n":2}\n{"n":3}\n', 2, time.time(), time.time())
+    monkeypatch.setattr(os, 'write', real_write)
+    writer.write_batch(b'{"n":4}\n', 1, time.time(), time.time())
+    writer.close()
+    assert [record['n'] for record in read_records(tmp_path)] == [1, 4]
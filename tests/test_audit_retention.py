@@ -0,0 +1,143 @@
+"""Tests for tools/audit-retention.py."""
+
+import fcntl
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import load_tool
+from blux_common import format_timestamp
+
+retention_module = load_tool('audit-retention')
+ingest = load_tool('audit-ingest')
+
+DAY = 86400
+
+
+def retention(audit_path, **options):
+    settings = dict(segment_size=1 << 30, segment_age=30 * DAY, retention_age=30 * DAY, quiet_period=0)
+    settings.update(options)
+    return retention_module.AuditRetention(audit_path, **settings)
+
+
+def write_segment(path, records, age=0.0, mode=0o600):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+    os.chmod(path, mode)
+    if age:
+        os.utime(path, (time.time() - age, time.time() - age))
+    return path
+
+
+@pytest.fixture
+def held_lock():
+    """Hold a writer's shared flock on a segment, as audit-ingest does."""
+    fds = []
+
+    def hold(path):
+        fd = os.open(path, os.O_RDONLY)
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        fds.append(fd)
+
+    yield hold
+    for fd in fds:
+        os.close(fd)
+
+
+def test_locked_segment_is_never_compressed_or_removed(tmp_path, held_lock):
+    segment = write_segment(tmp_path / 'audit-live.jsonl', [{'n': 1}], age=2 * DAY, mode=0o400)
+    held_lock(segment)
+    actions = retention(tmp_path, retention_age=DAY).run()
+    assert actions['compressed'] == []
+    assert actions['deleted'] == []
+    assert segment.name in actions['skipped_live']
+    assert segment.read_text() == '{"n": 1}\n'
+
+
+def test_locked_segment_rotated_without_losing_data(tmp_path, held_lock):
+    segment = write_segment(tmp_path / 'audit-live.jsonl', [{'n': 1}] * 10)
+    held_lock(segment)
+    actions = retention(tmp_path, segment_size=10).run()
+    rotated = tmp_path / actions['rotated'][0]['renamed_to']
+    # Renamed so the writer rolls over, but not compressed in the same run
+    assert actions['compressed'] == []
+    assert rotated.read_text() == '{"n": 1}\n' * 10
+
+
+def test_unsealed_unlocked_segment_is_left_alone(tmp_path):
+    # A writer that does not take the lock may still have this file open
+    segment = write_segment(tmp_path / 'audit-other.jsonl', [{'n': 1}], age=2 * DAY)
+    actions = retention(tmp_path).run()
+    assert actions['compressed'] == []
+    assert segment.exists()
+
+
+def test_sealed_segment_is_compressed(tmp_path):
+    writer = ingest.AuditSegmentWriter(tmp_path, max_bytes=1 << 30, max_age=3600, write_index=True)
+    writer.write_batch(b'{"n":1}\n{"n":2}\n', 2, time.time(), time.time())
+    writer.close()
+    segment = writer.segment_path
+    mtime = segment.stat().st_mtime_ns
+
+    actions = retention(tmp_path).run()
+    assert [entry['segment'] for entry in actions['compressed']] == [segment.name]
+    archive = segment.with_name(segment.name + '.gz')
+    assert not segment.exists()
+    assert archive.stat().st_mtime_ns == mtime
+    assert Path(f"{archive}.idx").exists()
+    with gzip.open(archive, 'rt') as f:
+        assert [json.loads(line)['n'] for line in f] == [1, 2]
+
+
+def test_age_budget_deletes_expired_archives(tmp_path):
+    old = tmp_path / 'audit-old.jsonl.gz'
+    new = tmp_path / 'audit-new.jsonl.gz'
+    for path, age in ((old, 40 * DAY), (new, DAY)):
+        path.write_bytes(b'x' * 100)
+        os.utime(path, (time.time() - age, time.time() - age))
+    Path(f"{old}.idx").write_text('{}\n')
+
+    actions = retention(tmp_path).run()
+    assert [(entry['segment'], entry['reason']) for entry in actions['deleted']] == [(old.name, 'age')]
+    assert not old.exists() and not Path(f"{old}.idx").exists()
+    assert new.exists()
+
+
+def test_size_budget_counts_index_with_its_segment(tmp_path):
+    archives = []
+    for i in range(3):
+        path = tmp_path / f"audit-{i}.jsonl.gz"
+        path.write_bytes(b'x' * 1000)
+        Path(f"{path}.idx").write_bytes(b'i' * 500)
+        os.utime(path, (time.time() - (3 - i) * 60, time.time() - (3 - i) * 60))
+        archives.append(path)
+
+    # 4,500 bytes on disk; dropping the oldest archive and its index meets the budget
+    actions = retention(tmp_path, retention_size=3000).run()
+    assert [(entry['segment'], entry['reason']) for entry in actions['deleted']] == [(archives[0].name, 'size')]
+    assert [path.exists() for path in archives] == [False, True, True]
+
+
+def test_offload_moves_archive_and_index(tmp_path):
+    audit_path = tmp_path / 'audit'
+    audit_path.mkdir()
+    archive = audit_path / 'audit-old.jsonl.gz'
+    archive.write_bytes(b'x' * 100)
+    Path(f"{archive}.idx").write_text('{}\n')
+    os.utime(archive, (time.time() - 40 * DAY, time.time() - 40 * DAY))
+
+    actions = retention(audit_path, offload_dir=tmp_path / 'offload').run()
+    assert actions['offloaded'][0]['segment'] == archive.name
+    assert (tmp_path / 'offload' / archive.name).read_bytes() == b'x' * 100
+    assert (tmp_path / 'offload' / f"{archive.name}.idx").exists()
+    assert not archive.exists()
+
+
+def test_rotation_by_age_of_first_record(tmp_path):
+    write_segment(tmp_path / 'audit-a.jsonl', [{'timestamp': '2020-01-01T00:00:00Z'}])
+    write_segment(tmp_path / 'audit-b.jsonl', [{'timestamp': format_timestamp(time.time())}])
+    actions = retention(tmp_path).run()
+    assert [(entry['segment'], entry['reason']) for entry in actions['rotated']] == [('audit-a.jsonl', 'age')]
@@ -0,0 +1,178 @@
+"""Tests for tools/config-validator.py."""
+
+import asyncio
+import json
+import os
+import shutil
+import socket
+import time
+
+import pytest
+
+from conftest import load_tool
+
+validator = load_tool('config-validator')
+
+
+def closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_probe_reachable_listener():
+    with socket.socket() as server:
+        server.bind(('127.0.0.1', 0))
+        server.listen(16)
+        port = server.getsockname()[1]
+        result = asyncio.run(validator.probe_endpoint('127.0.0.1', port, 2.0, 3))
+    assert result['reachable']
+    assert result['successes'] == 3
+    assert result['connect_ms']['min'] <= result['connect_ms']['max']
+    assert 'error' not in result
+
+
+def test_probe_closed_port():
+    result = asyncio.run(validator.probe_endpoint('127.0.0.1', closed_port(), 2.0, 3))
+    assert not result['reachable']
+    assert result['successes'] == 0
+    assert result['error']
+
+
+def test_probe_attempts_share_one_deadline(monkeypatch):
+    async def hang(host, port):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(asyncio, 'open_connection', hang)
+    started = time.perf_counter()
+    result = asyncio.run(validator.probe_endpoint('127.0.0.1', 1, 0.2, 3))
+    elapsed = time.perf_counter() - started
+    assert elapsed < 0.6
+    assert not result['reachable']
+    assert result['error'].startswith('timed out')
+
+
+def test_endpoints_keyed_by_env(tmp_path):
+    (tmp_path / 'development.yaml').write_text("services:\n  blux_reg: {host: devhost, port: 50050}\n")
+    (tmp_path / 'production.yaml').write_text("services:\n  blux_reg: {host: prodhost, port: 443}\n")
+    endpoints = validator.load_service_endpoints(
+        [tmp_path / 'development.yaml', tmp_path / 'production.yaml'], environ={})
+    assert endpoints == {
+        'development/blux_reg': ('devhost', 50050),
+        'production/blux_reg': ('prodhost', 443),
+    }
+
+
+def test_endpoint_host_override(tmp_path):
+    (tmp_path / 'development.yaml').write_text("services:\n  blux_reg: {host: devhost, port: 50050}\n")
+    endpoints = validator.load_service_endpoints(
+        [tmp_path / 'development.yaml'], environ={'BLUX_REG_HOST': 'override:6000'})
+    assert endpoints == {'development/blux_reg': ('override', 6000)}
+
+
+def test_compile_fails_without_env_config(repo_root, tmp_path):
+    (tmp_path / 'config').mkdir()
+    shutil.copy(repo_root / 'config' / 'development.yaml', tmp_path / 'config')
+    output = tmp_path / 'production.snapshot'
+    checked, header = validator.compile_snapshot(tmp_path, 'production', output, environ={})
+    assert header is None
+    assert 'production.yaml' in checked.errors[0]
+    assert not output.exists()
+
+
+def test_compile_all_exits_nonzero_without_env_config(repo_root, tmp_path, capsys):
+    (tmp_path / 'config').mkdir()
+    shutil.copy(repo_root / 'config' / 'development.yaml', tmp_path / 'config')
+    args = validator.build_parser().parse_args(
+        ['--compile', '--env', 'all', '--path', str(tmp_path), '--format', 'json'])
+    assert validator.run_snapshot_command(args) == 1
+    results = json.loads(capsys.readouterr().out)
+    assert results['development']['compiled']
+    assert not results['production']['compiled']
+    assert not validator.default_snapshot_path(tmp_path, 'production').exists()
+
+
+@pytest.fixture
+def fingerprints():
+    """Recompute validator and schema fingerprints around a test that patches them."""
+    validator.validator_fingerprint.cache_clear()
+    validator.schema_fingerprint.cache_clear()
+    yield
+    validator.validator_fingerprint.cache_clear()
+    validator.schema_fingerprint.cache_clear()
+
+
+@pytest.fixture
+def cached_config(repo_root, tmp_path):
+    """A config file with a validated result stored in a fresh cache file."""
+    config = tmp_path / 'development.yaml'
+    shutil.copy(repo_root / 'config' / 'development.yaml', config)
+    cache_path = tmp_path / 'cache.json'
+    cache = validator.ValidationCache(cache_path)
+    assert cache.lookup(str(config)) is None
+    cache.store(validator.validate_config_file(str(config)))
+    cache.save()
+    return config, cache_path
+
+
+def lookup(cache_path, config):
+    return validator.ValidationCache(cache_path).lookup(str(config))
+
+
+def test_cache_hit_for_unchanged_file(cached_config):
+    config, cache_path = cached_config
+    assert lookup(cache_path, config)['schema'] == 'development_config'
+
+
+def test_cache_invalidated_by_content_change(cached_config):
+    config, cache_path = cached_config
+    config.write_text(config.read_text() + "\n# edited\n")
+    assert lookup(cache_path, config) is None
+
+
+def test_cache_invalidated_by_schema_change(cached_config, fingerprints, monkeypatch):
+    config, cache_path = cached_config
+    schema = dict(validator.SCHEMAS['development_config'], rules=[])
+    monkeypatch.setitem(validator.SCHEMAS, 'development_config', schema)
+    validator.schema_fingerprint.cache_clear()
+    assert lookup(cache_path, config) is None
+
+
+def test_cache_invalidated_by_validator_version(cached_config, fingerprints, monkeypatch):
+    config, cache_path = cached_config
+    monkeypatch.setattr(validator, 'VALIDATOR_VERSION', '0.0.0-test')
+    validator.validator_fingerprint.cache_clear()
+    assert lookup(cache_path, config) is None
+
+
+def test_snapshot_stale_after_schema_change(repo_root, tmp_path, fingerprints, monkeypatch):
+    (tmp_path / 'config').mkdir()
+    shutil.copy(repo_root / 'config' / 'development.yaml', tmp_path / 'config')
+    output = tmp_path / 'development.snapshot'
+    _, header = validator.compile_snapshot(tmp_path, 'development', output, environ={})
+    assert header is not None
+    assert validator.snapshot_staleness(output, environ={}) == []
+
+    schema = dict(validator.SCHEMAS['development_config'], rules=[])
+    monkeypatch.setitem(validator.SCHEMAS, 'development_config', schema)
+    validator.schema_fingerprint.cache_clear()
+    reasons = validator.snapshot_staleness(output, environ={})
+    assert reasons == [f"{tmp_path / 'config' / 'development.yaml'}: schema changed"]
+
+
+def test_daemon_stale_after_helper_module_edit(tmp_path, monkeypatch):
+    import blux_common
+
+    monkeypatch.chdir(tmp_path)
+    daemon = validator.ValidationDaemon(str(tmp_path / 'validator.sock'))
+    assert os.path.abspath(blux_common.__file__) in daemon._sources
+    assert not daemon.is_stale()
+
+    st = os.stat(blux_common.__file__)
+    os.utime(blux_common.__file__, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    try:
+        response = daemon.handle({'argv': ['--check'], 'cwd': str(tmp_path)})
+    finally:
+        os.utime(blux_common.__file__, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert response['stale']
+    assert response['exit_code'] == 75
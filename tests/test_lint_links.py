@@ -0,0 +1,173 @@
+"""Tests for scripts/lint_links.py."""
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from conftest import ROOT
+from lint_links import ExternalLinkChecker, build_anchor_index, github_slug, mkdocs_slug
+
+SCRIPT = ROOT / "scripts" / "lint_links.py"
+
+
+@pytest.mark.parametrize("heading, github, mkdocs", [
+    ("Hello, World!", "hello-world", "hello-world"),
+    ("What's new? (v2.0)", "whats-new-v20", "whats-new-v20"),
+    ("C++ & C#", "c--c", "c-c"),
+    ("snake_case  spacing", "snake_case--spacing", "snake_case-spacing"),
+    ("Café crème", "café-crème", "cafe-creme"),
+    ("Ünïcödé Straße", "ünïcödé-straße", "unicode-strae"),
+    ("🚀 Quick Start", "-quick-start", "quick-start"),
+])
+def test_slugs(heading, github, mkdocs):
+    assert github_slug(heading) == github
+    assert mkdocs_slug(heading) == mkdocs
+
+
+def test_duplicate_headings_get_numbered():
+    anchors = build_anchor_index("# Intro\n## Intro\nIntro\n-----\n## Intro-1\n")
+    # GitHub skips a suffix that a real heading already took; MkDocs numbers with _N
+    assert {"intro", "intro-1", "intro-2", "intro-1-1"} <= anchors
+    assert {"intro_1", "intro_2"} <= anchors
+    assert "intro-3" not in anchors and "intro_3" not in anchors
+
+
+def test_explicit_ids():
+    anchors = build_anchor_index("## Setup {#setup-guide}\n## Setup\n<a id=\"legacy\"></a>\n")
+    # MkDocs uses the attr_list id; GitHub renders the braces into the slug
+    assert {"setup-guide", "setup-setup-guide", "setup", "legacy"} == anchors
+
+
+def test_explicit_id_reserves_mkdocs_slug():
+    anchors = build_anchor_index("## Old {#intro}\n## Intro\n")
+    assert "intro_1" in anchors
+
+
+def test_headings_in_code_fences_are_ignored():
+    anchors = build_anchor_index("```\n# Not a heading\n```\n~~~~\n## Nor this\n~~~~\n# [Real](x.md) `one`\n")
+    assert anchors == {"real-one"}
+
+
+@pytest.fixture
+def slow_host():
+    """A local host that takes 0.15s to answer each request."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_HEAD(self):
+            time.sleep(0.15)
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_queued_requests_do_not_time_out(slow_host):
+    # 8 URLs through 2 slots take ~0.6s in total, longer than the 0.4s timeout,
+    # but no single request does
+    checker = ExternalLinkChecker(cache_path=None, per_host=2, timeout=0.4)
+    urls = [f"{slow_host}/page/{i}" for i in range(8)]
+    results = checker.check(urls)
+    assert [results[url]["reason"] for url in urls] == [""] * 8
+    assert checker.stats["connections"] <= 2
+    assert checker.stats["seconds"] > 0.4
+
+
+def test_slow_response_times_out(slow_host):
+    checker = ExternalLinkChecker(cache_path=None, per_host=2, timeout=0.05)
+    result = checker.check([f"{slow_host}/page/0"])[f"{slow_host}/page/0"]
+    assert not result["ok"]
+    assert result["reason"].startswith("timed out")
+
+
+@pytest.fixture
+def closing_host():
+    """A host that advertises keep-alive but drops each connection after one response."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                request = b""
+                while b"\r\n\r\n" not in request:
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        break
+                    request += chunk
+                conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\nConnection: keep-alive\r\n\r\n")
+                time.sleep(0.05)
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield f"http://127.0.0.1:{server.getsockname()[1]}"
+    server.close()
+
+
+def test_stale_pooled_connection_is_retried(closing_host):
+    checker = ExternalLinkChecker(cache_path=None, per_host=1, timeout=2.0)
+    urls = [f"{closing_host}/page/{i}" for i in range(3)]
+    results = checker.check(urls)
+    assert [results[url]["reason"] for url in urls] == [""] * 3
+
+
+def lint_output(tree, *options):
+    result = subprocess.run([sys.executable, str(SCRIPT), str(tree), "--jobs", "1", *options],
+                            capture_output=True, text=True, check=True)
+    return [line for line in result.stdout.splitlines() if not line.startswith("Incremental:")]
+
+
+def test_incremental_matches_full_scan(tmp_path):
+    tree = tmp_path / "docs"
+    tree.mkdir()
+    cache = tmp_path / "lint_links.json"
+    (tree / "a.md").write_text("[intro](b.md#intro) [c](c.md) [here](#top)\n\n# Top\n")
+    (tree / "b.md").write_text("# Intro\n\nText.\n")
+    (tree / "c.md").write_text("# C\n")
+
+    def check():
+        incremental = lint_output(tree, "--incremental", "--cache-file", str(cache))
+        assert incremental == lint_output(tree)
+        return incremental
+
+    assert check() == ["No link issues detected."]
+
+    # Rename the anchor in place, keeping both size and mtime
+    stat = (tree / "b.md").stat()
+    (tree / "b.md").write_text("# Intra\n\nText.\n")
+    os.utime(tree / "b.md", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert any("b.md#intro (missing anchor)" in line for line in check())
+
+    (tree / "b.md").write_text("# Intro\n\nText.\n")
+    assert check() == ["No link issues detected."]
+
+    (tree / "c.md").rename(tree / "d.md")
+    assert any("c.md (missing file)" in line for line in check())
+
+    (tree / "b.md").unlink()
+    assert any("b.md#intro (missing file)" in line for line in check())
+
+    (tree / "a.md").write_text("[d](d.md)\n")
+    assert check() == ["No link issues detected."]
@@ -2,16 +2,140 @@
 """
 BLUX Audit Analyzer
 Analyzes JSONL audit trails for security, performance, and operational insights.
+
+Modules only some analyses need (statistics, io, gzip) are imported where they
+are used, keeping start-up cheap for hook and cron invocations.
+
+--compare streams two adjacent time windows once and builds a log-bucketed
+latency sketch per (service, operation, identity class). It then ranks the
+groups whose latency rose significantly, by a Mann-Whitney U test computed
+on the sketches.
+
+`export` streams raw records to CSV or an Arrow IPC file in fixed-size row
+batches. It uses pyarrow when installed. Otherwise it decodes records into
+reused Arrow-layout buffers and writes them with a small built-in IPC writer.
 """
 
 import json
 import argparse
+import math
+import os
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from collections import defaultdict, Counter
-import statistics
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+from blux_common import format_timestamp, parse_duration, parse_timestamp
+
+SKETCH_GAMMA = 1.02        # bucket bounds grow 2%: quantiles within 1% relative error
+SKETCH_MAX_BUCKETS = 2048
+SKETCH_MIN_MS = 1e-3       # durations at or below this share the zero bucket
+
+
+def identity_class(identity: str) -> str:
+    """Collapse "kind:name@tenant" to "kind@tenant" so groups stay few but tenants stay apart."""
+    kind, _, rest = identity.partition(':')
+    if not rest:
+        return kind or 'unknown'
+    _, at, tenant = rest.rpartition('@')
+    return f"{kind}@{tenant}" if at else kind
+
+
+class LatencySketch:
+    """Bounded-memory latency histogram with logarithmic buckets.
+
+    Bucket i holds values in (gamma^(i-1), gamma^i], so any quantile read
+    from the sketch is within (gamma - 1) / 2 relative error. Past
+    max_buckets the lowest buckets are folded together, which keeps the tail
+    exact to the same error.
+    """
+
+    __slots__ = ('buckets', 'zeros', 'count', 'total')
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value <= SKETCH_MIN_MS:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / _LOG_GAMMA)
+        buckets = self.buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        if len(buckets) > SKETCH_MAX_BUCKETS:
+            lowest, second = sorted(buckets)[:2]
+            buckets[second] += buckets.pop(lowest)
+
+    def items(self) -> List[Tuple[int, int]]:
+        """(bucket index, count) pairs in ascending order; the zero bucket sorts first."""
+        items = sorted(self.buckets.items())
+        if self.zeros:
+            items.insert(0, (_ZERO_BUCKET, self.zeros))
+        return items
+
+    @staticmethod
+    def bucket_value(index: int) -> float:
+        if index == _ZERO_BUCKET:
+            return 0.0
+        return 2 * SKETCH_GAMMA ** index / (SKETCH_GAMMA + 1)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        for index, count in self.items():
+            seen += count
+            if seen > rank:
+                return self.bucket_value(index)
+        return self.bucket_value(self.items()[-1][0])
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else 0,
+            'p50': round(self.quantile(0.50), 3),
+            'p95': round(self.quantile(0.95), 3),
+            'p99': round(self.quantile(0.99), 3),
+        }
+
+
+_LOG_GAMMA = math.log(SKETCH_GAMMA)
+_ZERO_BUCKET = -(1 << 30)
+
+
+def mann_whitney_greater(baseline: LatencySketch, current: LatencySketch) -> Tuple[float, float]:
+    """One-sided Mann-Whitney U test that `current` tends to be slower than `baseline`.
+
+    Values sharing a bucket count as ties, and the normal approximation uses
+    the tie-corrected variance. Returns (p-value, P(current > baseline)).
+    """
+    n_current, n_baseline = current.count, baseline.count
+    base_counts = dict(baseline.items())
+    curr_counts = dict(current.items())
+    u = 0.0
+    below = 0
+    tie_term = 0
+    for index in sorted(base_counts.keys() | curr_counts.keys()):
+        in_base = base_counts.get(index, 0)
+        in_curr = curr_counts.get(index, 0)
+        u += in_curr * (below + in_base / 2)
+        below += in_base
+        tied = in_base + in_curr
+        tie_term += tied ** 3 - tied
+    pairs = n_current * n_baseline
+    total = n_current + n_baseline
+    variance = pairs / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0, 0.5
+    z = (u - pairs / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2)), u / pairs
 
 
 class AuditAnalyzer:
@@ -30,22 +154,21 @@ class AuditAnalyzer:
             
         cutoff_time = None
         if time_range:
-            cutoff_time = datetime.now() - time_range
+            cutoff_time = datetime.now(timezone.utc).timestamp() - time_range.total_seconds()
             
         total_entries = 0
         
-        # Find all JSONL files
-        for audit_file in self.audit_path.glob("*.jsonl"):
+        # Find all JSONL segments, including compressed ones
+        for audit_file in self.iter_segments(not_before=cutoff_time):
             print(f"Loading: {audit_file.name}")
-            with open(audit_file, 'r', encoding='utf-8') as f:
+            with self.open_segment(audit_file) as f:
                 for line_num, line in enumerate(f, 1):
                     try:
                         entry = json.loads(line.strip())
                         
                         # Filter by time if specified
                         if cutoff_time:
-                            entry_time = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
-                            if entry_time < cutoff_time:
+                            if parse_timestamp(entry['timestamp']) < cutoff_time:
                                 continue
                                 
                         self.entries.append(entry)
@@ -55,11 +178,153 @@ class AuditAnalyzer:
                         print(f"Warning: Invalid JSON in {audit_file}:{line_num} - {e}")
                     except KeyError as e:
                         print(f"Warning: Missing field in {audit_file}:{line_num} - {e}")
+                    except (TypeError, ValueError) as e:
+                        print(f"Warning: Invalid timestamp in {audit_file}:{line_num} - {e}")
                         
         return total_entries
     
+    def iter_segments(self, not_before: Optional[float] = None):
+        """Audit segments, plain and rotated (.jsonl.gz), skipping any last written before `not_before`."""
+        paths = sorted(self.audit_path.glob("*.jsonl")) + sorted(self.audit_path.glob("*.jsonl.gz"))
+        for path in paths:
+            if not_before is not None and os.stat(path).st_mtime < not_before:
+                continue
+            yield path
+
+    @staticmethod
+    def open_segment(path: Path, mode: str = 'rt'):
+        """Open a segment for reading, decompressing rotated .jsonl.gz ones."""
+        if path.suffix == '.gz':
+            import gzip
+            return gzip.open(path, mode, encoding='utf-8' if 't' in mode else None)
+        if 't' in mode:
+            return open(path, mode, encoding='utf-8')
+        return open(path, mode, buffering=1024 * 1024)
+
+    def compare_latency(self, split: float, window: float, alpha: float = 0.01,
+                        min_samples: int = 30, min_ratio: float = 1.1, top: int = 10) -> Dict[str, Any]:
+        """Compare [split - window, split) against [split, split + window) in one streaming pass.
+
+        Records are never kept: each one updates the sketch of its
+        (service, operation, identity class) group in its window. A group is
+        reported when both windows have at least `min_samples` durations, its
+        median or p95 rose by at least `min_ratio`, and the Mann-Whitney
+        p-value beats `alpha` Bonferroni-corrected across all tested groups.
+        """
+        start, end = split - window, split + window
+        sketches: Dict[Tuple[str, str, str], Tuple[LatencySketch, LatencySketch]] = {}
+        scanned = in_windows = invalid = 0
+        classes: Dict[str, str] = {}
+        decode = json.JSONDecoder().decode
+
+        for segment in self.iter_segments(not_before=start):
+            with self.open_segment(segment) as f:
+                for line in f:
+                    scanned += 1
+                    try:
+                        entry = decode(line)
+                        duration = entry['duration_ms']
+                        # bool is an int subclass and NaN/inf would poison the sketches
+                        if type(duration) not in (int, float) or not math.isfinite(duration):
+                            raise ValueError(duration)
+                        timestamp = parse_timestamp(entry['timestamp'])
+                    except (ValueError, KeyError, TypeError, AttributeError, OverflowError):
+                        invalid += 1
+                        continue
+                    if not start <= timestamp < end:
+                        continue
+                    in_windows += 1
+                    identity = entry.get('identity', 'unknown')
+                    cls = classes.get(identity)
+                    if cls is None:
+                        cls = classes[identity] = identity_class(identity)
+                    key = (entry.get('service', 'unknown'), entry.get('operation', 'unknown'), cls)
+                    pair = sketches.get(key)
+                    if pair is None:
+                        pair = sketches[key] = (LatencySketch(), LatencySketch())
+                    pair[timestamp >= split].add(duration)
+
+        tested = [(key, base, curr) for key, (base, curr) in sketches.items()
+                  if base.count >= min_samples and curr.count >= min_samples]
+        threshold = alpha / max(len(tested), 1)
+        regressions = []
+        for (service, operation, cls), base, curr in tested:
+            before, after = base.summary(), curr.summary()
+            # A zero baseline has no finite ratio; report it as null rather than Infinity
+            p50_ratio = after['p50'] / before['p50'] if before['p50'] else None
+            p95_ratio = after['p95'] / before['p95'] if before['p95'] else None
+            if None not in (p50_ratio, p95_ratio) and max(p50_ratio, p95_ratio) < min_ratio:
+                continue
+            p_value, effect = mann_whitney_greater(base, curr)
+            if p_value >= threshold:
+                continue
+            regressions.append({
+                'service': service,
+                'operation': operation,
+                'identity_class': cls,
+                'baseline': before,
+                'current': after,
+                'p50_ratio': None if p50_ratio is None else round(p50_ratio, 3),
+                'p95_ratio': None if p95_ratio is None else round(p95_ratio, 3),
+                'p_value': p_value,
+                'prob_slower': round(effect, 4),
+            })
+
+        def severity(r):
+            p50, p95 = (math.inf if r[key] is None else r[key] for key in ('p50_ratio', 'p95_ratio'))
+            return p50, p95, -r['p_value']
+
+        regressions.sort(key=severity, reverse=True)
+
+        return {
+            'metadata': {
+                'generated_at': datetime.now(timezone.utc).isoformat(),
+                'baseline': {'start': format_timestamp(start, False), 'end': format_timestamp(split, False)},
+                'current': {'start': format_timestamp(split, False), 'end': format_timestamp(end, False)},
+                'records_scanned': scanned,
+                'records_in_windows': in_windows,
+                'records_skipped': invalid,
+                'groups': len(sketches),
+                'groups_tested': len(tested),
+                'alpha': alpha,
+                'corrected_alpha': threshold,
+            },
+            'regressions': regressions[:top],
+            'regressions_total': len(regressions),
+        }
+
+    def print_comparison(self, report: Dict[str, Any], output_format: str = "text"):
+        """Print a latency comparison report in specified format."""
+        if output_format == "json":
+            print(json.dumps(report, indent=2))
+            return
+
+        meta = report['metadata']
+        print("BLUX Latency Regression Report")
+        print("=" * 50)
+        print(f"Baseline: {meta['baseline']['start']} .. {meta['baseline']['end']}")
+        print(f"Current:  {meta['current']['start']} .. {meta['current']['end']}")
+        print(f"Records in windows: {meta['records_in_windows']:,} of {meta['records_scanned']:,} scanned")
+        print(f"Groups: {meta['groups']:,} ({meta['groups_tested']:,} with enough samples in both windows)")
+
+        if not report['regressions']:
+            print("\nNo significant latency regressions.")
+            return
+        print(f"\nRegressions ({report['regressions_total']:,} significant, "
+              f"p < {meta['corrected_alpha']:.2g} after correction):")
+        for r in report['regressions']:
+            print(f"  {r['service']} {r['operation']} [{r['identity_class']}]")
+            p50_ratio, p95_ratio = ('new' if ratio is None else f"x{ratio:.2f}"
+                                    for ratio in (r['p50_ratio'], r['p95_ratio']))
+            print(f"    P50: {r['baseline']['p50']:.1f} -> {r['current']['p50']:.1f} ms ({p50_ratio}), "
+                  f"P95: {r['baseline']['p95']:.1f} -> {r['current']['p95']:.1f} ms ({p95_ratio})")
+            print(f"    n={r['baseline']['count']:,}/{r['current']['count']:,}, p={r['p_value']:.2g}, "
+                  f"P(slower)={r['prob_slower']:.2f}")
+
     def analyze_operations(self) -> Dict[str, Any]:
         """Analyze operation patterns and frequencies."""
+        import statistics
+
         operations = Counter()
         services = Counter()
         users = Counter()
@@ -205,8 +470,544 @@ class AuditAnalyzer:
                     print(f"    {service}: {count:,}")
 
 
+# --- export -----------------------------------------------------------------
+
+EXPORT_COLUMNS = ('timestamp', 'audit_id', 'service', 'operation', 'identity', 'status', 'duration_ms', 'signature')
+EXPORT_BATCH_ROWS = 65536
+EXPORT_JSON_BLOCK = 1 << 20  # pyarrow reads ahead whole blocks; larger ones grow RSS, not speed
+ARROW_MAGIC = b'ARROW1'
+ARROW_EOS = b'\xff\xff\xff\xff\x00\x00\x00\x00'
+_FB_SCALARS = {'bool': '<?', 'u8': '<B', 'i16': '<h', 'i32': '<i', 'i64': '<q'}
+
+
+class ColumnBatch:
+    """Reusable Arrow-layout buffers for up to `capacity` audit records.
+
+    Each string column is one UTF-8 bytearray plus int32 offsets. Timestamps
+    are int64 microseconds (UTC) and durations are float64. Every column
+    has a validity bitmap. clear() keeps every allocation, so a whole export
+    reuses the same buffers, and a record's fields are copied straight into
+    them.
+    """
+
+    def __init__(self, columns: Tuple[str, ...], capacity: int):
+        from array import array
+
+        self.columns = columns
+        self.capacity = capacity
+        self.length = 0
+        self._zero_bitmap = bytes((capacity + 7) // 8)
+        self.validity = {name: bytearray(self._zero_bitmap) for name in columns}
+        self.null_counts = dict.fromkeys(columns, 0)
+        self.offsets = {name: array('i', [0]) for name in columns if name not in ('timestamp', 'duration_ms')}
+        self.values: Dict[str, Any] = {}
+        for name in columns:
+            if name == 'timestamp':
+                self.values[name] = array('q')
+            elif name == 'duration_ms':
+                self.values[name] = array('d')
+            else:
+                self.values[name] = bytearray()
+        self._strings = [(name, self.values[name], self.offsets[name], self.validity[name])
+                         for name in columns if name in self.offsets]
+
+    def clear(self):
+        for name in self.columns:
+            self.validity[name][:] = self._zero_bitmap
+            self.null_counts[name] = 0
+            values = self.values[name]
+            del values[:]
+            if name in self.offsets:
+                del self.offsets[name][1:]
+        self.length = 0
+
+    def append(self, entry: Dict[str, Any], timestamp_us: Optional[int]):
+        row = self.length
+        byte, bit = row >> 3, 1 << (row & 7)
+        for name, data, offsets, validity in self._strings:
+            value = entry.get(name)
+            if value is None:
+                self.null_counts[name] += 1
+            else:
+                data += (value if isinstance(value, str) else str(value)).encode('utf-8')
+                validity[byte] |= bit
+            offsets.append(len(data))
+        if 'timestamp' in self.values:
+            if timestamp_us is None:
+                self.null_counts['timestamp'] += 1
+                self.values['timestamp'].append(0)
+            else:
+                self.validity['timestamp'][byte] |= bit
+                self.values['timestamp'].append(timestamp_us)
+        if 'duration_ms' in self.values:
+            duration = entry.get('duration_ms')
+            if isinstance(duration, (int, float)) and not isinstance(duration, bool):
+                self.validity['duration_ms'][byte] |= bit
+                self.values['duration_ms'].append(duration)
+            else:
+                self.null_counts['duration_ms'] += 1
+                self.values['duration_ms'].append(0.0)
+        self.length = row + 1
+
+    def buffers(self, name: str) -> List[memoryview]:
+        """Arrow buffers of one column: validity (empty when no nulls), then offsets and data or values."""
+        validity = memoryview(self.validity[name])[:(self.length + 7) // 8 if self.null_counts[name] else 0]
+        values = memoryview(self.values[name]).cast('B')
+        if name in self.offsets:
+            return [validity, memoryview(self.offsets[name]).cast('B'), values]
+        return [validity, values]
+
+
+def export_type(name: str) -> str:
+    return {'timestamp': 'timestamp', 'duration_ms': 'float64'}.get(name, 'utf8')
+
+
+class _FlatTable:
+    """A flatbuffer table: one (kind, value) per vtable slot, or None when absent."""
+
+    __slots__ = ('slots',)
+
+    def __init__(self, *slots):
+        self.slots = slots
+
+
+class _FlatVector:
+    """A flatbuffer vector of tables, or of packed 8-byte-aligned structs."""
+
+    __slots__ = ('tables', 'structs', 'count')
+
+    def __init__(self, tables: Optional[List[_FlatTable]] = None, structs: bytes = b'', count: int = 0):
+        self.tables = tables
+        self.structs = structs
+        self.count = count
+
+
+def _flatbuffer(root: _FlatTable) -> bytes:
+    """Serialize a table tree front to back; every offset points forward, as flatbuffers requires."""
+    import struct
+
+    buf = bytearray(4)
+
+    def pad(n: int):
+        buf.extend(bytes(-len(buf) % n))
+
+    def place(obj) -> int:
+        if isinstance(obj, str):
+            pad(4)
+            pos = len(buf)
+            data = obj.encode('utf-8')
+            buf.extend(struct.pack('<I', len(data)) + data + b'\0')
+            return pos
+        if isinstance(obj, _FlatVector):
+            if obj.tables is None:
+                buf.extend(bytes(-(len(buf) + 4) % 8))  # elements start 8-aligned after the length
+                pos = len(buf)
+                buf.extend(struct.pack('<I', obj.count) + obj.structs)
+                return pos
+            pad(4)
+            pos = len(buf)
+            buf.extend(struct.pack('<I', len(obj.tables)) + bytes(4 * len(obj.tables)))
+            for i, table in enumerate(obj.tables):
+                at = pos + 4 + 4 * i
+                struct.pack_into('<I', buf, at, place(table) - at)
+            return pos
+
+        slots = obj.slots
+        pad(2)
+        vtable_pos = len(buf)
+        buf.extend(bytes(4 + 2 * len(slots)))
+        pad(8)
+        table_pos = len(buf)
+        layout = []
+        cursor = 4
+        for index, slot in enumerate(slots):
+            if slot is None:
+                continue
+            kind, value = slot
+            size = 4 if kind == 'offset' else struct.calcsize(_FB_SCALARS[kind])
+            cursor += -cursor % size
+            layout.append((index, cursor, kind, value))
+            cursor += size
+        buf.extend(bytes(cursor + -cursor % 4))
+        struct.pack_into('<HH', buf, vtable_pos, 4 + 2 * len(slots), cursor)
+        struct.pack_into('<i', buf, table_pos, table_pos - vtable_pos)
+        children = []
+        for index, offset, kind, value in layout:
+            struct.pack_into('<H', buf, vtable_pos + 4 + 2 * index, offset)
+            if kind == 'offset':
+                children.append((table_pos + offset, value))
+            else:
+                struct.pack_into(_FB_SCALARS[kind], buf, table_pos + offset, value)
+        for at, child in children:
+            struct.pack_into('<I', buf, at, place(child) - at)
+        return table_pos
+
+    struct.pack_into('<I', buf, 0, place(root))
+    pad(8)
+    return bytes(buf)
+
+
+class ArrowFileWriter:
+    """Writes ColumnBatch buffers as an Arrow IPC file (metadata V5), without pyarrow.
+
+    Column buffers go to the file as memoryviews, uncopied. Only the small
+    flatbuffer metadata per batch is built in Python.
+    """
+
+    def __init__(self, out, columns: Tuple[str, ...]):
+        self.out = out
+        self.columns = columns
+        self.position = 0
+        self.blocks: List[Tuple[int, int, int]] = []
+        self._write(ARROW_MAGIC + b'\0\0')
+        self._message(1, self._schema(), [], 0)
+
+    def _write(self, data):
+        self.out.write(data)
+        self.position += len(data)
+
+    def _schema(self) -> _FlatTable:
+        types = {
+            'utf8': (5, _FlatTable()),
+            'float64': (3, _FlatTable(('i16', 2))),                      # DOUBLE
+            'timestamp': (10, _FlatTable(('i16', 2), ('offset', 'UTC'))),  # MICROSECOND
+        }
+        fields = []
+        for name in self.columns:
+            type_id, type_table = types[export_type(name)]
+            fields.append(_FlatTable(('offset', name), ('bool', True), ('u8', type_id), ('offset', type_table),
+                                     None, ('offset', _FlatVector(tables=[]))))
+        return _FlatTable(('i16', 0 if sys.byteorder == 'little' else 1), ('offset', _FlatVector(tables=fields)))
+
+    def _message(self, header_type: int, header: _FlatTable, body: List[memoryview],
+                 body_length: int) -> Tuple[int, int, int]:
+        import struct
+
+        metadata = _flatbuffer(_FlatTable(('i16', 4), ('u8', header_type), ('offset', header), ('i64', body_length)))
+        offset = self.position
+        self._write(struct.pack('<Ii', 0xFFFFFFFF, len(metadata)) + metadata)
+        for part in body:
+            self._write(part)
+        return offset, 8 + len(metadata), body_length
+
+    def write_batch(self, batch: ColumnBatch):
+        import struct
+
+        nodes = bytearray()
+        buffers = bytearray()
+        body: List[Any] = []
+        body_length = 0
+        for name in self.columns:
+            nodes += struct.pack('<qq', batch.length, batch.null_counts[name])
+            for part in batch.buffers(name):
+                buffers += struct.pack('<qq', body_length, len(part))
+                body.append(part)
+                padding = -len(part) % 8
+                if padding:
+                    body.append(bytes(padding))
+                body_length += len(part) + padding
+        header = _FlatTable(('i64', batch.length),
+                            ('offset', _FlatVector(structs=bytes(nodes), count=len(self.columns))),
+                            ('offset', _FlatVector(structs=bytes(buffers), count=len(buffers) // 16)))
+        self.blocks.append(self._message(3, header, body, body_length))
+        for part in body:
+            if isinstance(part, memoryview):
+                part.release()
+
+    def close(self):
+        import struct
+
+        blocks = b''.join(struct.pack('<qi4xq', *block) for block in self.blocks)
+        footer = _flatbuffer(_FlatTable(('i16', 4), ('offset', self._schema()), ('offset', _FlatVector()),
+                                        ('offset', _FlatVector(structs=blocks, count=len(self.blocks)))))
+        self._write(ARROW_EOS + footer + struct.pack('<i', len(footer)) + ARROW_MAGIC)
+
+
+class CsvExportWriter:
+    """Writes ColumnBatch rows as CSV through one reused text buffer per batch."""
+
+    def __init__(self, out, columns: Tuple[str, ...]):
+        import csv
+        import io
+
+        self.out = out
+        self.columns = columns
+        self.text = io.StringIO()
+        self.writer = csv.writer(self.text, lineterminator='\n')
+        self.writer.writerow(columns)
+        self._flush()
+        self._minutes: Dict[int, str] = {}
+
+    def _flush(self):
+        self.out.write(self.text.getvalue().encode('utf-8'))
+        self.text.seek(0)
+        self.text.truncate()
+
+    def _timestamp(self, value: int) -> str:
+        minutes, micros = divmod(value, 60_000_000)
+        prefix = self._minutes.get(minutes)
+        if prefix is None:
+            if len(self._minutes) > 65536:
+                self._minutes.clear()
+            prefix = datetime.fromtimestamp(minutes * 60, timezone.utc).strftime('%Y-%m-%d %H:%M:')
+            self._minutes[minutes] = prefix
+        seconds, micros = divmod(micros, 1_000_000)
+        return f"{prefix}{seconds:02d}.{micros:06d}Z"
+
+    def write_batch(self, batch: ColumnBatch):
+        cells = []
+        rows = range(batch.length)
+        for name in self.columns:
+            values = batch.values[name]
+            if name in batch.offsets:
+                text = values.decode('utf-8')
+                offsets = batch.offsets[name]
+                if len(text) != len(values):  # non-ASCII: byte offsets are not character offsets
+                    column = [values[offsets[i]:offsets[i + 1]].decode('utf-8') for i in rows]
+                else:
+                    column = [text[offsets[i]:offsets[i + 1]] for i in rows]
+            elif name == 'timestamp':
+                column = [self._timestamp(value) for value in values]
+            else:
+                column = values.tolist()
+            if batch.null_counts[name]:
+                validity = batch.validity[name]
+                for i in rows:
+                    if not validity[i >> 3] >> (i & 7) & 1:
+                        column[i] = ''
+            cells.append(column)
+        self.writer.writerows(zip(*cells))
+        self._flush()
+
+    def close(self):
+        pass
+
+
+class AuditExporter:
+    """Streams filtered audit records from every segment into fixed-size row batches."""
+
+    def __init__(self, audit_path: Path, columns: Tuple[str, ...] = EXPORT_COLUMNS,
+                 batch_rows: int = EXPORT_BATCH_ROWS, since: Optional[float] = None,
+                 until: Optional[float] = None, match: Optional[Dict[str, str]] = None):
+        self.analyzer = AuditAnalyzer(audit_path)
+        self.columns = columns
+        self.batch_rows = batch_rows
+        self.since = since
+        self.until = until
+        self.match = {key: value for key, value in (match or {}).items() if value is not None}
+        self.exported = 0
+        self.skipped = 0
+
+    def segments(self) -> List[Path]:
+        return list(self.analyzer.iter_segments(not_before=self.since))
+
+    def python_batches(self, segments: List[Path], skip_records: int = 0):
+        """Yield the same ColumnBatch, refilled, every `batch_rows` matching records.
+
+        The stdlib decoder still builds one dict per record; only the
+        pyarrow engine parses without per-record Python objects.
+        """
+        batch = ColumnBatch(self.columns, self.batch_rows)
+        decode = json.JSONDecoder().decode
+        since, until, match = self.since, self.until, self.match.items()
+        for segment in segments:
+            with self.analyzer.open_segment(segment, 'rb') as f:
+                for line in f:
+                    if skip_records:
+                        skip_records -= 1
+                        continue
+                    try:
+                        entry = decode(line.decode('utf-8'))
+                    except (ValueError, UnicodeDecodeError):
+                        self.skipped += 1
+                        continue
+                    if not isinstance(entry, dict):
+                        self.skipped += 1
+                        continue
+                    try:
+                        timestamp = parse_timestamp(entry['timestamp'])
+                    except (KeyError, TypeError, ValueError, AttributeError):
+                        timestamp = None
+                    if since is not None and (timestamp is None or timestamp < since):
+                        continue
+                    if until is not None and (timestamp is None or timestamp >= until):
+                        continue
+                    if any(entry.get(key) != value for key, value in match):
+                        continue
+                    batch.append(entry, None if timestamp is None else round(timestamp * 1_000_000))
+                    if batch.length == self.batch_rows:
+                        self.exported += batch.length
+                        yield batch
+                        batch.clear()
+        if batch.length:
+            self.exported += batch.length
+            yield batch
+
+    def export_python(self, out, output_format: str):
+        writer_class = ArrowFileWriter if output_format == 'arrow' else CsvExportWriter
+        writer = writer_class(out, self.columns)
+        for batch in self.python_batches(self.segments()):
+            writer.write_batch(batch)
+        writer.close()
+
+    def export_pyarrow(self, out, output_format: str):
+        """Parse, filter and write with pyarrow, never building Python objects per record.
+
+        A segment pyarrow cannot parse (e.g. a torn last line) is finished by
+        the Python reader from the first record pyarrow did not deliver.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.json as pa_json
+
+        arrow_types = {'utf8': pa.string(), 'float64': pa.float64(), 'timestamp': pa.timestamp('us', tz='UTC')}
+        read_schema = pa.schema([(name, arrow_types[export_type(name)]) for name in EXPORT_COLUMNS])
+        schema = pa.schema([read_schema.field(name) for name in self.columns])
+        if output_format == 'arrow':
+            writer = pa.ipc.new_file(out, schema)
+        else:
+            import pyarrow.csv as pa_csv
+            writer = pa_csv.CSVWriter(out, schema)
+        read_options = pa_json.ReadOptions(block_size=EXPORT_JSON_BLOCK)
+        parse_options = pa_json.ParseOptions(explicit_schema=read_schema, unexpected_field_behavior='ignore')
+        ts_type = read_schema.field('timestamp').type
+
+        def select(batch):
+            mask = None
+            conditions = []
+            if self.since is not None:
+                since = pa.scalar(int(self.since * 1e6), ts_type)
+                conditions.append(pc.greater_equal(batch.column('timestamp'), since))
+            if self.until is not None:
+                until = pa.scalar(int(self.until * 1e6), ts_type)
+                conditions.append(pc.less(batch.column('timestamp'), until))
+            for key, value in self.match.items():
+                conditions.append(pc.equal(batch.column(key), value))
+            for condition in conditions:
+                mask = condition if mask is None else pc.and_kleene(mask, condition)
+            if mask is not None:
+                batch = batch.filter(mask)
+            return pa.RecordBatch.from_arrays([batch.column(name) for name in self.columns], schema=schema)
+
+        pending = []
+        pending_rows = 0
+
+        def emit(batch, final=False):
+            nonlocal pending, pending_rows
+            if batch is not None and batch.num_rows:
+                pending.append(batch)
+                pending_rows += batch.num_rows
+            while pending_rows >= self.batch_rows or (final and pending_rows):
+                table = pa.Table.from_batches(pending, schema)
+                rows = min(self.batch_rows, pending_rows)
+                writer.write_table(table.slice(0, rows).combine_chunks(), max_chunksize=rows)
+                self.exported += rows
+                pending = table.slice(rows).to_batches()
+                pending_rows -= rows
+
+        for segment in self.segments():
+            stream = pa.input_stream(str(segment), compression='gzip' if segment.suffix == '.gz' else None)
+            delivered = 0
+            try:
+                for batch in pa_json.open_json(stream, read_options=read_options, parse_options=parse_options):
+                    delivered += batch.num_rows
+                    emit(select(batch))
+            except (pa.ArrowInvalid, StopIteration) as e:
+                print(f"Warning: {segment.name}: {e}; continuing with the Python reader", file=sys.stderr)
+                for batch in self.python_batches([segment], skip_records=delivered):
+                    self.exported -= batch.length  # counted again by emit
+                    arrays = []
+                    for name in self.columns:
+                        buffers = []
+                        for index, part in enumerate(batch.buffers(name)):
+                            # Copy: the batch's bytearrays are refilled in place. Only the
+                            # validity bitmap may be absent; empty offsets or data (an
+                            # all-null string column) still need a buffer.
+                            buffers.append(None if index == 0 and not len(part) else pa.py_buffer(bytes(part)))
+                            part.release()
+                        arrays.append(pa.Array.from_buffers(schema.field(name).type, batch.length, buffers,
+                                                            null_count=batch.null_counts[name]))
+                    emit(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        emit(None, final=True)
+        writer.close()
+
+
+def export_main(argv: List[str]) -> int:
+    """`audit-analyzer.py export`: stream filtered records to CSV or an Arrow IPC file."""
+    parser = argparse.ArgumentParser(prog="audit-analyzer.py export",
+                                     description="Export raw audit records as CSV or an Arrow IPC file")
+    parser.add_argument("--audit-path", default="~/.config/blux/audit/",
+                       help="Path to audit files (default: ~/.config/blux/audit/)")
+    parser.add_argument("--format", choices=["csv", "arrow"], default="csv", help="Output format (default: csv)")
+    parser.add_argument("--output", "-o", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--since", help="Only records at or after this ISO-8601 time")
+    parser.add_argument("--until", help="Only records before this ISO-8601 time")
+    parser.add_argument("--last", help="Only the last N hours/days (e.g., 24h, 7d); overrides --since")
+    parser.add_argument("--service", help="Only records from this service")
+    parser.add_argument("--operation", help="Only records for this operation")
+    parser.add_argument("--status", help="Only records with this status")
+    parser.add_argument("--columns", default=",".join(EXPORT_COLUMNS),
+                       help=f"Comma-separated columns to export (default: {','.join(EXPORT_COLUMNS)})")
+    parser.add_argument("--batch-rows", type=int, default=EXPORT_BATCH_ROWS,
+                       help=f"Rows per written batch (default: {EXPORT_BATCH_ROWS})")
+    parser.add_argument("--engine", choices=["auto", "pyarrow", "python"], default="auto",
+                       help="auto uses pyarrow when it is installed; python decodes each record "
+                            "into a dict first (default: auto)")
+    args = parser.parse_args(argv)
+
+    audit_path = Path(args.audit_path).expanduser()
+    if not audit_path.exists():
+        print(f"Error: Audit path not found: {audit_path}", file=sys.stderr)
+        return 1
+    columns = tuple(name.strip() for name in args.columns.split(",") if name.strip())
+    unknown = [name for name in columns if name not in EXPORT_COLUMNS]
+    if unknown or not columns:
+        print(f"Error: Unknown columns: {', '.join(unknown) or '(none given)'}", file=sys.stderr)
+        return 1
+    since = parse_timestamp(args.since) if args.since else None
+    if args.last:
+        since = datetime.now(timezone.utc).timestamp() - parse_duration(args.last)
+    until = parse_timestamp(args.until) if args.until else None
+
+    import importlib.util
+    try:
+        have_pyarrow = importlib.util.find_spec("pyarrow") is not None
+    except ValueError:  # sys.modules["pyarrow"] is None: the import is blocked
+        have_pyarrow = False
+    engine = args.engine
+    if engine == "auto":
+        engine = "pyarrow" if have_pyarrow else "python"
+    elif engine == "pyarrow" and not have_pyarrow:
+        print("Error: --engine pyarrow needs pyarrow installed", file=sys.stderr)
+        return 1
+
+    exporter = AuditExporter(audit_path, columns, max(args.batch_rows, 1), since, until,
+                             {'service': args.service, 'operation': args.operation, 'status': args.status})
+    started = datetime.now(timezone.utc)
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, 'wb')
+    try:
+        if engine == "pyarrow":
+            exporter.export_pyarrow(out, args.format)
+        else:
+            exporter.export_python(out, args.format)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+    elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+    skipped = f", {exporter.skipped:,} unparsable lines skipped" if exporter.skipped else ""
+    print(f"Exported {exporter.exported:,} records ({engine}, {args.format}) in {elapsed:.1f}s{skipped}",
+          file=sys.stderr)
+    return 0
+
+
 def main():
-    parser = argparse.ArgumentParser(description="BLUX Audit Analyzer")
+    if sys.argv[1:2] == ["export"]:
+        sys.exit(export_main(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(description="BLUX Audit Analyzer",
+                                     epilog="Raw records: audit-analyzer.py export --help")
     parser.add_argument("--audit-path", default="~/.config/blux/audit/", 
                        help="Path to audit files (default: ~/.config/blux/audit/)")
     parser.add_argument("--last", help="Analyze last N hours/days (e.g., 24h, 7d)")
@@ -215,11 +1016,35 @@ def main():
     parser.add_argument("--format", choices=["text", "json"], default="text",
                        help="Output format")
     parser.add_argument("--output", help="Output file (default: stdout)")
+    parser.add_argument("--compare", action="store_true",
+                       help="Rank per-(service, operation, identity class) latency regressions "
+                            "between two adjacent windows")
+    parser.add_argument("--window", default="1h", help="Length of each compared window (default: 1h)")
+    parser.add_argument("--split", help="Boundary between the windows as an ISO-8601 time, "
+                                        "e.g. the deploy time (default: now minus --window)")
+    parser.add_argument("--alpha", type=float, default=0.01,
+                       help="Significance level before Bonferroni correction (default: 0.01)")
+    parser.add_argument("--min-samples", type=int, default=30,
+                       help="Durations needed in each window to test a group (default: 30)")
+    parser.add_argument("--min-ratio", type=float, default=1.1,
+                       help="Smallest P50 or P95 slowdown worth reporting (default: 1.1)")
+    parser.add_argument("--top", type=int, default=10, help="Regressions to report (default: 10)")
     
     args = parser.parse_args()
     
     # Expand user directory
     audit_path = Path(args.audit_path).expanduser()
+
+    if args.compare:
+        analyzer = AuditAnalyzer(audit_path)
+        if not audit_path.exists():
+            print(f"Error: Audit path not found: {audit_path}")
+            sys.exit(1)
+        window = parse_duration(args.window)
+        split = parse_timestamp(args.split) if args.split else datetime.now(timezone.utc).timestamp() - window
+        report = analyzer.compare_latency(split, window, args.alpha, args.min_samples, args.min_ratio, args.top)
+        write_output(args.output, args.format, report, analyzer.print_comparison)
+        return
     
     # Parse time range
     time_range = None
@@ -245,11 +1070,14 @@ def main():
     print(f"Loaded {total_loaded:,} audit entries")
     
     report = analyzer.generate_report(args.type)
-    
-    # Output
-    if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            if args.format == "json":
+    write_output(args.output, args.format, report, analyzer.print_report)
+
+
+def write_output(path: Optional[str], output_format: str, report: Dict[str, Any], printer):
+    """Print `report` with `printer`, or write it to `path`."""
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            if output_format == "json":
                 json.dump(report, f, indent=2)
             else:
                 # For text output to file, we need to capture print output
@@ -258,10 +1086,10 @@ def main():
                 
                 output = io.StringIO()
                 with redirect_stdout(output):
-                    analyzer.print_report(report, "text")
+                    printer(report, "text")
                 f.write(output.getvalue())
     else:
-        analyzer.print_report(report, args.format)
+        printer(report, output_format)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""
+BLUX Audit Ingest
+Local stand-in for the blux-guard `POST /v1/audit` endpoint that writes
+analyzer-ready JSONL segments.
+
+Records are committed in groups: every batch is appended with one buffered
+write and made durable with one fsync before any request in it is acknowledged.
+"""
+
+import argparse
+import asyncio
+import errno
+import fcntl
+import json
+import os
+import signal
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from blux_common import format_timestamp, parse_duration, parse_size, parse_timestamp, percentile
+
+DEFAULT_AUDIT_PATH = "~/.config/blux/audit/"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 50090
+HTTP_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+
+class AuditSegmentWriter:
+    """Appends committed batches to size- and time-rotated JSONL segments.
+
+    The active segment holds a shared flock so audit-retention can tell live
+    segments from closed ones, and is sealed read-only when closed. If the
+    segment is renamed underneath us the next batch opens a fresh segment
+    instead of writing to the moved file.
+    """
+
+    def __init__(self, audit_path: Path, max_bytes: int, max_age: float,
+                 write_index: bool = False, prefix: str = "audit"):
+        self.audit_path = Path(audit_path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.write_index = write_index
+        self.prefix = prefix
+        self.segment_path: Optional[Path] = None
+        self.segment_bytes = 0
+        self.segments_opened = 0
+        self._fd: Optional[int] = None
+        self._index_fd: Optional[int] = None
+        self._inode: Optional[int] = None
+        self._opened_at = 0.0
+
+    def _open_segment(self):
+        """Create a new segment (and sidecar index) in the audit directory."""
+        self.audit_path.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        seq = 0
+        while True:
+            path = self.audit_path / f"{self.prefix}-{stamp}-{seq:04d}.jsonl"
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND, 0o600)
+                break
+            except FileExistsError:
+                seq += 1
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        if self.write_index:
+            self._index_fd = os.open(f"{path}.idx", os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        # Make the new directory entry durable once per segment, not per batch
+        dir_fd = os.open(self.audit_path, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        self._fd = fd
+        self._inode = os.fstat(fd).st_ino
+        self._opened_at = time.time()
+        self.segment_path = path
+        self.segment_bytes = 0
+        self.segments_opened += 1
+
+    def _needs_rotation(self, incoming: int) -> bool:
+        if self._fd is None:
+            return True
+        if self.segment_bytes and self.segment_bytes + incoming > self.max_bytes:
+            return True
+        if time.time() - self._opened_at >= self.max_age:
+            return True
+        try:
+            return os.stat(self.segment_path).st_ino != self._inode
+        except FileNotFoundError:
+            return True
+
+    def expires_in(self) -> Optional[float]:
+        """Seconds until the active segment reaches max_age, or None when none is open."""
+        if self._fd is None:
+            return None
+        return max(self._opened_at + self.max_age - time.time(), 0.0)
+
+    def close_if_expired(self) -> bool:
+        """Close the active segment once it reaches max_age, even if no batch arrives."""
+        if self._fd is not None and time.time() - self._opened_at >= self.max_age:
+            self.close()
+            return True
+        return False
+
+    def write_batch(self, payload: bytes, count: int, ts_min: float, ts_max: float):
+        """Append one batch with a single write and a single fsync.
+
+        A batch that fails part-way is cut back off the segment, so a torn line
+        is never left for the next batch to append to. If that fails too the
+        segment is closed and the next batch starts a fresh one.
+        """
+        if self._needs_rotation(len(payload)):
+            self.close()
+            self._open_segment()
+        offset = self.segment_bytes
+        view = memoryview(payload)
+        try:
+            while view:
+                written = os.write(self._fd, view)
+                view = view[written:]
+            os.fsync(self._fd)
+        except BaseException:
+            try:
+                os.ftruncate(self._fd, offset)
+                os.fsync(self._fd)
+            except OSError:
+                self.close()
+            raise
+        self.segment_bytes += len(payload)
+        if self._index_fd is not None:
+            # The index is a rebuildable hint, so it rides on the data fsync
+            entry = {
+                'offset': offset,
+                'length': len(payload),
+                'count': count,
+                'ts_min': format_timestamp(ts_min),
+                'ts_max': format_timestamp(ts_max),
+            }
+            os.write(self._index_fd, (json.dumps(entry, separators=(',', ':')) + "\n").encode())
+
+    def close(self):
+        """Close the active segment, sealing it read-only and releasing its live lock."""
+        if self._index_fd is not None:
+            os.fsync(self._index_fd)
+            os.close(self._index_fd)
+            self._index_fd = None
+        if self._fd is not None:
+            # Read-only tells audit-retention the segment is closed and safe to compress
+            os.fchmod(self._fd, 0o400)
+            os.close(self._fd)
+            self._fd = None
+
+
+class AuditIngestServer:
+    """Asyncio HTTP server that group-commits audit records."""
+
+    def __init__(self, segment_writer: AuditSegmentWriter, max_batch_delay: float = 0.005,
+                 max_batch_records: int = 4096, max_body_bytes: int = 16 * 1024 ** 2):
+        self.segment_writer = segment_writer
+        self.max_batch_delay = max_batch_delay
+        self.max_batch_records = max_batch_records
+        self.max_body_bytes = max_body_bytes
+        self.stats = {'records': 0, 'batches': 0, 'requests': 0, 'rejected': 0}
+        self._pending: List[Tuple[List[bytes], float, float, asyncio.Future]] = []
+        self._pending_records = 0
+        self._first_pending_at = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+        self._committer: Optional[asyncio.Task] = None
+        self._closing = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit-commit")
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str, port: int) -> Tuple[str, int]:
+        """Start listening and return the bound address."""
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._committer = asyncio.create_task(self._commit_loop())
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        """Stop accepting, flush pending batches and close the segment."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._committer is not None:
+            self._closing = True
+            self._wakeup.set()
+            self._full.set()
+            await self._committer
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.segment_writer.close)
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, records: List[Dict[str, Any]]) -> List[str]:
+        """Queue records for the next group commit and wait until durable."""
+        lines = []
+        audit_ids = []
+        ts_min = float('inf')
+        ts_max = float('-inf')
+        for record in records:
+            line, audit_id, epoch = self._encode_record(record)
+            lines.append(line)
+            audit_ids.append(audit_id)
+            ts_min = min(ts_min, epoch)
+            ts_max = max(ts_max, epoch)
+        if not lines:
+            return []
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            self._first_pending_at = loop.time()
+        self._pending.append((lines, ts_min, ts_max, future))
+        self._pending_records += len(lines)
+        self._wakeup.set()
+        if self._pending_records >= self.max_batch_records:
+            self._full.set()
+        await future
+        return audit_ids
+
+    @staticmethod
+    def _encode_record(record: Any) -> Tuple[bytes, str, float]:
+        if not isinstance(record, dict):
+            raise ValueError("audit record must be a JSON object")
+        timestamp = record.get('timestamp')
+        if timestamp is None:
+            epoch = time.time()
+            record['timestamp'] = format_timestamp(epoch)
+        elif isinstance(timestamp, str):
+            epoch = parse_timestamp(timestamp)
+        else:
+            raise ValueError("timestamp must be an ISO-8601 string")
+        audit_id = record.setdefault('audit_id', f"aud_{uuid.uuid4().hex}")
+        line = json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b"\n"
+        return line, audit_id, epoch
+
+    async def _commit_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._closing:
+                try:
+                    # Wake at the segment's age limit too, so an idle server still rotates
+                    await asyncio.wait_for(self._wakeup.wait(), self.segment_writer.expires_in())
+                except asyncio.TimeoutError:
+                    try:
+                        await loop.run_in_executor(self._executor, self.segment_writer.close_if_expired)
+                    except Exception as e:
+                        print(f"Warning: cannot close expired segment: {e}", file=sys.stderr)
+                    continue
+            remaining = self.max_batch_delay - (loop.time() - self._first_pending_at)
+            if remaining > 0 and not self._closing and self._pending_records < self.max_batch_records:
+                try:
+                    await asyncio.wait_for(self._full.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch, self._pending = self._pending, []
+            self._pending_records = 0
+            self._wakeup.clear()
+            self._full.clear()
+            if not batch:
+                if self._closing:
+                    return
+                continue
+
+            payload = b"".join(line for lines, _, _, _ in batch for line in lines)
+            count = sum(len(lines) for lines, _, _, _ in batch)
+            ts_min = min(entry[1] for entry in batch)
+            ts_max = max(entry[2] for entry in batch)
+            try:
+                await loop.run_in_executor(
+                    self._executor, self.segment_writer.write_batch, payload, count, ts_min, ts_max)
+            except Exception as e:
+                # Fail only this batch, as a 500; the committer keeps serving later ones
+                error = e if isinstance(e, OSError) else OSError(errno.EIO, f"{e.__class__.__name__}: {e}")
+                for _, _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            self.stats['records'] += count
+            self.stats['batches'] += 1
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': 'malformed request line'}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+                if 'chunked' in headers.get('transfer-encoding', '').lower():
+                    await self._respond(writer, 411, {'error': 'Content-Length required'}, False)
+                    break
+                content_length = headers.get('content-length') or '0'
+                if not (content_length.isascii() and content_length.isdigit()):
+                    await self._respond(writer, 400, {'error': 'invalid Content-Length'}, False)
+                    break
+                length = int(content_length)
+                if length > self.max_body_bytes:
+                    await self._respond(writer, 413, {'error': 'request body too large'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self._dispatch(method, target, headers, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str],
+                        body: bytes) -> Tuple[int, Dict[str, Any]]:
+        path = target.split('?', 1)[0]
+        if path == "/health":
+            return 200, {'status': 'ok', 'segment': str(self.segment_writer.segment_path or '')}
+        if path != "/v1/audit":
+            return 404, {'error': f"unknown path: {path}"}
+        if method != "POST":
+            return 405, {'error': 'use POST'}
+
+        self.stats['requests'] += 1
+        try:
+            content_type = headers.get('content-type', '')
+            if 'ndjson' in content_type or 'jsonl' in content_type:
+                records = [json.loads(line) for line in body.splitlines() if line.strip()]
+            else:
+                parsed = json.loads(body)
+                records = parsed if isinstance(parsed, list) else [parsed]
+            audit_ids = await self.submit(records)
+        except (ValueError, TypeError) as e:
+            self.stats['rejected'] += 1
+            return 400, {'error': str(e)}
+        except OSError as e:
+            return 500, {'error': f"audit commit failed: {e}"}
+        return 200, {'status': 'ok', 'accepted': len(audit_ids), 'audit_ids': audit_ids}
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any], keep_alive: bool):
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'Unknown')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode('latin-1')
+        writer.write(head + body)
+        await writer.drain()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def run_load_test(host: str, port: int, connections: int, duration: float,
+                        records_per_request: int) -> Dict[str, Any]:
+    """Drive an ingest server over keep-alive connections and measure acks."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    latencies: List[float] = []
+    counters = {'records': 0, 'requests': 0, 'errors': 0}
+
+    async def client(client_id: int):
+        reader, writer = await asyncio.open_connection(host, port)
+        sequence = 0
+        try:
+            while loop.time() < deadline:
+                records = []
+                for _ in range(records_per_request):
+                    sequence += 1
+                    records.append({
+                        'service': 'blux-lite',
+                        'operation': 'task.execute',
+                        'identity': f"user:load{client_id}@loadtest",
+                        'status': 'success',
+                        'duration_ms': sequence % 250,
+                    })
+                body = json.dumps(records, separators=(',', ':')).encode('utf-8')
+                request = (
+                    f"POST /v1/audit HTTP/1.1\r\nHost: {host}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                ).encode('latin-1') + body
+                started = time.perf_counter()
+                writer.write(request)
+                await writer.drain()
+                status, _ = await _read_response(reader)
+                latencies.append(time.perf_counter() - started)
+                counters['requests'] += 1
+                if status == 200:
+                    counters['records'] += records_per_request
+                else:
+                    counters['errors'] += 1
+        finally:
+            writer.close()
+
+    started = loop.time()
+    await asyncio.gather(*(client(i) for i in range(connections)))
+    elapsed = loop.time() - started
+
+    latencies.sort()
+    return {
+        'connections': connections,
+        'records_per_request': records_per_request,
+        'elapsed_s': round(elapsed, 3),
+        'requests': counters['requests'],
+        'records': counters['records'],
+        'errors': counters['errors'],
+        'records_per_second': round(counters['records'] / elapsed, 1) if elapsed else 0,
+        'ack_latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 3),
+            'p99': round(percentile(latencies, 99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3) if latencies else 0,
+        },
+    }
+
+
+def _build_server(args: argparse.Namespace, audit_path: Path) -> AuditIngestServer:
+    segment_writer = AuditSegmentWriter(
+        audit_path,
+        max_bytes=parse_size(args.segment_size),
+        max_age=parse_duration(args.segment_age),
+        write_index=args.index,
+    )
+    return AuditIngestServer(
+        segment_writer,
+        max_batch_delay=args.max_batch_delay_ms / 1000.0,
+        max_batch_records=args.max_batch_records,
+    )
+
+
+async def _serve(args: argparse.Namespace):
+    audit_path = Path(args.audit_path).expanduser()
+    server = _build_server(args, audit_path)
+    host, port = await server.start(args.host, args.port)
+    print(f"Ingesting audit records into {audit_path} on http://{host}:{port}/v1/audit", flush=True)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+        print(f"Committed {server.stats['records']:,} records in {server.stats['batches']:,} batches")
+
+
+async def _load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    if not args.self_hosted:
+        return await run_load_test(args.host, args.port, args.connections,
+                                   args.duration, args.records_per_request)
+
+    with tempfile.TemporaryDirectory(prefix="blux-ingest-") as scratch:
+        audit_path = Path(args.audit_path).expanduser() if args.audit_path else Path(scratch)
+        server = _build_server(args, audit_path)
+        host, port = await server.start("127.0.0.1", 0)
+        try:
+            result = await run_load_test(host, port, args.connections,
+                                         args.duration, args.records_per_request)
+        finally:
+            await server.close()
+        result['batches'] = server.stats['batches']
+        result['records_per_batch'] = round(server.stats['records'] / max(server.stats['batches'], 1), 1)
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BLUX Audit Ingest")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_writer_options(sub: argparse.ArgumentParser):
+        sub.add_argument("--segment-size", default="1G",
+                         help="Rotate segments at this size (default: 1G)")
+        sub.add_argument("--segment-age", default="30d",
+                         help="Rotate segments older than this (default: 30d)")
+        sub.add_argument("--index", action="store_true",
+                         help="Write a sidecar <segment>.idx time index per batch")
+        sub.add_argument("--max-batch-delay-ms", type=float, default=5.0,
+                         help="Maximum time a record waits for its group commit (default: 5)")
+        sub.add_argument("--max-batch-records", type=int, default=4096,
+                         help="Commit as soon as this many records are pending (default: 4096)")
+
+    serve = subparsers.add_parser("serve", help="Run the ingest endpoint")
+    serve.add_argument("--audit-path", default=os.environ.get('BLUX_AUDIT_PATH', DEFAULT_AUDIT_PATH),
+                       help="Directory for JSONL segments (default: $BLUX_AUDIT_PATH or ~/.config/blux/audit/)")
+    serve.add_argument("--host", default=DEFAULT_HOST, help="Bind address")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT, help="Bind port")
+    add_writer_options(serve)
+
+    load = subparsers.add_parser("loadtest", help="Measure sustained ingest throughput")
+    load.add_argument("--host", default=DEFAULT_HOST, help="Ingest server address")
+    load.add_argument("--port", type=int, default=DEFAULT_PORT, help="Ingest server port")
+    load.add_argument("--connections", type=int, default=32, help="Concurrent keep-alive clients")
+    load.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds")
+    load.add_argument("--records-per-request", type=int, default=1, help="Records per POST")
+    load.add_argument("--self-hosted", action="store_true",
+                      help="Start an in-process server instead of targeting --host/--port")
+    load.add_argument("--audit-path", help="Segment directory for --self-hosted (default: temporary)")
+    load.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
+    add_writer_options(load)
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        asyncio.run(_serve(args))
+        return
+
+    try:
+        result = asyncio.run(_load_test(args))
+    except OSError as e:
+        print(f"Error: Cannot reach ingest server: {e}")
+        sys.exit(1)
+
+    if args.format == "json":
+        print(json.dumps(result, indent=2))
+        return
+    print("BLUX Audit Ingest Load Test")
+    print("=" * 40)
+    print(f"Connections: {result['connections']}, records/request: {result['records_per_request']}")
+    print(f"Records acknowledged: {result['records']:,} in {result['elapsed_s']}s ({result['errors']} errors)")
+    print(f"Sustained throughput: {result['records_per_second']:,.1f} records/s")
+    latency = result['ack_latency_ms']
+    print(f"Ack latency (ms): p50 {latency['p50']:.2f}, p99 {latency['p99']:.2f}, max {latency['max']:.2f}")
+    if 'batches' in result:
+        print(f"Group commits: {result['batches']:,} ({result['records_per_batch']} records/batch)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+BLUX Audit Retention
+Rotates, compresses and offloads JSONL audit segments according to the
+documented retention policy (1 GB / 30 days rotation, offload hooks).
+
+Writers signal a live segment by holding a shared flock on it (audit-ingest.py
+does). Retention renames oversized or old segments so writers roll over.
+
+Only segments known to be closed are compressed and unlinked: ones retention
+renamed itself (*.rotated-*.jsonl), and ones their writer sealed read-only on
+close (audit-ingest.py does). Even these must be unlocked and quiet. Any other
+*.jsonl may still be open in a writer that does not take the lock, so it is
+never removed.
+"""
+
+import argparse
+import errno
+import fcntl
+import json
+import os
+import resource
+import shlex
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from blux_common import parse_duration, parse_size, parse_timestamp
+
+DEFAULT_AUDIT_PATH = "~/.config/blux/audit/"
+CHUNK_SIZE = 1024 * 1024
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def kernel_copy(src_fd: int, dst_fd: int, size: int) -> str:
+    """Copy size bytes between descriptors inside the kernel.
+
+    Prefers copy_file_range (reflinks on CoW filesystems), then sendfile, and
+    only falls back to a userspace loop when neither is available.
+    """
+    copied = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while copied < size:
+                sent = os.copy_file_range(src_fd, dst_fd, min(size - copied, 1 << 30))
+                if sent == 0:
+                    break
+                copied += sent
+            _check_copied(copied, size)
+            return "copy_file_range"
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL) or copied:
+                raise
+    if hasattr(os, "sendfile"):
+        try:
+            while copied < size:
+                sent = os.sendfile(dst_fd, src_fd, copied, min(size - copied, 1 << 30))
+                if sent == 0:
+                    break
+                copied += sent
+            _check_copied(copied, size)
+            return "sendfile"
+        except OSError as e:
+            if e.errno not in (errno.ENOSYS, errno.EINVAL) or copied:
+                raise
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    os.lseek(src_fd, copied, os.SEEK_SET)
+    while copied < size:
+        read = os.readv(src_fd, [buffer])
+        if not read:
+            break
+        read = min(read, size - copied)
+        os.write(dst_fd, view[:read])
+        copied += read
+    _check_copied(copied, size)
+    return "userspace"
+
+
+def _check_copied(copied: int, size: int):
+    if copied != size:
+        raise OSError(errno.EIO, f"short copy: {copied:,} of {size:,} bytes")
+
+
+def fsync_directory(path: Path):
+    """Make renames and unlinks inside a directory durable."""
+    dir_fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class SegmentLock:
+    """Exclusive, non-blocking flock probe for an audit segment."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.fd: Optional[int] = None
+        self.acquired = False
+
+    def __enter__(self) -> "SegmentLock":
+        self.fd = os.open(self.path, os.O_RDONLY)
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self.acquired = True
+        except BlockingIOError:
+            self.acquired = False
+        return self
+
+    def __exit__(self, *exc_info):
+        os.close(self.fd)
+        self.fd = None
+
+
+class AuditRetention:
+    """Applies rotation, compression and retention budgets to an audit directory."""
+
+    def __init__(self, audit_path: Path, segment_size: int, segment_age: float,
+                 retention_age: float, retention_size: Optional[int] = None,
+                 quiet_period: float = 60.0, offload_dir: Optional[Path] = None,
+                 offload_hook: Optional[str] = None, compress_level: int = 6,
+                 dry_run: bool = False):
+        self.audit_path = Path(audit_path)
+        self.segment_size = segment_size
+        self.segment_age = segment_age
+        self.retention_age = retention_age
+        self.retention_size = retention_size
+        self.quiet_period = quiet_period
+        self.offload_dir = Path(offload_dir) if offload_dir else None
+        self.offload_hook = offload_hook
+        self.compress_level = compress_level
+        self.dry_run = dry_run
+        self.actions: Dict[str, List[Any]] = {
+            'rotated': [], 'compressed': [], 'offloaded': [], 'deleted': [],
+            'skipped_live': [], 'errors': [],
+        }
+
+    def _segment_started(self, path: Path, st: os.stat_result) -> float:
+        """Epoch of the first record in a segment, falling back to mtime."""
+        try:
+            with open(path, 'rb') as f:
+                first = json.loads(f.readline())
+            return parse_timestamp(first['timestamp'])
+        except (ValueError, KeyError, TypeError, AttributeError, OSError):
+            return st.st_mtime
+
+    def is_live(self, path: Path, st: os.stat_result) -> bool:
+        """A segment is live while a writer holds its lock or it was just written or renamed."""
+        if time.time() - max(st.st_mtime, st.st_ctime) < self.quiet_period:
+            return True
+        with SegmentLock(path) as lock:
+            return not lock.acquired
+
+    @staticmethod
+    def is_closed(path: Path, st: os.stat_result) -> bool:
+        """Rotated by retention, or sealed read-only by its writer on close."""
+        return ".rotated-" in path.name or not st.st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+    def rotate_live_segments(self):
+        """Rename open segments that exceed the size or age limit.
+
+        Segments that are not locked are renamed too: that is what marks them
+        closed, so they can be compressed once the rename has gone quiet.
+        """
+        now = time.time()
+        for path in sorted(self.audit_path.glob("*.jsonl")):
+            st = path.stat()
+            if self.is_closed(path, st):
+                continue
+            too_big = st.st_size >= self.segment_size
+            too_old = now - self._segment_started(path, st) >= self.segment_age
+            if not (too_big or too_old):
+                continue
+            stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+            target = path.with_name(f"{path.stem}.rotated-{stamp}.jsonl")
+            if not self.dry_run:
+                # Writers holding an open fd keep appending to the renamed inode
+                # until they notice the rename, so nothing is lost.
+                os.rename(path, target)
+                index = Path(f"{path}.idx")
+                if index.exists():
+                    os.rename(index, f"{target}.idx")
+                fsync_directory(self.audit_path)
+            self.actions['rotated'].append({
+                'segment': path.name, 'renamed_to': target.name,
+                'bytes': st.st_size, 'reason': 'size' if too_big else 'age',
+            })
+
+    def compress_segment(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Gzip a closed segment with bounded memory, then drop the original."""
+        target = path.with_name(path.name + ".gz")
+        partial = path.with_name(path.name + ".gz.partial")
+        started = time.perf_counter()
+        with SegmentLock(path) as lock:
+            if not lock.acquired:
+                return None
+            st = os.fstat(lock.fd)
+            size = st.st_size
+            if self.dry_run:
+                return {'segment': path.name, 'bytes_in': size}
+            # Holding LOCK_EX keeps cooperating writers out until the original is gone
+            compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, 31)
+            buffer = bytearray(CHUNK_SIZE)
+            view = memoryview(buffer)
+            with open(partial, 'wb') as out:
+                while True:
+                    read = os.readv(lock.fd, [buffer])
+                    if not read:
+                        break
+                    out.write(compressor.compress(view[:read]))
+                out.write(compressor.flush())
+                out.flush()
+                os.fsync(out.fileno())
+                written = out.tell()
+            # Keep the last-write time so retention ages the data, not the archive
+            os.utime(partial, ns=(st.st_atime_ns, st.st_mtime_ns))
+            os.rename(partial, target)
+            index = Path(f"{path}.idx")
+            if index.exists():
+                os.rename(index, f"{target}.idx")
+            os.unlink(path)
+            fsync_directory(path.parent)
+        elapsed = time.perf_counter() - started
+        return {
+            'segment': path.name, 'compressed_to': target.name,
+            'bytes_in': size, 'bytes_out': written,
+            'mb_per_second': round(size / (1024 * 1024) / elapsed, 1) if elapsed else 0,
+        }
+
+    def compress_closed_segments(self):
+        """Compress every closed segment that is unlocked and has gone quiet."""
+        # Segments renamed in this run get a full quiet period before a later run compresses them
+        just_rotated = {entry['renamed_to'] for entry in self.actions['rotated']}
+        for path in sorted(self.audit_path.glob("*.jsonl")):
+            st = path.stat()
+            if path.name in just_rotated or not self.is_closed(path, st) or self.is_live(path, st):
+                self.actions['skipped_live'].append(path.name)
+                continue
+            try:
+                result = self.compress_segment(path)
+            except OSError as e:
+                self.actions['errors'].append(f"{path.name}: compression failed - {e}")
+                continue
+            if result is None:
+                self.actions['skipped_live'].append(path.name)
+            else:
+                self.actions['compressed'].append(result)
+
+    def move_segment(self, path: Path, destination_dir: Path) -> Dict[str, Any]:
+        """Move a segment to the offload directory, copying in-kernel across devices."""
+        destination_dir.mkdir(parents=True, exist_ok=True)
+        destination = destination_dir / path.name
+        size = path.stat().st_size
+        try:
+            os.rename(path, destination)
+            method = "rename"
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            method = self.copy_segment(path, destination)
+            os.unlink(path)
+        index = Path(f"{path}.idx")
+        if index.exists():
+            shutil.move(str(index), str(destination_dir / index.name))
+        fsync_directory(destination_dir)
+        fsync_directory(path.parent)
+        return {'segment': path.name, 'bytes': size, 'method': method, 'destination': str(destination)}
+
+    @staticmethod
+    def copy_segment(source: Path, destination: Path) -> str:
+        """Durably copy a segment with a kernel-level copy."""
+        partial = destination.with_name(destination.name + ".partial")
+        src_fd = os.open(source, os.O_RDONLY)
+        try:
+            dst_fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                method = kernel_copy(src_fd, dst_fd, os.fstat(src_fd).st_size)
+                os.fsync(dst_fd)
+            except OSError:
+                os.unlink(partial)
+                raise
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+        os.rename(partial, destination)
+        return method
+
+    def enforce_budgets(self):
+        """Offload or delete compressed segments beyond the age and size budgets.
+
+        The size budget covers everything in the directory, so a segment's
+        sidecar index counts as freed together with the segment.
+        """
+        now = time.time()
+        closed = sorted(
+            ((path, path.stat()) for path in self.audit_path.glob("*.jsonl.gz")),
+            key=lambda item: item[1].st_mtime,
+        )
+        total = sum(p.stat().st_size for p in self.audit_path.iterdir() if p.is_file())
+        for path, st in closed:
+            expired = now - st.st_mtime >= self.retention_age
+            over_budget = self.retention_size is not None and total > self.retention_size
+            if not (expired or over_budget):
+                continue
+            reason = 'age' if expired else 'size'
+            index = Path(f"{path}.idx")
+            total -= st.st_size + (index.stat().st_size if index.exists() else 0)
+            if self.dry_run:
+                key = 'offloaded' if self.offload_dir else 'deleted'
+                self.actions[key].append({'segment': path.name, 'bytes': st.st_size, 'reason': reason})
+                continue
+            try:
+                if self.offload_dir:
+                    result = self.move_segment(path, self.offload_dir)
+                    result['reason'] = reason
+                    self.actions['offloaded'].append(result)
+                    if self.offload_hook:
+                        subprocess.run([*shlex.split(self.offload_hook), result['destination']], check=True)
+                else:
+                    path.unlink()
+                    if index.exists():
+                        index.unlink()
+                    self.actions['deleted'].append({'segment': path.name, 'bytes': st.st_size, 'reason': reason})
+            except (OSError, subprocess.CalledProcessError) as e:
+                self.actions['errors'].append(f"{path.name}: offload failed - {e}")
+
+    def run(self) -> Dict[str, Any]:
+        """Apply rotation, compression and retention budgets in order."""
+        if not self.audit_path.exists():
+            self.actions['errors'].append(f"Audit path not found: {self.audit_path}")
+            return self.actions
+        self.rotate_live_segments()
+        self.compress_closed_segments()
+        self.enforce_budgets()
+        return self.actions
+
+
+def run_benchmark(size: int, work_dir: Optional[Path], compress_level: int) -> Dict[str, Any]:
+    """Generate a synthetic segment and time compression and offload copies."""
+    with tempfile.TemporaryDirectory(prefix="blux-retention-", dir=work_dir) as scratch:
+        audit_path = Path(scratch) / "audit"
+        offload_path = Path(scratch) / "offload"
+        audit_path.mkdir()
+        segment = audit_path / "audit-benchmark.jsonl"
+
+        lines = []
+        for i in range(4096):
+            lines.append(json.dumps({
+                'timestamp': f"2025-10-20T10:{i // 60 % 60:02d}:{i % 60:02d}Z",
+                'audit_id': f"aud_{i:08x}{(i * 2654435761) & 0xffffffff:08x}",
+                'service': ('blux-lite', 'blux-guard', 'blux-reg')[i % 3],
+                'operation': ('task.execute', 'policy.validate', 'token.issue')[i % 3],
+                'identity': f"user:u{i % 97}@org{i % 7}",
+                'duration_ms': (i * 37) % 900,
+            }, separators=(',', ':')))
+        block = ("\n".join(lines) + "\n").encode('utf-8')
+
+        started = time.perf_counter()
+        with open(segment, 'wb') as f:
+            written = 0
+            while written < size:
+                f.write(block)
+                written += len(block)
+        generate_s = time.perf_counter() - started
+        rss_before = peak_rss_mb()
+
+        retention = AuditRetention(audit_path, segment_size=size, segment_age=float('inf'),
+                                   retention_age=float('inf'), quiet_period=0,
+                                   compress_level=compress_level)
+        started = time.perf_counter()
+        compressed = retention.compress_segment(segment)
+        compress_s = time.perf_counter() - started
+
+        archive = audit_path / "audit-benchmark.jsonl.gz"
+        offload_path.mkdir()
+        started = time.perf_counter()
+        method = AuditRetention.copy_segment(archive, offload_path / archive.name)
+        copy_s = time.perf_counter() - started
+
+        mib = written / (1024 * 1024)
+        archive_mib = compressed['bytes_out'] / (1024 * 1024)
+        return {
+            'segment_mb': round(mib, 1),
+            'generate_mb_per_second': round(mib / generate_s, 1),
+            'compress_mb_per_second': round(mib / compress_s, 1),
+            'compression_ratio': round(compressed['bytes_in'] / max(compressed['bytes_out'], 1), 2),
+            'offload_copy_method': method,
+            'offload_copy_mb_per_second': round(archive_mib / copy_s, 1) if copy_s else 0,
+            'peak_rss_mb_before': round(rss_before, 1),
+            'peak_rss_mb_after': round(peak_rss_mb(), 1),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BLUX Audit Retention")
+    parser.add_argument("--audit-path", default=os.environ.get('BLUX_AUDIT_PATH', DEFAULT_AUDIT_PATH),
+                        help="Path to audit files (default: $BLUX_AUDIT_PATH or ~/.config/blux/audit/)")
+    parser.add_argument("--segment-size", default="1G",
+                        help="Rotate live segments at this size (default: 1G)")
+    parser.add_argument("--segment-age", default="30d",
+                        help="Rotate live segments whose first record is older than this (default: 30d)")
+    parser.add_argument("--retention-age", default="30d",
+                        help="Offload or delete compressed segments older than this (default: 30d)")
+    parser.add_argument("--retention-size",
+                        help="Total size budget for the audit directory (e.g. 10G)")
+    parser.add_argument("--quiet-period", default="60s",
+                        help="Only compress segments unmodified for this long (default: 60s)")
+    parser.add_argument("--offload-dir", help="Move expired segments here instead of deleting them")
+    parser.add_argument("--offload-hook",
+                        help="Command run with each offloaded segment path (e.g. an S3/GCS uploader)")
+    parser.add_argument("--compress-level", type=int, default=6, help="gzip level 1-9 (default: 6)")
+    parser.add_argument("--dry-run", action="store_true", help="Report actions without applying them")
+    parser.add_argument("--benchmark", metavar="SIZE",
+                        help="Benchmark compression and offload on a synthetic segment of SIZE (e.g. 2G)")
+    parser.add_argument("--benchmark-dir", help="Scratch directory for --benchmark (default: system temp)")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
+
+    args = parser.parse_args()
+
+    if args.benchmark:
+        work_dir = Path(args.benchmark_dir).expanduser() if args.benchmark_dir else None
+        result = run_benchmark(parse_size(args.benchmark), work_dir, args.compress_level)
+        if args.format == "json":
+            print(json.dumps(result, indent=2))
+            return
+        print("BLUX Audit Retention Benchmark")
+        print("=" * 40)
+        print(f"Segment size: {result['segment_mb']:,.1f} MB")
+        print(f"Compression: {result['compress_mb_per_second']:,.1f} MB/s (ratio {result['compression_ratio']}x)")
+        print(f"Offload copy: {result['offload_copy_mb_per_second']:,.1f} MB/s via {result['offload_copy_method']}")
+        print(f"Peak RSS: {result['peak_rss_mb_before']:.1f} MB before, {result['peak_rss_mb_after']:.1f} MB after")
+        return
+
+    retention = AuditRetention(
+        Path(args.audit_path).expanduser(),
+        segment_size=parse_size(args.segment_size),
+        segment_age=parse_duration(args.segment_age),
+        retention_age=parse_duration(args.retention_age),
+        retention_size=parse_size(args.retention_size) if args.retention_size else None,
+        quiet_period=parse_duration(args.quiet_period),
+        offload_dir=Path(args.offload_dir).expanduser() if args.offload_dir else None,
+        offload_hook=args.offload_hook,
+        compress_level=args.compress_level,
+        dry_run=args.dry_run,
+    )
+    actions = retention.run()
+
+    if args.format == "json":
+        print(json.dumps(actions, indent=2))
+    else:
+        print("BLUX Audit Retention" + (" (dry run)" if args.dry_run else ""))
+        print("=" * 40)
+        for entry in actions['rotated']:
+            print(f"  rotated     {entry['segment']} -> {entry['renamed_to']} ({entry['reason']})")
+        for entry in actions['compressed']:
+            print(f"  compressed  {entry['segment']} ({entry['bytes_in']:,} bytes)")
+        for entry in actions['offloaded']:
+            print(f"  offloaded   {entry['segment']} ({entry['reason']})")
+        for entry in actions['deleted']:
+            print(f"  deleted     {entry['segment']} ({entry['reason']})")
+        for name in actions['skipped_live']:
+            print(f"  live        {name}")
+        for error in actions['errors']:
+            print(f"  error       {error}")
+
+    if actions['errors']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
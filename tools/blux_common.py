@@ -0,0 +1,59 @@
+"""
+BLUX tools shared helpers
+Parsing and formatting helpers used by more than one tools/ CLI.
+
+Kept to the standard library's cheapest modules so every CLI can import it
+without adding to its start-up time.
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import List
+
+SIZE_UNITS = {"k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size such as 1G, 512M or 4096."""
+    value = value.strip().lower().rstrip("b")
+    if value and value[-1] in SIZE_UNITS:
+        return int(float(value[:-1]) * SIZE_UNITS[value[-1]])
+    return int(value)
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration such as 30d, 1h, 15m or 90s into seconds."""
+    value = value.strip().lower()
+    if value and value[-1] in DURATION_UNITS:
+        return float(value[:-1]) * DURATION_UNITS[value[-1]]
+    return float(value)
+
+
+def parse_timestamp(value: str) -> float:
+    """Return the epoch seconds of an ISO-8601 audit timestamp."""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def format_timestamp(epoch: float, fraction: bool = True) -> str:
+    """Format epoch seconds the way audit records carry them (UTC, trailing Z)."""
+    pattern = '%Y-%m-%dT%H:%M:%S.%fZ' if fraction else '%Y-%m-%dT%H:%M:%SZ'
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime(pattern)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def default_socket_path() -> str:
+    """Socket the config-validator daemon listens on and its client connects to."""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    return os.environ.get('BLUX_VALIDATOR_SOCKET') or \
+        os.path.join(runtime_dir, f"blux-config-validator-{os.getuid()}.sock")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+BLUX Configuration Validator Client
+Thin front end for `config-validator.py --daemon`.
+
+Takes the same arguments as config-validator.py. It imports nothing beyond the
+socket layer and blux_common, forwards the request to a running daemon, and falls back to
+in-process validation when no daemon answers.
+"""
+
+import json
+import os
+import socket
+import sys
+
+from blux_common import default_socket_path
+
+VALIDATOR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config-validator.py")
+CONNECT_TIMEOUT = 0.25
+REQUEST_TIMEOUT = 120.0
+
+
+def request_daemon(argv, socket_path):
+    """Send one request; returns the response dict or None if no daemon answered."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(CONNECT_TIMEOUT)
+        client.connect(socket_path)
+        client.settimeout(REQUEST_TIMEOUT)
+        request = {
+            'argv': argv,
+            'cwd': os.getcwd(),
+            'env': {k: v for k, v in os.environ.items() if k.startswith('BLUX_')},
+        }
+        client.sendall(json.dumps(request).encode('utf-8') + b"\n")
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+    except OSError:
+        return None
+    finally:
+        client.close()
+    try:
+        response = json.loads(b"".join(chunks))
+    except ValueError:
+        return None
+    return None if response.get('stale') else response
+
+
+def main():
+    argv = sys.argv[1:]
+    response = request_daemon(argv, default_socket_path())
+    if response is not None:
+        if response['output']:
+            print(response['output'])
+        sys.exit(response['exit_code'])
+
+    # No daemon: run the validator in this process
+    import runpy
+    sys.argv = [VALIDATOR_PATH, *argv]
+    runpy.run_path(VALIDATOR_PATH, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
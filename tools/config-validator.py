@@ -2,270 +2,1376 @@
 """
 BLUX Configuration Validator
 Validates configuration files and environment setup.
+
+The tool runs from hooks many times a day, so PyYAML, the process pool and the
+benchmark helpers are imported only on the paths that need them.
+
+File checks are declared as schemas in SCHEMAS, compiled once per process into
+validator closures and applied to any number of files, optionally across a
+pool of worker processes.
+
+With --probe, every service endpoint listed under `services` in the selected
+environment configs is connected to concurrently, so a fleet check takes one
+probe timeout rather than the sum of them.
+
+With --compile, the validated base config, environment overlay, manifests and
+BLUX_* variables are merged into a versioned snapshot that services load with
+one mmap and one JSON parse, and that records its inputs for freshness checks.
 """
 
 import json
-import yaml
 import os
+import re
+import hashlib
 import sys
+import time
+import functools
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple
 import argparse
 
+from blux_common import default_socket_path, percentile
+
+VALIDATOR_VERSION = "2.2.0"
+CONFIG_SUFFIXES = ('.json', '.yaml', '.yml')
+EXCLUDE_DIRS = {".git", "__pycache__", "node_modules", "site", ".venv"}
+PARALLEL_MIN_FILES = 64
+PROBE_TIMEOUT = 1.0
+PROBE_COUNT = 3
+SNAPSHOT_MAGIC = b"BLUXCFG1"
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_PREFIX_SIZE = len(SNAPSHOT_MAGIC) + 8
+
+# Variables checked by validate_environment; the non-secret ones are merged into snapshots
+REQUIRED_ENV_VARS = ['BLUX_ENV']
+OPTIONAL_ENV_VARS = [
+    'BLUX_AUDIT_PATH', 'BLUX_LOG_PATH', 'BLUX_DATA_PATH',
+    'BLUX_REG_HOST', 'BLUX_LITE_HOST', 'BLUX_GUARD_HOST'
+]
+ENV_PATH_OVERRIDES = {
+    'BLUX_AUDIT_PATH': 'audit',
+    'BLUX_LOG_PATH': 'log',
+    'BLUX_DATA_PATH': 'data',
+    'BLUX_CACHE_PATH': 'cache',
+}
+
+# Declarative file schemas, matched against file names in order.
+#
+# Rule checks:
+#   required  - every name in `fields` must exist in the mapping at `path`
+#   type      - the node at `path` must have the given `type`
+#   expect    - warn/error unless the value at `path` equals `value`
+#   forbid    - warn/error if the value at `path` equals `value`
+#   each      - apply nested `rules` to every value of the mapping at `path`,
+#               with `{key}` available to messages
+# A rule with `stop: true` ends validation of its scope on the first finding.
+SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "hub_manifest": {
+        "version": 1,
+        "format": "json",
+        "match": ["hub.manifest.json", "*.hub.manifest.json"],
+        "root": "object",
+        "rules": [
+            {"check": "required", "fields": ["version", "cluster", "release_date", "services"],
+             "level": "error", "stop": True,
+             "message": "Hub manifest missing required field: {field}"},
+            {"check": "each", "path": "services", "level": "error",
+             "message": "Hub manifest services must be an object",
+             "rules": [
+                 {"check": "type", "type": "object", "level": "error", "stop": True,
+                  "message": "Service {key} must be an object"},
+                 {"check": "required", "fields": ["version", "endpoint"], "level": "warning",
+                  "message": "Service {key} missing {field}"},
+             ]},
+        ],
+    },
+    "doctrine_policy": {
+        "version": 1,
+        "format": "json",
+        "match": ["policy.doctrine.json", "*.policy.doctrine.json"],
+        "root": "object",
+        "rules": [
+            {"check": "required", "fields": ["doctrine_version", "effective_date", "flags"],
+             "level": "error", "stop": True,
+             "message": "Doctrine policy missing required field: {field}"},
+            {"check": "required", "path": "flags",
+             "fields": ["require_reflection", "sandbox_all_operations",
+                        "audit_all_requests", "validate_all_signatures"],
+             "level": "warning",
+             "message": "Doctrine policy missing expected flag: {field}"},
+        ],
+    },
+    "development_config": {
+        "version": 1,
+        "format": "yaml",
+        "match": ["*development.yaml", "*development.yml"],
+        "root": "mapping",
+        "rules": [
+            # Development should have relaxed security
+            {"check": "forbid", "path": "security.require_authentication", "value": True,
+             "level": "warning", "message": "Development config has require_authentication=true"},
+        ],
+    },
+    "production_config": {
+        "version": 1,
+        "format": "yaml",
+        "match": ["*production.yaml", "*production.yml"],
+        "root": "mapping",
+        "rules": [
+            # Production should have strict security
+            {"check": "expect", "path": "security.require_authentication", "value": True,
+             "level": "warning", "message": "Production config should have require_authentication=true"},
+            {"check": "expect", "path": "security.require_mtls", "value": True,
+             "level": "warning", "message": "Production config should have require_mtls=true"},
+        ],
+    },
+    "generic_json": {
+        "version": 1,
+        "format": "json",
+        "match": ["*.json"],
+        "root": "object",
+        "rules": [],
+    },
+    "generic_yaml": {
+        "version": 1,
+        "format": "yaml",
+        "match": ["*.yaml", "*.yml"],
+        "root": "mapping",
+        "rules": [],
+    },
+}
+
+TYPE_CHECKS = {
+    "object": dict, "mapping": dict, "array": list, "string": str,
+    "number": (int, float), "boolean": bool,
+}
+ROOT_MESSAGES = {"object": "Root must be an object", "mapping": "Root must be a mapping"}
+_MISSING = object()
+
+Findings = Dict[str, List[str]]
+CompiledRule = Callable[[Any, Dict[str, Any], Findings], bool]
+
+
+def _lookup(node: Any, path: Tuple[str, ...]) -> Any:
+    """Follow a pre-split dotted path through nested mappings."""
+    for part in path:
+        if not isinstance(node, dict):
+            return _MISSING
+        node = node.get(part, _MISSING)
+        if node is _MISSING:
+            return _MISSING
+    return node
+
+
+def _compile_rule(rule: Dict[str, Any]) -> CompiledRule:
+    """Turn one declarative rule into a closure; returns False to stop its scope."""
+    check = rule['check']
+    path = tuple(rule['path'].split('.')) if rule.get('path') else ()
+    level = rule.get('level', 'error')
+    message = rule.get('message', '')
+    stop = rule.get('stop', False)
+
+    if check == 'required':
+        fields = tuple(rule['fields'])
+
+        def run(node, context, findings):
+            target = _lookup(node, path)
+            if not isinstance(target, dict):
+                target = {}
+            for field in fields:
+                if field not in target:
+                    findings[level].append(message.format(field=field, **context))
+                    if stop:
+                        return False
+            return True
+
+    elif check == 'type':
+        expected_type = TYPE_CHECKS[rule['type']]
+
+        def run(node, context, findings):
+            if not isinstance(_lookup(node, path), expected_type):
+                findings[level].append(message.format(**context))
+                return not stop
+            return True
+
+    elif check in ('expect', 'forbid'):
+        expected = rule['value']
+        want_equal = check == 'expect'
+        # `True == 1` in Python, so booleans and None compare by identity
+        if isinstance(expected, bool) or expected is None:
+            def matches(value):
+                return value is expected
+        else:
+            def matches(value):
+                return value == expected
+
+        def run(node, context, findings):
+            value = _lookup(node, path)
+            if matches(None if value is _MISSING else value) != want_equal:
+                findings[level].append(message.format(**context))
+                return not stop
+            return True
+
+    elif check == 'each':
+        nested = [_compile_rule(r) for r in rule['rules']]
+
+        def run(node, context, findings):
+            target = _lookup(node, path)
+            if target is _MISSING:
+                return True
+            if not isinstance(target, dict):
+                findings[level].append(message.format(**context))
+                return not stop
+            for key, item in target.items():
+                item_context = dict(context, key=key)
+                for compiled in nested:
+                    if not compiled(item, item_context, findings):
+                        break
+            return True
+
+    else:
+        raise ValueError(f"Unknown schema check: {check}")
+
+    return run
+
+
+@functools.lru_cache(maxsize=None)
+def compiled_schema(name: str) -> Callable[[Any], Findings]:
+    """Compile a schema from SCHEMAS once per process."""
+    schema = SCHEMAS[name]
+    root_type = TYPE_CHECKS[schema['root']]
+    root_message = ROOT_MESSAGES[schema['root']]
+    rules = [_compile_rule(rule) for rule in schema['rules']]
+
+    def validate(content: Any) -> Findings:
+        findings: Findings = {'error': [], 'warning': []}
+        if not isinstance(content, root_type):
+            findings['error'].append(root_message)
+            return findings
+        for compiled in rules:
+            if not compiled(content, {}, findings):
+                break
+        return findings
+
+    return validate
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml_loader() -> Any:
+    """Import PyYAML on first use and prefer the libyaml-backed C loader."""
+    import yaml
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def load_yaml(data: bytes) -> Any:
+    """Parse YAML with the fastest safe loader available."""
+    import yaml
+    return yaml.load(data, Loader=_yaml_loader())
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_patterns() -> List[Tuple[Any, str]]:
+    import fnmatch
+    return [(re.compile(fnmatch.translate(pattern)), name)
+            for name, schema in SCHEMAS.items() for pattern in schema['match']]
+
+
+def schema_for(file_name: str) -> Optional[str]:
+    """Return the name of the first schema matching a file name."""
+    for pattern, name in _schema_patterns():
+        if pattern.match(file_name):
+            return name
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def validator_fingerprint() -> str:
+    """Identify this validator build; any edit to this file changes it."""
+    with open(__file__, 'rb') as f:
+        source_digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    return f"{VALIDATOR_VERSION}+{source_digest}"
+
+
+@functools.lru_cache(maxsize=None)
+def schema_fingerprint(name: Optional[str]) -> str:
+    """Identify a schema by its declared version and canonical content."""
+    if name is None:
+        return "none"
+    schema = SCHEMAS[name]
+    digest = hashlib.sha256(json.dumps(schema, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    return f"{schema['version']}+{digest}"
+
+
+def validate_config_file(file_path: str, schema: Optional[str] = None) -> Dict[str, Any]:
+    """Parse and validate one file against its schema.
+
+    Module-level so it can run in worker processes; each worker compiles the
+    schemas it needs once and reuses them for every file it is handed.
+    """
+    result = {'path': file_path, 'schema': None, 'errors': [], 'warnings': []}
+    schema = schema or schema_for(Path(file_path).name)
+    if schema is None:
+        result['warnings'].append(f"{file_path}: No schema for file type, skipped")
+        return result
+    result['schema'] = schema
+
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        result['content_hash'] = hashlib.sha256(data).hexdigest()
+        if SCHEMAS[schema]['format'] == 'json':
+            content = json.loads(data)
+        else:
+            content = load_yaml(data)
+    except json.JSONDecodeError as e:
+        result['errors'].append(f"{file_path}: Invalid JSON - {e}")
+        return result
+    except Exception as e:
+        yaml = sys.modules.get('yaml')
+        if yaml is not None and isinstance(e, yaml.YAMLError):
+            result['errors'].append(f"{file_path}: Invalid YAML - {e}")
+            return result
+        result['errors'].append(f"{file_path}: Validation error - {e}")
+        return result
+
+    findings = compiled_schema(schema)(content)
+    result['errors'] = [f"{file_path}: {message}" for message in findings['error']]
+    result['warnings'] = [f"{file_path}: {message}" for message in findings['warning']]
+    return result
+
+
+def discover_config_files(targets: List[str]) -> List[Path]:
+    """Expand files, directories and glob patterns into config files."""
+    import glob
+    found: Dict[str, Path] = {}
+    for target in targets:
+        if glob.has_magic(target):
+            candidates = [Path(p) for p in glob.iglob(os.path.expanduser(target), recursive=True)]
+        else:
+            candidates = [Path(target).expanduser()]
+        for candidate in candidates:
+            if candidate.is_dir():
+                for root, dirs, files in os.walk(candidate):
+                    dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+                    for name in files:
+                        if name.endswith(CONFIG_SUFFIXES):
+                            path = Path(root) / name
+                            found.setdefault(str(path), path)
+            elif candidate.is_file():
+                found.setdefault(str(candidate), candidate)
+    return [found[key] for key in sorted(found)]
+
+
+def load_service_endpoints(config_files: List[Path],
+                           environ: Optional[Dict[str, str]] = None) -> Dict[str, Tuple[str, int]]:
+    """Collect `services` endpoints from config files, keyed "<env>/<service>".
+
+    The env is the config file's stem, so development and production entries
+    for the same service are probed separately. A BLUX_<NAME>_HOST variable
+    (e.g. BLUX_REG_HOST=host:port for blux_reg) overrides the configured
+    endpoint, matching how the services are deployed.
+    """
+    environ = os.environ if environ is None else environ
+    endpoints: Dict[str, Tuple[str, int]] = {}
+    for config_file in config_files:
+        with open(config_file, 'rb') as f:
+            content = load_yaml(f.read())
+        services = content.get('services') if isinstance(content, dict) else None
+        if not isinstance(services, dict):
+            continue
+        for name, spec in services.items():
+            if isinstance(spec, dict) and 'port' in spec:
+                endpoint = host_override(name, environ) or (str(spec.get('host', 'localhost')), int(spec['port']))
+                endpoints[f"{config_file.stem}/{name}"] = endpoint
+    return endpoints
+
+
+def host_override(service: str, environ: Dict[str, str]) -> Optional[Tuple[str, int]]:
+    """Endpoint from BLUX_<SERVICE>_HOST=host:port, if set and well formed."""
+    override = environ.get(f"{service.upper()}_HOST")
+    if override:
+        host, _, port = override.rpartition(':')
+        if host and port.isdigit():
+            return host, int(port)
+    return None
+
+
+async def probe_endpoint(host: str, port: int, timeout: float, count: int) -> Dict[str, Any]:
+    """Open `count` TCP connections at once and time each connect.
+
+    All attempts share one deadline, so a probe never takes longer than
+    `timeout`, even for a slow endpoint. Attempts still pending at the deadline
+    count as timed out.
+    """
+    import asyncio
+    latencies: List[float] = []
+    errors: List[str] = []
+
+    async def attempt():
+        started = time.perf_counter()
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError as e:
+            errors.append(e.strerror or str(e))
+            return
+        latencies.append(time.perf_counter() - started)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    tasks = [asyncio.ensure_future(attempt()) for _ in range(count)]
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    error = f"timed out after {timeout:g}s" if pending else (errors[-1] if errors else None)
+
+    latencies.sort()
+    result: Dict[str, Any] = {
+        'endpoint': f"{host}:{port}",
+        'reachable': bool(latencies),
+        'attempts': count,
+        'successes': len(latencies),
+    }
+    if latencies:
+        result['connect_ms'] = {
+            'min': round(latencies[0] * 1000, 3),
+            'p50': round(percentile(latencies, 50) * 1000, 3),
+            'p90': round(percentile(latencies, 90) * 1000, 3),
+            'p99': round(percentile(latencies, 99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3),
+        }
+    if error is not None:
+        result['error'] = error
+    return result
+
+
+def probe_services(endpoints: Dict[str, Tuple[str, int]], timeout: float = PROBE_TIMEOUT,
+                   count: int = PROBE_COUNT) -> Dict[str, Dict[str, Any]]:
+    """Probe every endpoint concurrently; returns results keyed like `endpoints`."""
+    import asyncio
+
+    async def probe_all():
+        results = await asyncio.gather(*(probe_endpoint(host, port, timeout, count)
+                                         for host, port in endpoints.values()))
+        return dict(zip(endpoints, results))
+
+    return asyncio.run(probe_all())
+
+
+class ValidationCache:
+    """Persistent per-file results keyed by content hash, validator and schema.
+
+    Entries are reused only when the file bytes, the validator fingerprint and
+    the fingerprint of the schema the file maps to all match, so editing a
+    schema or this tool invalidates exactly the affected results.
+    """
+
+    def __init__(self, cache_path: Optional[Path], trust_stat: bool = False):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.trust_stat = trust_stat
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._stat_at_lookup: Dict[str, List[int]] = {}
+        self.load()
+
+    def load(self):
+        """Load the cache file, discarding it if another validator build wrote it."""
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            return
+        if data.get('validator') == validator_fingerprint():
+            self.entries = data.get('entries', {})
+        else:
+            self._dirty = True
+
+    def lookup(self, file_path: str, schema: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the stored result for an unchanged file, or None on a miss.
+
+        With trust_stat, an unchanged (inode, size, mtime) signature is taken
+        as proof the content is unchanged and the file is not even read.
+        """
+        entry = self.entries.get(file_path)
+        schema = schema or schema_for(Path(file_path).name)
+        signature = None
+        if self.trust_stat:
+            # Taken before any read, so an edit racing the validation is caught next time
+            try:
+                st = os.stat(file_path)
+                signature = [st.st_ino, st.st_size, st.st_mtime_ns]
+            except OSError:
+                pass
+        if entry is None or entry['schema'] != schema or \
+                entry['schema_fingerprint'] != schema_fingerprint(schema):
+            return self._miss(file_path, signature)
+        if signature is not None and entry.get('stat') == signature:
+            self.hits += 1
+            return self._as_result(file_path, entry)
+        try:
+            with open(file_path, 'rb') as f:
+                content_hash = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return self._miss(file_path, signature)
+        if content_hash != entry['content_hash']:
+            return self._miss(file_path, signature)
+        if signature is not None:
+            entry['stat'] = signature
+        self.hits += 1
+        return self._as_result(file_path, entry)
+
+    def _miss(self, file_path: str, signature: Optional[List[int]]) -> None:
+        self.misses += 1
+        if signature is not None:
+            self._stat_at_lookup[file_path] = signature
+        return None
+
+    @staticmethod
+    def _as_result(file_path: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'path': file_path, 'schema': entry['schema'], 'content_hash': entry['content_hash'],
+            'errors': list(entry['errors']), 'warnings': list(entry['warnings']),
+        }
+
+    def store(self, result: Dict[str, Any]):
+        """Remember a freshly computed result; unreadable files are not cached."""
+        if 'content_hash' not in result:
+            return
+        entry = {
+            'content_hash': result['content_hash'],
+            'schema': result['schema'],
+            'schema_fingerprint': schema_fingerprint(result['schema']),
+            'errors': result['errors'],
+            'warnings': result['warnings'],
+        }
+        signature = self._stat_at_lookup.pop(result['path'], None)
+        if signature is not None:
+            entry['stat'] = signature
+        self.entries[result['path']] = entry
+        self._dirty = True
+
+    def save(self):
+        """Atomically persist the cache, dropping entries for deleted files."""
+        if self.cache_path is None:
+            return
+        stale = [path for path in self.entries if not os.path.exists(path)]
+        for path in stale:
+            del self.entries[path]
+        if not (self._dirty or stale):
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.cache_path.with_name(self.cache_path.name + f".{os.getpid()}.tmp")
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump({'validator': validator_fingerprint(), 'entries': self.entries},
+                      f, separators=(',', ':'))
+        os.replace(partial, self.cache_path)
+        self._dirty = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this run."""
+        lookups = self.hits + self.misses
+        return {
+            'path': str(self.cache_path) if self.cache_path else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
 
 class ConfigValidator:
     """Validates BLUX configuration files."""
-    
-    def __init__(self):
+
+    def __init__(self, cache: Optional[ValidationCache] = None, report_cache: bool = True):
         self.errors = []
         self.warnings = []
-        
-    def validate_json_file(self, file_path: Path, schema: Optional[Dict] = None) -> bool:
+        self.results: List[Dict[str, Any]] = []
+        self.probes: Dict[str, Dict[str, Any]] = {}
+        self.cache = cache
+        # The daemon's implicit in-memory cache is not reported, so its output matches in-process runs
+        self.report_cache = report_cache
+
+    def _record(self, result: Dict[str, Any]) -> bool:
+        self.results.append(result)
+        self.errors.extend(result['errors'])
+        self.warnings.extend(result['warnings'])
+        return not result['errors']
+
+    def _validate_one(self, file_path: str, schema: Optional[str]) -> Dict[str, Any]:
+        if self.cache is not None:
+            cached = self.cache.lookup(file_path, schema)
+            if cached is not None:
+                return cached
+        result = validate_config_file(file_path, schema)
+        if self.cache is not None:
+            self.cache.store(result)
+        return result
+
+    def validate_json_file(self, file_path: Path, schema: Optional[str] = None) -> bool:
         """Validate a JSON configuration file."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = json.load(f)
-                
-            # Basic structure validation
-            if file_path.name == "hub.manifest.json":
-                return self._validate_hub_manifest(content)
-            elif file_path.name == "policy.doctrine.json":
-                return self._validate_doctrine_policy(content)
-            else:
-                # Generic JSON validation
-                if not isinstance(content, dict):
-                    self.errors.append(f"{file_path}: Root must be an object")
-                    return False
-                return True
-                
-        except json.JSONDecodeError as e:
-            self.errors.append(f"{file_path}: Invalid JSON - {e}")
-            return False
-        except Exception as e:
-            self.errors.append(f"{file_path}: Validation error - {e}")
-            return False
-    
-    def validate_yaml_file(self, file_path: Path) -> bool:
+        return self._record(self._validate_one(str(file_path), schema))
+
+    def validate_yaml_file(self, file_path: Path, schema: Optional[str] = None) -> bool:
         """Validate a YAML configuration file."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = yaml.safe_load(f)
-                
-            if file_path.name.endswith(('.yaml', '.yml')):
-                if not isinstance(content, dict):
-                    self.errors.append(f"{file_path}: Root must be a mapping")
-                    return False
-                    
-                # Environment-specific validations
-                if "development.yaml" in file_path.name:
-                    return self._validate_development_config(content)
-                elif "production.yaml" in file_path.name:
-                    return self._validate_production_config(content)
-                    
-            return True
-            
-        except yaml.YAMLError as e:
-            self.errors.append(f"{file_path}: Invalid YAML - {e}")
-            return False
-        except Exception as e:
-            self.errors.append(f"{file_path}: Validation error - {e}")
-            return False
-    
-    def _validate_hub_manifest(self, manifest: Dict) -> bool:
-        """Validate hub manifest structure."""
-        required_fields = ['version', 'cluster', 'release_date', 'services']
-        
-        for field in required_fields:
-            if field not in manifest:
-                self.errors.append(f"Hub manifest missing required field: {field}")
-                return False
-                
-        # Validate services structure
-        services = manifest.get('services', {})
-        for service_name, service_config in services.items():
-            if not isinstance(service_config, dict):
-                self.errors.append(f"Service {service_name} must be an object")
-                continue
-                
-            if 'version' not in service_config:
-                self.warnings.append(f"Service {service_name} missing version")
-            if 'endpoint' not in service_config:
-                self.warnings.append(f"Service {service_name} missing endpoint")
-                
-        return True
-    
-    def _validate_doctrine_policy(self, policy: Dict) -> bool:
-        """Validate doctrine policy structure."""
-        required_fields = ['doctrine_version', 'effective_date', 'flags']
-        
-        for field in required_fields:
-            if field not in policy:
-                self.errors.append(f"Doctrine policy missing required field: {field}")
-                return False
-                
-        # Validate flags
-        flags = policy.get('flags', {})
-        expected_flags = [
-            'require_reflection', 'sandbox_all_operations', 
-            'audit_all_requests', 'validate_all_signatures'
-        ]
-        
-        for flag in expected_flags:
-            if flag not in flags:
-                self.warnings.append(f"Doctrine policy missing expected flag: {flag}")
-                
-        return True
-    
-    def _validate_development_config(self, config: Dict) -> bool:
-        """Validate development configuration."""
-        # Development should have relaxed security
-        security = config.get('security', {})
-        if security.get('require_authentication') is True:
-            self.warnings.append("Development config has require_authentication=true")
-            
-        return True
-    
-    def _validate_production_config(self, config: Dict) -> bool:
-        """Validate production configuration."""
-        # Production should have strict security
-        security = config.get('security', {})
-        if security.get('require_authentication') is not True:
-            self.warnings.append("Production config should have require_authentication=true")
-            
-        if security.get('require_mtls') is not True:
-            self.warnings.append("Production config should have require_mtls=true")
-            
-        return True
-    
-    def validate_environment(self) -> bool:
+        return self._record(self._validate_one(str(file_path), schema))
+
+    def validate_files(self, files: List[Path], jobs: int = 0) -> bool:
+        """Validate many files, fanning out to worker processes when worthwhile."""
+        paths = [str(f) for f in files]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(paths)
+        pending = []
+        for slot, path in enumerate(paths):
+            cached = self.cache.lookup(path) if self.cache is not None else None
+            if cached is None:
+                pending.append(slot)
+            else:
+                results[slot] = cached
+
+        jobs = jobs or os.cpu_count() or 1
+        pending_paths = [paths[slot] for slot in pending]
+        if jobs == 1 or len(pending) < PARALLEL_MIN_FILES:
+            fresh = map(validate_config_file, pending_paths)
+            for slot, result in zip(pending, fresh):
+                results[slot] = result
+        else:
+            chunksize = max(1, len(pending) // (jobs * 8))
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                fresh = pool.map(validate_config_file, pending_paths, chunksize=chunksize)
+                for slot, result in zip(pending, fresh):
+                    results[slot] = result
+
+        if self.cache is not None:
+            for slot in pending:
+                self.cache.store(results[slot])
+        return all([self._record(result) for result in results])
+
+    def validate_environment(self, environ: Optional[Dict[str, str]] = None) -> bool:
         """Validate environment variables."""
-        required_vars = ['BLUX_ENV']
-        optional_vars = [
-            'BLUX_AUDIT_PATH', 'BLUX_LOG_PATH', 'BLUX_DATA_PATH',
-            'BLUX_REG_HOST', 'BLUX_LITE_HOST', 'BLUX_GUARD_HOST'
-        ]
-        
-        for var in required_vars:
-            if var not in os.environ:
+        environ = os.environ if environ is None else environ
+
+        for var in REQUIRED_ENV_VARS:
+            if var not in environ:
                 self.errors.append(f"Required environment variable not set: {var}")
-                
-        for var in optional_vars:
-            if var not in os.environ:
+
+        for var in OPTIONAL_ENV_VARS:
+            if var not in environ:
                 self.warnings.append(f"Optional environment variable not set: {var}")
-                
+
         return len([e for e in self.errors if 'environment variable' in e]) == 0
-    
+
     def validate_directory_structure(self, base_path: Path) -> bool:
         """Validate expected directory structure."""
         expected_dirs = [
             'scripts',
             'docs',
-            'manifests', 
+            'manifests',
             'config',
             'backups',
             'patches'
         ]
-        
+
         for dir_name in expected_dirs:
             dir_path = base_path / dir_name
             if not dir_path.exists():
                 self.warnings.append(f"Expected directory not found: {dir_name}")
-                
+
         return True
-    
+
+    def probe_services(self, endpoints: Dict[str, Tuple[str, int]], timeout: float = PROBE_TIMEOUT,
+                       count: int = PROBE_COUNT) -> bool:
+        """Check that every configured service accepts connections."""
+        if not endpoints:
+            self.warnings.append("No service endpoints configured to probe")
+            return True
+        self.probes = probe_services(endpoints, timeout, count)
+        for name, probe in self.probes.items():
+            if not probe['reachable']:
+                self.errors.append(f"Service {name} unreachable at {probe['endpoint']}: {probe['error']}")
+            elif probe['successes'] < probe['attempts']:
+                self.warnings.append(f"Service {name} at {probe['endpoint']} accepted "
+                                     f"{probe['successes']}/{probe['attempts']} connections")
+        return all(probe['reachable'] for probe in self.probes.values())
+
     def get_summary(self) -> Dict[str, Any]:
         """Get validation summary."""
-        return {
+        summary = {
             'valid': len(self.errors) == 0,
+            'validator_version': VALIDATOR_VERSION,
+            'files_checked': len(self.results),
+            'files_invalid': sum(1 for r in self.results if r['errors']),
             'error_count': len(self.errors),
             'warning_count': len(self.warnings),
             'errors': self.errors,
-            'warnings': self.warnings
+            'warnings': self.warnings,
+            'files': {
+                r['path']: {
+                    'schema': r['schema'],
+                    'error_count': len(r['errors']),
+                    'warning_count': len(r['warnings']),
+                }
+                for r in self.results if r['errors'] or r['warnings']
+            },
         }
-    
-    def print_summary(self, output_format: str = "text"):
-        """Print validation summary."""
+        if self.probes:
+            summary['probes'] = self.probes
+        if self.cache is not None and self.report_cache:
+            summary['cache'] = self.cache.get_stats()
+        return summary
+
+    def format_summary(self, output_format: str = "text") -> str:
+        """Render the validation summary."""
         summary = self.get_summary()
-        
+
         if output_format == "json":
-            print(json.dumps(summary, indent=2))
-            return
-            
+            return json.dumps(summary, indent=2)
+
         # Text format
-        print("BLUX Configuration Validation")
-        print("=" * 40)
-        
+        lines = ["BLUX Configuration Validation", "=" * 40]
+        if summary['files_checked'] > 1:
+            lines.append(f"Files checked: {summary['files_checked']:,} ({summary['files_invalid']:,} invalid)")
+        if 'cache' in summary:
+            cache = summary['cache']
+            lines.append(f"Cache: {cache['hits']:,} hits, {cache['misses']:,} misses "
+                         f"({cache['hit_rate']:.1%} hit rate)")
+        for name, probe in summary.get('probes', {}).items():
+            if probe['reachable']:
+                connect = probe['connect_ms']
+                lines.append(f"Service {name} ({probe['endpoint']}): {probe['successes']}/{probe['attempts']} "
+                             f"connects, p50 {connect['p50']:.2f} ms, p99 {connect['p99']:.2f} ms")
+            else:
+                lines.append(f"Service {name} ({probe['endpoint']}): unreachable")
+
         if summary['error_count'] > 0:
-            print(f"❌ Validation failed with {summary['error_count']} errors")
+            lines.append(f"❌ Validation failed with {summary['error_count']} errors")
         elif summary['warning_count'] > 0:
-            print(f"⚠️  Validation passed with {summary['warning_count']} warnings")
+            lines.append(f"⚠️  Validation passed with {summary['warning_count']} warnings")
         else:
-            print("✅ Validation passed")
-            
+            lines.append("✅ Validation passed")
+
         if summary['errors']:
-            print("\nErrors:")
-            for error in summary['errors']:
-                print(f"  • {error}")
-                
+            lines.append("\nErrors:")
+            lines.extend(f"  • {error}" for error in summary['errors'])
+
         if summary['warnings']:
-            print("\nWarnings:")
-            for warning in summary['warnings']:
-                print(f"  • {warning}")
+            lines.append("\nWarnings:")
+            lines.extend(f"  • {warning}" for warning in summary['warnings'])
+        return "\n".join(lines)
 
+    def print_summary(self, output_format: str = "text"):
+        """Print validation summary."""
+        print(self.format_summary(output_format))
 
-def main():
+
+def snapshot_inputs(base_path: Path, env: str) -> List[Tuple[str, Path]]:
+    """Files merged into an environment snapshot, as (section, path) pairs."""
+    return [
+        ('config', base_path / "config" / "base.yaml"),
+        ('config', base_path / "config" / f"{env}.yaml"),
+        ('manifest', base_path / "manifests" / "hub.manifest.json"),
+        ('doctrine', base_path / "manifests" / "policy.doctrine.json"),
+    ]
+
+
+def default_snapshot_path(base_path: Path, env: str) -> Path:
+    return base_path / ".cache" / f"config-{env}.snapshot"
+
+
+def merge_config(base: Any, overlay: Any) -> Any:
+    """Deep-merge mappings; anything else in the overlay replaces the base."""
+    if not isinstance(base, dict) or not isinstance(overlay, dict):
+        return overlay
+    merged = dict(base)
+    for key, value in overlay.items():
+        merged[key] = merge_config(merged[key], value) if key in merged else value
+    return merged
+
+
+def snapshot_environ(environ: Dict[str, str]) -> Dict[str, str]:
+    """The BLUX_* variables a snapshot depends on (secrets are never captured)."""
+    names = set(REQUIRED_ENV_VARS) | set(OPTIONAL_ENV_VARS) | set(ENV_PATH_OVERRIDES)
+    names.update(k for k in environ if k.startswith('BLUX_') and k.endswith('_HOST'))
+    return {name: environ[name] for name in sorted(names) if name in environ}
+
+
+def _environ_digest(environ: Dict[str, str]) -> str:
+    return hashlib.sha256(json.dumps(snapshot_environ(environ), sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def resolve_config(base_path: Path, env: str, environ: Dict[str, str]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Merge the snapshot inputs; returns (resolved document, input records)."""
+    resolved: Dict[str, Any] = {'environment': env, 'config': {}}
+    inputs = []
+    for section, path in snapshot_inputs(base_path, env):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            inputs.append({'path': str(path), 'exists': False})
+            continue
+        with open(path, 'rb') as f:
+            data = f.read()
+        content = json.loads(data) if path.suffix == '.json' else load_yaml(data)
+        resolved[section] = merge_config(resolved.get(section, {}), content or {})
+        inputs.append({'path': str(path), 'exists': True, 'size': stat.st_size,
+                       'mtime_ns': stat.st_mtime_ns, 'sha256': hashlib.sha256(data).hexdigest(),
+                       'schema_fingerprint': schema_fingerprint(schema_for(path.name))})
+
+    config = resolved['config']
+    for name, spec in (config.get('services') or {}).items():
+        override = host_override(name, environ)
+        if override is not None and isinstance(spec, dict):
+            spec['host'], spec['port'] = override
+    for var, key in ENV_PATH_OVERRIDES.items():
+        if var in environ:
+            config.setdefault('paths', {})[key] = environ[var]
+    resolved['environ'] = snapshot_environ(environ)
+    return resolved, inputs
+
+
+def compile_snapshot(base_path: Path, env: str, output: Path,
+                     environ: Optional[Dict[str, str]] = None) -> Tuple[ConfigValidator, Optional[Dict[str, Any]]]:
+    """Validate and merge one environment's config into a snapshot file.
+
+    Layout: SNAPSHOT_MAGIC, two little-endian uint32 lengths, a JSON header
+    (format, versions, inputs) and the compact JSON body. The body is
+    written once and never modified in place, so readers can mmap it.
+    Nothing is written when any input fails validation or config/<env>.yaml
+    does not exist.
+    """
+    import struct
+    import tempfile
+
+    environ = os.environ if environ is None else environ
+    validator = ConfigValidator()
+    env_config = base_path / "config" / f"{env}.yaml"
+    if not env_config.exists():
+        validator.errors.append(f"No config for environment {env}: {env_config} not found")
+        return validator, None
+    validator.validate_files([path for _, path in snapshot_inputs(base_path, env) if path.exists()], jobs=1)
+    if validator.errors:
+        return validator, None
+
+    resolved, inputs = resolve_config(base_path, env, environ)
+    body = json.dumps(resolved, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    header = {
+        'format': SNAPSHOT_FORMAT,
+        'validator_version': VALIDATOR_VERSION,
+        'environment': env,
+        'compiled_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'inputs': inputs,
+        'environ_sha256': _environ_digest(environ),
+        'body_sha256': hashlib.sha256(body).hexdigest(),
+    }
+    header_bytes = json.dumps(header, sort_keys=True).encode('utf-8')
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output.parent, prefix=output.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC + struct.pack('<II', len(header_bytes), len(body)))
+            f.write(header_bytes)
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, output)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return validator, header
+
+
+def read_snapshot(snapshot_path: Path, with_body: bool = True) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Map a snapshot and return (header, resolved config)."""
+    import mmap
+    import struct
+
+    with open(snapshot_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            if view[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError(f"{snapshot_path}: not a BLUX config snapshot")
+            header_len, body_len = struct.unpack_from('<II', view, len(SNAPSHOT_MAGIC))
+            body_start = SNAPSHOT_PREFIX_SIZE + header_len
+            header = json.loads(view[SNAPSHOT_PREFIX_SIZE:body_start])
+            body = json.loads(view[body_start:body_start + body_len]) if with_body else None
+    return header, body
+
+
+def load_snapshot(snapshot_path: Path) -> Dict[str, Any]:
+    """Resolved configuration from a compiled snapshot."""
+    return read_snapshot(snapshot_path)[1]
+
+
+def snapshot_staleness(snapshot_path: Path, environ: Optional[Dict[str, str]] = None) -> List[str]:
+    """Reasons a snapshot needs recompiling; empty when it is fresh.
+
+    Inputs are compared by size and mtime first and only hashed when those
+    differ, so checking a fresh snapshot costs a few stat calls. An input
+    whose schema changed since compilation is stale even if VALIDATOR_VERSION
+    was not bumped.
+    """
+    environ = os.environ if environ is None else environ
+    try:
+        header, _ = read_snapshot(snapshot_path, with_body=False)
+    except FileNotFoundError:
+        return [f"{snapshot_path}: snapshot not found"]
+    except (OSError, ValueError) as e:
+        return [f"{snapshot_path}: unreadable snapshot - {e}"]
+
+    reasons = []
+    if header.get('format') != SNAPSHOT_FORMAT or header.get('validator_version') != VALIDATOR_VERSION:
+        reasons.append(f"compiled by validator {header.get('validator_version')} "
+                       f"(format {header.get('format')}), current is {VALIDATOR_VERSION}")
+    for record in header.get('inputs', []):
+        try:
+            stat = os.stat(record['path'])
+        except FileNotFoundError:
+            if record['exists']:
+                reasons.append(f"{record['path']}: removed")
+            continue
+        if not record['exists']:
+            reasons.append(f"{record['path']}: added")
+            continue
+        if record.get('schema_fingerprint') != schema_fingerprint(schema_for(Path(record['path']).name)):
+            reasons.append(f"{record['path']}: schema changed")
+        if (stat.st_size, stat.st_mtime_ns) != (record['size'], record['mtime_ns']):
+            with open(record['path'], 'rb') as f:
+                if hashlib.sha256(f.read()).hexdigest() != record['sha256']:
+                    reasons.append(f"{record['path']}: modified")
+    if _environ_digest(environ) != header.get('environ_sha256'):
+        reasons.append("BLUX_* environment variables changed")
+    return reasons
+
+
+def run_snapshot_benchmark(base_path: Path, env: str, runs: int) -> Dict[str, Any]:
+    """Compare startup config loading: parse+merge YAML vs load a snapshot."""
+    import tempfile
+
+    def timed(func) -> Dict[str, float]:
+        samples = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - started)
+        samples.sort()
+        return {'median_us': round(percentile(samples, 50) * 1e6, 1),
+                'p99_us': round(percentile(samples, 99) * 1e6, 1)}
+
+    environ = dict(os.environ)
+    with tempfile.TemporaryDirectory(prefix="blux-snapshot-") as scratch:
+        snapshot_path = Path(scratch) / f"config-{env}.snapshot"
+        validator, header = compile_snapshot(base_path, env, snapshot_path, environ)
+        if header is None:
+            raise SystemExit("Cannot benchmark: " + "; ".join(validator.errors))
+        report = {
+            'environment': env,
+            'runs': runs,
+            'inputs': sum(1 for record in header['inputs'] if record['exists']),
+            'snapshot_bytes': snapshot_path.stat().st_size,
+            'parse_yaml': timed(lambda: resolve_config(base_path, env, environ)),
+            'load_snapshot': timed(lambda: load_snapshot(snapshot_path)),
+            'freshness_check': timed(lambda: snapshot_staleness(snapshot_path, environ)),
+        }
+    report['speedup'] = round(report['parse_yaml']['median_us'] / max(report['load_snapshot']['median_us'], 0.1), 1)
+    return report
+
+
+def generate_benchmark_tree(root: Path, count: int) -> None:
+    """Write `count` synthetic per-node manifests, policies and env configs."""
+    import yaml
+    services = {
+        f"blux-svc-{n}": {"version": "1.0.0", "endpoint": f"https://svc{n}.blux.example:443",
+                          "capabilities": ["orchestration", "doctrine_enforcement"]}
+        for n in range(24)
+    }
+    for i in range(count):
+        node_dir = root / f"node-{i // 4:05d}"
+        node_dir.mkdir(exist_ok=True)
+        kind = i % 4
+        if kind == 0:
+            manifest = {"version": "0.9.0", "cluster": f"blux-{i}", "release_date": "2025-10-20",
+                        "services": dict(services, **{"blux-extra": {"version": "0.1.0"}})}
+            (node_dir / "hub.manifest.json").write_text(json.dumps(manifest, indent=2))
+        elif kind == 1:
+            policy = {"doctrine_version": "1.0", "effective_date": "2025-10-20",
+                      "flags": {"require_reflection": True, "sandbox_all_operations": True,
+                                "audit_all_requests": True}}
+            (node_dir / "policy.doctrine.json").write_text(json.dumps(policy, indent=2))
+        elif kind == 2:
+            config = {"environment": "development", "logging": {"level": "debug"},
+                      "security": {"require_authentication": False, "sandbox_execution": True},
+                      "services": {f"svc_{n}": {"host": "localhost", "port": 50050 + n} for n in range(16)}}
+            (node_dir / "development.yaml").write_text(yaml.safe_dump(config))
+        else:
+            config = {"environment": "production", "logging": {"level": "info"},
+                      "security": {"require_authentication": True, "require_mtls": False},
+                      "services": {f"svc_{n}": {"host": f"svc{n}.blux.example", "port": 443} for n in range(16)}}
+            (node_dir / "production.yaml").write_text(yaml.safe_dump(config))
+
+
+def run_benchmark(count: int, jobs: int) -> Dict[str, Any]:
+    """Time serial and pooled validation over a generated fleet tree."""
+    import tempfile
+    with tempfile.TemporaryDirectory(prefix="blux-config-bench-") as scratch:
+        root = Path(scratch)
+        generate_benchmark_tree(root, count)
+        files = discover_config_files([str(root)])
+        report = {'files': len(files), 'jobs': jobs or os.cpu_count() or 1}
+        cache_path = root / ".cache" / "config-validator.json"
+        runs = (('serial', 1, None), ('parallel', jobs, None),
+                ('cold_cache', jobs, cache_path), ('warm_cache', jobs, cache_path))
+        for label, worker_count, cache_file in runs:
+            started = time.perf_counter()
+            cache = ValidationCache(cache_file) if cache_file else None
+            validator = ConfigValidator(cache)
+            validator.validate_files(files, jobs=worker_count)
+            if cache is not None:
+                cache.save()
+            elapsed = time.perf_counter() - started
+            report[label] = {
+                'seconds': round(elapsed, 3),
+                'files_per_second': round(len(files) / elapsed, 1),
+                'warning_count': len(validator.warnings),
+            }
+        return report
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command-line interface shared by main() and the daemon."""
     parser = argparse.ArgumentParser(description="BLUX Configuration Validator")
-    parser.add_argument("--check", action="store_true", 
+    parser.add_argument("targets", nargs="*",
+                       help="Config files, directories or glob patterns to validate "
+                            "(default: the standard files under --path)")
+    parser.add_argument("--check", action="store_true",
                        help="Check configuration without full validation")
     parser.add_argument("--env", choices=["development", "production", "all"],
                        default="all", help="Environment to validate")
     parser.add_argument("--format", choices=["text", "json"], default="text",
                        help="Output format")
-    parser.add_argument("--path", default=".", 
+    parser.add_argument("--path", default=".",
                        help="Path to BLUX root directory")
-    
-    args = parser.parse_args()
-    
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                       help="Worker processes for many files (default: CPU count, 1 disables the pool)")
+    parser.add_argument("--cache", action="store_true",
+                       help="Reuse results for unchanged files (stored in <path>/.cache/config-validator.json)")
+    parser.add_argument("--cache-file",
+                       help="Cache location; implies --cache")
+    parser.add_argument("--probe", action="store_true",
+                       help="Probe the service endpoints listed in the selected environment configs")
+    parser.add_argument("--probe-timeout", type=float, default=PROBE_TIMEOUT,
+                       help=f"Seconds to wait for each connection (default: {PROBE_TIMEOUT:g})")
+    parser.add_argument("--probe-count", type=int, default=PROBE_COUNT,
+                       help=f"Connections per service for latency percentiles (default: {PROBE_COUNT})")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                       help="Benchmark serial vs pooled validation on N generated files")
+    parser.add_argument("--compile", action="store_true",
+                       help="Validate and merge config, manifests and BLUX_* variables into a snapshot per --env")
+    parser.add_argument("--snapshot",
+                       help="Snapshot file for a single --env (default: <path>/.cache/config-<env>.snapshot)")
+    parser.add_argument("--verify-snapshot", action="store_true",
+                       help="Exit 1 if the --env snapshot is missing or older than its inputs")
+    parser.add_argument("--benchmark-snapshot", type=int, metavar="RUNS",
+                       help="Time loading the --env snapshot against parsing and merging the YAML")
+    parser.add_argument("--daemon", action="store_true",
+                       help="Serve validation requests on a Unix socket (see config-validator-client.py)")
+    parser.add_argument("--socket", default=None,
+                       help="Daemon socket path (default: $BLUX_VALIDATOR_SOCKET or a per-user runtime path)")
+    return parser
+
+
+def cache_path_for(args: argparse.Namespace) -> Optional[Path]:
+    """Persistent cache file requested on the command line, if any."""
+    if args.cache_file:
+        return Path(args.cache_file).resolve()
+    if args.cache:
+        return Path(args.path).resolve() / ".cache" / "config-validator.json"
+    return None
+
+
+def run_validation(args: argparse.Namespace, cache: Optional[ValidationCache] = None,
+                   environ: Optional[Dict[str, str]] = None,
+                   log: Callable[[str], None] = print, report_cache: bool = True) -> ConfigValidator:
+    """Run the validation selected by parsed arguments."""
     base_path = Path(args.path).resolve()
-    validator = ConfigValidator()
-    
-    print(f"Validating configuration in: {base_path}")
-    
-    # Validate directory structure
-    validator.validate_directory_structure(base_path)
-    
-    # Validate configuration files
-    config_files = [
-        base_path / "manifests" / "hub.manifest.json",
-        base_path / "manifests" / "policy.doctrine.json",
-    ]
-    
-    # Add environment-specific configs
-    if args.env in ["development", "all"]:
-        config_files.append(base_path / "config" / "development.yaml")
-    if args.env in ["production", "all"]:
-        config_files.append(base_path / "config" / "production.yaml")
-    
-    for config_file in config_files:
-        if config_file.exists():
-            if config_file.suffix == '.json':
-                validator.validate_json_file(config_file)
-            elif config_file.suffix in ['.yaml', '.yml']:
-                validator.validate_yaml_file(config_file)
-        else:
-            validator.warnings.append(f"Configuration file not found: {config_file.name}")
-    
+    validator = ConfigValidator(cache, report_cache)
+
+    if args.targets:
+        config_files = discover_config_files(args.targets)
+        if args.format == "text":
+            log(f"Validating {len(config_files):,} configuration files")
+        if not config_files:
+            validator.warnings.append("No configuration files matched: " + ", ".join(args.targets))
+        validator.validate_files(config_files, jobs=args.jobs)
+    else:
+        if args.format == "text":
+            log(f"Validating configuration in: {base_path}")
+
+        # Validate directory structure
+        validator.validate_directory_structure(base_path)
+
+        # Validate configuration files
+        config_files = [
+            base_path / "manifests" / "hub.manifest.json",
+            base_path / "manifests" / "policy.doctrine.json",
+        ]
+
+        # Add environment-specific configs
+        if args.env in ["development", "all"]:
+            config_files.append(base_path / "config" / "development.yaml")
+        if args.env in ["production", "all"]:
+            config_files.append(base_path / "config" / "production.yaml")
+
+        existing = []
+        for config_file in config_files:
+            if config_file.exists():
+                existing.append(config_file)
+            else:
+                validator.warnings.append(f"Configuration file not found: {config_file.name}")
+        validator.validate_files(existing, jobs=1)
+
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError as e:
+            validator.warnings.append(f"Could not write validation cache: {e}")
+
     # Validate environment if not in check mode
     if not args.check:
-        validator.validate_environment()
-    
+        validator.validate_environment(environ)
+
+    if args.probe:
+        env_configs = [base_path / "config" / f"{env}.yaml" for env in ("development", "production")
+                       if args.env in (env, "all")]
+        try:
+            endpoints = load_service_endpoints([f for f in env_configs if f.exists()], environ)
+        except Exception as e:
+            validator.errors.append(f"Could not read service endpoints: {e}")
+        else:
+            validator.probe_services(endpoints, args.probe_timeout, max(args.probe_count, 1))
+
+    return validator
+
+
+def source_files() -> List[str]:
+    """This tool and the tools/ helper modules it has imported (e.g. blux_common)."""
+    tools_dir = os.path.dirname(os.path.abspath(__file__))
+    files = {os.path.abspath(__file__)}
+    for module in list(sys.modules.values()):
+        path = getattr(module, '__file__', None)
+        if path and os.path.dirname(os.path.abspath(path)) == tools_dir:
+            files.add(os.path.abspath(path))
+    return sorted(files)
+
+
+class ValidationDaemon:
+    """Serves validation requests over a Unix socket with warm caches.
+
+    Compiled schemas stay resident (compiled_schema is process-wide), and every
+    file result is kept in memory keyed by stat signature and content hash, so
+    repeat requests for unchanged files skip reading and parsing entirely.
+    Requests are newline-delimited JSON: {"argv": [...], "cwd": "...", "env": {...}};
+    responses are {"exit_code": int, "output": str}.
+    """
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.memory_cache = ValidationCache(None, trust_stat=True)
+        self.persistent_caches: Dict[Path, ValidationCache] = {}
+        self.requests = 0
+        self._sources = {path: os.stat(path).st_mtime_ns for path in source_files()}
+
+    def is_stale(self) -> bool:
+        """True once this tool or a helper module it imported was edited since start."""
+        for path, mtime in self._sources.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _cache_for(self, args: argparse.Namespace) -> ValidationCache:
+        cache_file = cache_path_for(args)
+        if cache_file is None:
+            return self.memory_cache
+        if cache_file not in self.persistent_caches:
+            self.persistent_caches[cache_file] = ValidationCache(cache_file, trust_stat=True)
+        cache = self.persistent_caches[cache_file]
+        cache.hits = cache.misses = 0
+        return cache
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request and return its rendered output and exit code."""
+        if self.is_stale():
+            return {'exit_code': 75, 'output': '', 'stale': True}
+        import io
+        from contextlib import redirect_stderr, redirect_stdout
+
+        parser = build_parser()
+        usage = io.StringIO()
+        try:
+            with redirect_stdout(usage), redirect_stderr(usage):
+                args = parser.parse_args(request.get('argv', []))
+        except SystemExit as e:
+            return {'exit_code': e.code or 0, 'output': usage.getvalue().rstrip()}
+        if args.daemon or args.benchmark or args.benchmark_snapshot or args.compile or args.verify_snapshot:
+            return {'exit_code': 2, 'output': "Only validation runs are available via the daemon"}
+
+        os.chdir(request.get('cwd') or '/')
+        self.memory_cache.hits = self.memory_cache.misses = 0
+        lines: List[str] = []
+        validator = run_validation(args, self._cache_for(args), request.get('env', {}), lines.append,
+                                   report_cache=cache_path_for(args) is not None)
+        lines.append(validator.format_summary(args.format))
+        self.requests += 1
+        return {'exit_code': 0 if not validator.errors else 1, 'output': "\n".join(lines)}
+
+    def serve_forever(self):
+        """Listen until SIGTERM/SIGINT or a stale-source request."""
+        import signal
+        import socket
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                try:
+                    response = daemon.handle(json.loads(line))
+                except Exception as e:
+                    response = {'exit_code': 70, 'output': f"Validation daemon error: {e}"}
+                self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+                if response.get('stale'):
+                    # The tool was edited; exit so the next start loads the new code
+                    import threading
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                raise SystemExit(f"Validation daemon already listening on {self.socket_path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(self.socket_path)
+            finally:
+                probe.close()
+
+        previous_umask = os.umask(0o177)
+        try:
+            server = socketserver.UnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(previous_umask)
+
+        def stop(signum, frame):
+            import threading
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        print(f"Validation daemon listening on {self.socket_path}", flush=True)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            for cache in self.persistent_caches.values():
+                cache.save()
+        print(f"Validation daemon stopped after {self.requests:,} requests")
+
+
+def run_snapshot_command(args: argparse.Namespace) -> int:
+    """Handle --compile, --verify-snapshot and --benchmark-snapshot; returns the exit code."""
+    base_path = Path(args.path).resolve()
+    envs = ["development", "production"] if args.env == "all" else [args.env]
+    if args.snapshot and len(envs) > 1:
+        print("--snapshot needs a single --env", file=sys.stderr)
+        return 2
+
+    if args.benchmark_snapshot:
+        reports = [run_snapshot_benchmark(base_path, env, args.benchmark_snapshot) for env in envs]
+        if args.format == "json":
+            print(json.dumps(reports, indent=2))
+        for report in reports if args.format == "text" else []:
+            print(f"{report['environment']}: {report['inputs']} inputs, "
+                  f"{report['snapshot_bytes']:,} byte snapshot, {report['runs']:,} runs")
+            for label in ('parse_yaml', 'load_snapshot', 'freshness_check'):
+                print(f"  {label:<16} median {report[label]['median_us']:>9,.1f} us, "
+                      f"p99 {report[label]['p99_us']:>9,.1f} us")
+            print(f"  Snapshot load is {report['speedup']}x faster than parsing YAML")
+        return 0
+
+    results = {}
+    for env in envs:
+        snapshot_path = Path(args.snapshot).resolve() if args.snapshot else default_snapshot_path(base_path, env)
+        if args.compile:
+            validator, header = compile_snapshot(base_path, env, snapshot_path)
+            results[env] = {'snapshot': str(snapshot_path), 'compiled': header is not None,
+                            'errors': validator.errors, 'warnings': validator.warnings}
+        else:
+            reasons = snapshot_staleness(snapshot_path)
+            results[env] = {'snapshot': str(snapshot_path), 'fresh': not reasons, 'reasons': reasons}
+
+    if args.format == "json":
+        print(json.dumps(results, indent=2))
+    else:
+        for env, result in results.items():
+            if args.compile and result['compiled']:
+                print(f"✅ {env}: compiled {result['snapshot']}")
+            elif args.compile:
+                print(f"❌ {env}: not compiled, {len(result['errors'])} validation errors")
+                print("\n".join(f"  • {error}" for error in result['errors']))
+            elif result['fresh']:
+                print(f"✅ {env}: {result['snapshot']} is fresh")
+            else:
+                print(f"⚠️  {env}: {result['snapshot']} needs recompiling")
+                print("\n".join(f"  • {reason}" for reason in result['reasons']))
+    ok = all(result.get('compiled', result.get('fresh')) for result in results.values())
+    return 0 if ok else 1
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if args.daemon:
+        ValidationDaemon(args.socket or default_socket_path()).serve_forever()
+        return
+
+    if args.benchmark:
+        report = run_benchmark(args.benchmark, args.jobs)
+        if args.format == "json":
+            print(json.dumps(report, indent=2))
+        else:
+            print(f"Validated {report['files']:,} generated files")
+            for label in ('serial', 'parallel', 'cold_cache', 'warm_cache'):
+                jobs = 1 if label == 'serial' else report['jobs']
+                print(f"  {label:<10} ({jobs} jobs): {report[label]['seconds']:.3f}s, "
+                      f"{report[label]['files_per_second']:,.1f} files/s")
+        return
+
+    if args.compile or args.verify_snapshot or args.benchmark_snapshot:
+        sys.exit(run_snapshot_command(args))
+
+    cache_file = cache_path_for(args)
+    cache = ValidationCache(cache_file) if cache_file else None
+    validator = run_validation(args, cache)
+
     # Output results
     validator.print_summary(args.format)
-    
+
     # Exit code based on validation result
     if not validator.get_summary()['valid']:
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+BLUX Startup Benchmark
+Tracks cold-start cost of the tools/ CLIs: module import time (via
+`python -X importtime`) and wall-clock time to first output and to exit.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from blux_common import percentile
+
+TOOLS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = TOOLS_DIR.parent
+
+
+def build_commands(audit_dir: Path, with_daemon: bool = False) -> Dict[str, List[str]]:
+    """Command lines to benchmark, keyed by a short label."""
+    python = sys.executable
+    validator = str(TOOLS_DIR / "config-validator.py")
+    analyzer = str(TOOLS_DIR / "audit-analyzer.py")
+    commands = {
+        'config-validator --check': [python, validator, "--check", "--path", str(REPO_ROOT)],
+        'config-validator --check --format json': [
+            python, validator, "--check", "--format", "json", "--path", str(REPO_ROOT)],
+        'audit-analyzer --type security': [
+            python, analyzer, "--audit-path", str(audit_dir), "--type", "security"],
+        'audit-analyzer --type operations': [
+            python, analyzer, "--audit-path", str(audit_dir), "--type", "operations"],
+    }
+    if with_daemon:
+        client = str(TOOLS_DIR / "config-validator-client.py")
+        commands['config-validator-client --check (daemon)'] = [
+            python, client, "--check", "--path", str(REPO_ROOT)]
+    return commands
+
+
+def daemon_round_trips(socket_path: str, requests: int) -> Dict[str, float]:
+    """Latency of raw validation requests against a warm daemon."""
+    import socket
+
+    request = json.dumps({'argv': ["--check", "--path", str(REPO_ROOT)],
+                          'cwd': str(REPO_ROOT), 'env': {}}).encode('utf-8') + b"\n"
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(socket_path)
+        client.sendall(request)
+        response = b""
+        while not response.endswith(b"\n"):
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            response += chunk
+        client.close()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        'requests': requests,
+        'median_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def write_sample_audit(audit_dir: Path, records: int = 1000):
+    """Write a small audit segment for the analyzer runs."""
+    audit_dir.mkdir(parents=True, exist_ok=True)
+    with open(audit_dir / "sample.jsonl", 'w', encoding='utf-8') as f:
+        for i in range(records):
+            f.write(json.dumps({
+                'timestamp': f"2025-10-20T10:{i // 60 % 60:02d}:{i % 60:02d}Z",
+                'audit_id': f"aud_{i:08x}",
+                'service': 'blux-lite',
+                'operation': 'task.execute',
+                'identity': f"user:u{i % 13}@org",
+                'status': 'success' if i % 17 else 'failure',
+                'duration_ms': i % 400,
+            }) + "\n")
+
+
+def time_run(command: List[str]) -> Tuple[float, float]:
+    """Return (seconds to first stdout byte, seconds to exit) for one run."""
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env)
+    process.stdout.read(1)
+    first_output = time.perf_counter() - started
+    process.stdout.read()
+    process.wait()
+    return first_output, time.perf_counter() - started
+
+
+def import_profile(command: List[str], top: int = 5) -> Dict[str, Any]:
+    """Total import time and the heaviest top-level imports for one run."""
+    result = subprocess.run([command[0], "-X", "importtime", *command[1:]],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    top_level = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        # Nested imports are indented under their parent; count top-level ones only
+        if fields[2][1:2] == " ":
+            continue
+        top_level.append((fields[2].strip(), int(fields[1])))
+    top_level.sort(key=lambda item: item[1], reverse=True)
+    return {
+        'import_ms': round(sum(us for _, us in top_level) / 1000, 2),
+        'heaviest': [{'module': name, 'ms': round(us / 1000, 2)} for name, us in top_level[:top]],
+    }
+
+
+def run_benchmarks(runs: int, with_daemon: bool = False) -> Dict[str, Any]:
+    """Benchmark every command and collect its timings."""
+    report: Dict[str, Any] = {'python': sys.version.split()[0], 'runs': runs, 'commands': {}}
+    with tempfile.TemporaryDirectory(prefix="blux-startup-") as scratch:
+        audit_dir = Path(scratch) / "audit"
+        write_sample_audit(audit_dir)
+        daemon = None
+        if with_daemon:
+            socket_path = str(Path(scratch) / "validator.sock")
+            os.environ['BLUX_VALIDATOR_SOCKET'] = socket_path
+            daemon = subprocess.Popen([sys.executable, str(TOOLS_DIR / "config-validator.py"), "--daemon"],
+                                      stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            daemon.stdout.readline()  # "listening on ..."
+        try:
+            if daemon is not None:
+                report['daemon'] = daemon_round_trips(socket_path, runs * 10)
+            report['commands'] = benchmark_commands(build_commands(audit_dir, with_daemon), runs)
+        finally:
+            if daemon is not None:
+                daemon.terminate()
+                daemon.wait()
+    return report
+
+
+def benchmark_commands(commands: Dict[str, List[str]], runs: int) -> Dict[str, Any]:
+    """Time-to-first-output, total time and import profile per command."""
+    results = {}
+    for label, command in commands.items():
+        time_run(command)  # warm the page cache and bytecode
+        first_outputs, totals = [], []
+        for _ in range(runs):
+            first_output, total = time_run(command)
+            first_outputs.append(first_output)
+            totals.append(total)
+        first_outputs.sort()
+        totals.sort()
+        entry = import_profile(command)
+        entry['first_output_ms'] = {
+            'median': round(percentile(first_outputs, 50) * 1000, 2),
+            'p95': round(percentile(first_outputs, 95) * 1000, 2),
+        }
+        entry['total_ms'] = {
+            'median': round(percentile(totals, 50) * 1000, 2),
+            'p95': round(percentile(totals, 95) * 1000, 2),
+        }
+        results[label] = entry
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BLUX Startup Benchmark")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per command (default: 20)")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
+    parser.add_argument("--budget-ms", type=float,
+                        help="Exit non-zero if any median time-to-first-output exceeds this")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Also measure config-validator requests served by a warm daemon")
+
+    args = parser.parse_args()
+    report = run_benchmarks(args.runs, args.daemon)
+
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"BLUX Startup Benchmark (Python {report['python']}, {report['runs']} runs each)")
+        print("=" * 60)
+        if 'daemon' in report:
+            daemon = report['daemon']
+            print(f"\nconfig-validator daemon ({daemon['requests']} requests)")
+            print(f"  Request latency: median {daemon['median_ms']:.2f} ms, p99 {daemon['p99_ms']:.2f} ms")
+        for label, entry in report['commands'].items():
+            print(f"\n{label}")
+            print(f"  Imports: {entry['import_ms']:.1f} ms")
+            print(f"  First output: median {entry['first_output_ms']['median']:.1f} ms, "
+                  f"p95 {entry['first_output_ms']['p95']:.1f} ms")
+            print(f"  Total: median {entry['total_ms']['median']:.1f} ms, "
+                  f"p95 {entry['total_ms']['p95']:.1f} ms")
+            heaviest = ", ".join(f"{m['module']} {m['ms']:.1f}ms" for m in entry['heaviest'])
+            print(f"  Heaviest imports: {heaviest}")
+
+    if args.budget_ms is not None:
+        over = [label for label, entry in report['commands'].items()
+                if entry['first_output_ms']['median'] > args.budget_ms]
+        if over:
+            print(f"\nOver {args.budget_ms:.0f} ms budget: {', '.join(over)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()